@@ -34,4 +34,5 @@ class Counterpoint(BaseModel):
 class CounterpointResult(BaseModel):
     statement: str
     high_level_summary: str
-    counterpoints: List[Counterpoint]
\ No newline at end of file
+    counterpoints: List[Counterpoint]
+    truncated: bool = False  # run cancelled or past its deadline before Gemini answered
\ No newline at end of file
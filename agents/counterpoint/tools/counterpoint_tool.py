@@ -2,9 +2,8 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Any, Dict, List
-
-import google.generativeai as genai
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
 
 from agents.critic.schemas.critic_schema import CriticResult
 from agents.pattern_analyzer.schemas.pattern_analyzer_schema import (
@@ -15,9 +14,15 @@ from agents.counterpoint.schemas.counterpoint_schema import (
     Counterpoint,
     CounterpointResult,
 )
+from agents.llm_client import generate_text
+from agents.run_context import RunCancelled, run_cancelled, with_run_context
+from agents.pattern_analyzer.tools.columnar import columnar_view
 from memory.critic_store import CriticMemory
 from memory.pattern_analysis_store import PatternAnalysisMemory
 from memory.local_counterpoint_store import CounterpointMemory
+from telemetry import get_logger, traced
+
+logger = get_logger("counterpoint")
 
 
 # --- Helpers to load upstream results ----------------------------------------
@@ -66,55 +71,40 @@ def _load_latest_pattern_analysis() -> PatternAnalysisResult:
 
 
 def _collect_allowed_urls(pa: PatternAnalysisResult) -> List[str]:
-    urls: List[str] = []
-    for art in pa.analyzed_articles:
-        if art.url:
-            urls.append(art.url)
-    # Deduplicate while preserving order
-    seen = set()
-    result: List[str] = []
-    for u in urls:
-        if u not in seen:
-            seen.add(u)
-            result.append(u)
-    return result
+    # url_index holds each URL once, in first-seen order.
+    return [u for u in columnar_view(pa).url_index if u]
 
 
 # --- LLM call to propose counterpoints ---------------------------------------
 
 
-def _generate_counterpoints_with_llm(
-    statement: str,
-    critic: CriticResult,
-    pa: PatternAnalysisResult,
-    allowed_urls: List[str],
-) -> List[Dict[str, Any]]:
+@dataclass
+class CounterpointPrompt:
     """
-    Use Gemini 2.5 Flash to propose counterpoints for Critic's implication chains.
-
-    Returns a list of dicts with keys:
-      - id
-      - target_chain_index
-      - target_step_index
-      - type
-      - text
-      - based_on_sources (subset of allowed_urls)
-      - uses_general_knowledge (bool)
-      - strength
-      - notes
+    The Counterpoint prompt with everything but the CriticResult filled in.
+    The PatternAnalysisResult JSON is the bulk of it and does not depend on
+    the Critic, so it can be prepared while the Critic is still running.
     """
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        print("[Counterpoint] WARNING: GOOGLE_API_KEY not set. Returning no counterpoints.")
-        return []
 
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel("gemini-2.5-flash")
+    allowed_urls: List[str]
+    head: str
+    tail: str
 
-    critic_json = critic.model_dump()
-    pa_json = pa.model_dump()
+    def render(self, critic: CriticResult) -> str:
+        return self.head + json.dumps(critic.model_dump(), ensure_ascii=False) + self.tail
 
-    prompt = f"""
+
+def prepare_counterpoint_prompt(
+    statement: str,
+    pa: PatternAnalysisResult,
+    allowed_urls: Optional[List[str]] = None,
+) -> CounterpointPrompt:
+    """
+    Build the Critic-independent parts of the Counterpoint prompt for `pa`.
+    """
+    if allowed_urls is None:
+        allowed_urls = _collect_allowed_urls(pa)
+    head = f"""
 You are the Counterpoint agent in the TruthLens pipeline.
 
 The upstream agents have already:
@@ -140,8 +130,9 @@ Constraints:
 
 Input:
 - statement: {statement}
-- critic_result (JSON): {json.dumps(critic_json, ensure_ascii=False)}
-- pattern_analysis_result (JSON): {json.dumps(pa_json, ensure_ascii=False)}
+- critic_result (JSON): """.lstrip()
+    tail = f"""
+- pattern_analysis_result (JSON): {json.dumps(pa.model_dump(), ensure_ascii=False)}
 - allowed_urls (JSON array): {json.dumps(allowed_urls, ensure_ascii=False)}
 
 Output:
@@ -164,20 +155,54 @@ Return ONLY a JSON array of counterpoint objects with this exact schema:
 
 Do NOT wrap the JSON in markdown fences.
 Do NOT add any explanation outside this JSON array.
-""".strip()
+""".rstrip()
+    return CounterpointPrompt(allowed_urls=allowed_urls, head=head, tail=tail)
+
+
+def _generate_counterpoints_with_llm(
+    statement: str,
+    critic: CriticResult,
+    pa: PatternAnalysisResult,
+    allowed_urls: List[str],
+    prompt: Optional[CounterpointPrompt] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Use Gemini 2.5 Flash to propose counterpoints for Critic's implication chains.
+    `prompt` is used if already prepared for `pa` (see prepare_counterpoint_prompt).
+
+    Returns a list of dicts with keys:
+      - id
+      - target_chain_index
+      - target_step_index
+      - type
+      - text
+      - based_on_sources (subset of allowed_urls)
+      - uses_general_knowledge (bool)
+      - strength
+      - notes
+    """
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        logger.warning("GOOGLE_API_KEY not set. Returning no counterpoints.")
+        return []
+
+    if prompt is None:
+        prompt = prepare_counterpoint_prompt(statement, pa, allowed_urls)
 
     try:
-        response = model.generate_content(prompt)
-        text = (response.text or "").strip()
+        text = generate_text(prompt.render(critic), api_key=api_key, caller="counterpoints")
         if text.startswith("```"):
             text = text.strip("`")
         data = json.loads(text)
         if not isinstance(data, list):
-            print("[Counterpoint] LLM returned non-list JSON; ignoring.")
+            logger.warning("LLM returned non-list JSON; ignoring.")
             return []
         return data
+    except RunCancelled as e:
+        logger.info("No counterpoints: %s", e)
+        return []
     except Exception as e:
-        print(f"[Counterpoint] Error generating counterpoints: {e}")
+        logger.error("Error generating counterpoints: %s", e)
         return []
 
 
@@ -254,55 +279,127 @@ def _clean_and_validate_counterpoints(
             )
             result.append(cp)
         except Exception as e:
-            print(f"[Counterpoint] Skipping invalid counterpoint item: {e}")
+            logger.warning("Skipping invalid counterpoint item: %s", e)
             continue
 
     return result
 
 
-def run_counterpoint() -> CounterpointResult:
+def _high_level_summary(counterpoints: List[Counterpoint]) -> str:
+    if counterpoints:
+        return (
+            "This analysis surfaces counterpoints and alternative perspectives on the "
+            "implication chains identified by the Critic agent. It distinguishes "
+            "between counterpoints grounded directly in the collected sources and "
+            "those that rely on general world knowledge or broader contextual "
+            "reasoning."
+        )
+    return (
+        "No substantial counterpoints were identified beyond the existing "
+        "implication analysis and gaps. This may indicate that the available "
+        "sources present relatively aligned narratives on the core claims."
+    )
+
+
+@traced("stage.counterpoint")
+@with_run_context
+def run_counterpoint(
+    critic: Optional[CriticResult] = None,
+    pa: Optional[PatternAnalysisResult] = None,
+    prompt: Optional[CounterpointPrompt] = None,
+) -> CounterpointResult:
     """
     Main Counterpoint pipeline function.
 
-    - Load latest CriticResult and PatternAnalysisResult from local memory.
+    - Load latest CriticResult and PatternAnalysisResult from local memory
+      (unless passed in explicitly, as the batch runner does).
+    - Reuse `prompt` if it was prepared for `pa` ahead of time
+      (see pipeline/speculative.py).
     - Use Gemini 2.5 Flash to propose counterpoints for implication chains.
     - Clean and validate the counterpoints.
     - Save CounterpointResult to local CounterpointMemory.
     - Return CounterpointResult.
+
+    If the run is cancelled (agents/run_context.py) before Gemini answers, the
+    result has no counterpoints and is marked `truncated`.
     """
-    critic = _load_latest_critic()
-    pa = _load_latest_pattern_analysis()
-    allowed_urls = _collect_allowed_urls(pa)
+    if critic is None:
+        critic = _load_latest_critic()
+    if pa is None:
+        pa = _load_latest_pattern_analysis()
+    allowed_urls = prompt.allowed_urls if prompt is not None else _collect_allowed_urls(pa)
 
     raw_cps = _generate_counterpoints_with_llm(
         statement=critic.statement,
         critic=critic,
         pa=pa,
         allowed_urls=allowed_urls,
+        prompt=prompt,
     )
     counterpoints = _clean_and_validate_counterpoints(raw_cps, critic, allowed_urls)
 
-    if counterpoints:
-        high_level_summary = (
-            "This analysis surfaces counterpoints and alternative perspectives on the "
-            "implication chains identified by the Critic agent. It distinguishes "
-            "between counterpoints grounded directly in the collected sources and "
-            "those that rely on general world knowledge or broader contextual "
-            "reasoning."
-        )
-    else:
-        high_level_summary = (
-            "No substantial counterpoints were identified beyond the existing "
-            "implication analysis and gaps. This may indicate that the available "
-            "sources present relatively aligned narratives on the core claims."
+    result = CounterpointResult(
+        statement=critic.statement,
+        high_level_summary=_high_level_summary(counterpoints),
+        counterpoints=counterpoints,
+        truncated=run_cancelled(),
+    )
+
+    CounterpointMemory().save_result(result)
+    return result
+
+
+def regenerate_counterpoints(
+    critic: CriticResult,
+    pa: PatternAnalysisResult,
+    chain_indices: Iterable[int],
+    previous: CounterpointResult,
+) -> CounterpointResult:
+    """
+    Counterpoints for `critic` where only the chains in `chain_indices` are
+    sent to the LLM; counterpoints in `previous` for every other chain are
+    kept. Used by incremental re-analysis when only some verdicts changed.
+    """
+    targets = sorted({i for i in chain_indices if 0 <= i < len(critic.implication_chains)})
+    kept = [cp for cp in previous.counterpoints if cp.target_chain_index not in targets]
+    if not targets:
+        result = CounterpointResult(
+            statement=critic.statement,
+            high_level_summary=_high_level_summary(kept),
+            counterpoints=kept,
         )
+        CounterpointMemory().save_result(result)
+        return result
 
+    # The LLM sees only the target chains; its indices are mapped back below.
+    subset = critic.model_copy(
+        update={"implication_chains": [critic.implication_chains[i] for i in targets]}
+    )
+    allowed_urls = _collect_allowed_urls(pa)
+    raw_cps = _generate_counterpoints_with_llm(
+        statement=critic.statement,
+        critic=subset,
+        pa=pa,
+        allowed_urls=allowed_urls,
+    )
+    fresh = _clean_and_validate_counterpoints(raw_cps, subset, allowed_urls)
+
+    used_ids = {cp.id for cp in kept}
+    for cp in fresh:
+        cp.target_chain_index = targets[cp.target_chain_index]
+        base, n = cp.id, 1
+        while cp.id in used_ids:
+            n += 1
+            cp.id = f"{base}_{n}"
+        used_ids.add(cp.id)
+
+    counterpoints = sorted(kept + fresh, key=lambda cp: (cp.target_chain_index, cp.target_step_index))
     result = CounterpointResult(
         statement=critic.statement,
-        high_level_summary=high_level_summary,
+        high_level_summary=_high_level_summary(counterpoints),
         counterpoints=counterpoints,
+        truncated=run_cancelled(),
     )
-
     CounterpointMemory().save_result(result)
     return result
 
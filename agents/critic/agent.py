@@ -73,7 +73,19 @@ TOOLS YOU MUST USE
          ]
        },
        "articles_sorted_by_date": [
-         { same ArticleAnalysis objects, sorted by publish_date },
+         { same ArticleAnalysis objects, sorted by publish date, undated last },
+         ...
+       ],
+       "claim_consensus": [
+         { "canonical_claim": "...", "supporting_sources": [...], "refuting_sources": [...], "ignoring_sources": [...], "consensus_assessment": "...", "notes": "..." },
+         ...
+       ],
+       "narrative_phases": [
+         { "phase_name": "...", "time_range": "...", "description": "...", "key_sources": ["...", ...] },
+         ...
+       ],
+       "historical_evidence": [
+         { "canonical_claim": "...", "earlier_statement": "...", "source_url": "...", "claim_text": "...", "modality_class": "...", "publish_date": "...", "similarity": 0.5 },
          ...
        ]
      }
@@ -100,6 +112,10 @@ TOOLS YOU MUST USE
            "notes": "..."
          },
          ...
+       ],
+       "gaps_and_caveats": [
+         { "description": "...", "affected_chains": ["...", ...], "why_it_matters": "..." },
+         ...
        ]
      }
 
@@ -173,14 +189,17 @@ You MUST output a single JSON object with this shape:
     },
     ...
   ],
-  "claim_consensus": [],
-  "narrative_phases": [],
-  "gaps_and_caveats": []
+  "claim_consensus": [ ... ],    // copied from critic_tool_wrapper()
+  "narrative_phases": [ ... ],   // copied from critic_tool_wrapper()
+  "gaps_and_caveats": [ ... ],   // copied from implication_chains_tool_wrapper()
+  "historical_evidence": [ ... ] // copied from critic_tool_wrapper()
 }
 
 Rules:
 - "statement" MUST come from pattern_analysis["statement"].
-- "claim_consensus", "narrative_phases", and "gaps_and_caveats" MUST be present but as empty arrays, because in this mode you only implement USP 1.
+- "claim_consensus" and "narrative_phases" MUST be copied unchanged from critic_tool_wrapper() (they are computed from key_claims and publish dates, not by you).
+- "gaps_and_caveats" MUST be copied unchanged from implication_chains_tool_wrapper() (rule-based, computed from the chains, claims and sources).
+- "historical_evidence" MUST be copied unchanged from critic_tool_wrapper(). It lists matching claims from EARLIER statements (the claim archive); its source_url values are NOT allowed URLs and MUST NOT appear in supporting_sources or refuting_sources. You MAY mention in notes that a claim was reported before.
 - Do NOT wrap the JSON in markdown.
 - Do NOT add commentary before or after the JSON.
 
@@ -47,7 +47,7 @@ class ClaimConsensus(BaseModel):
     refuting_sources: List[str] = []
     ignoring_sources: List[str] = []
 
-    consensus_assessment: str  # "high consensus", "contested", "isolated"
+    consensus_assessment: str  # "high consensus", "contested", "widely refuted", "isolated"
     notes: Optional[str] = None
 
 
@@ -72,6 +72,21 @@ class Gap(BaseModel):
     why_it_matters: str
 
 
+class HistoricalEvidence(BaseModel):
+    """
+    A claim from an earlier analyzed statement that matches one of this
+    statement's canonical claims (from the claim archive).
+    """
+
+    canonical_claim: str        # ClaimConsensus.canonical_claim it matches
+    earlier_statement: str
+    source_url: str
+    claim_text: str
+    modality_class: Optional[str] = None
+    publish_date: Optional[str] = None
+    similarity: float           # token Jaccard with the canonical claim
+
+
 class CriticResult(BaseModel):
     """
     Top-level output of the Critic agent.
@@ -87,4 +102,13 @@ class CriticResult(BaseModel):
     implication_chains: List[ImplicationChain] = []
     claim_consensus: List[ClaimConsensus] = []
     narrative_phases: List[NarrativePhase] = []
-    gaps_and_caveats: List[Gap] = []
\ No newline at end of file
+    gaps_and_caveats: List[Gap] = []
+
+    # Matching claims from earlier statements; context, not evidence from this statement's sources
+    historical_evidence: List[HistoricalEvidence] = []
+
+    # How implication candidates were generated: "heuristic", "llm" or "heuristic+llm"
+    candidate_source: Optional[str] = None
+
+    # The run was cancelled or hit its deadline; Gemini candidates may be missing
+    truncated: bool = False
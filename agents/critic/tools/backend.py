@@ -0,0 +1,342 @@
+"""
+Execution backend for the CPU-bound Critic analysis.
+
+Claim-consensus clustering, heuristic candidate generation (with its claim
+index) and candidate verification (every candidate against every claim)
+need no I/O and read only the columnar view of the PatternAnalysisResult
+(agents/pattern_analyzer/tools/columnar.py). TRUTHLENS_CRITIC_BACKEND picks
+where they run:
+
+- "inline" (default): in the calling thread.
+- "thread": on a shared pool of TRUTHLENS_CRITIC_WORKERS threads, so consensus
+  clustering runs while the candidates are generated and verified. The GIL
+  still serializes the Python work itself.
+- "process": on a shared pool of TRUTHLENS_CRITIC_WORKERS processes (default:
+  one per core). The view is pickled once per job into a shared-memory block;
+  tasks carry only its name, and each worker unpickles it once for all of the
+  job's tasks. Verification is split into shards of candidates across the
+  workers, and results come back as JSON. Results with fewer than
+  TRUTHLENS_CRITIC_PROCESS_MIN_CLAIMS claims run inline, where the hand-off
+  would cost more than the work. Workers start with the first job (or
+  warm_up()), which takes a second or two of imports.
+
+  with get_critic_backend().job(pa) as job:
+      consensus = job.submit_claim_consensus()
+      chains = job.verify(candidates)
+      claim_consensus = consensus.result()
+
+Metrics and logs of worker processes stay in the workers; the parent records
+the hand-off (critic.backend.handoff_ms, critic.backend.handoff_kib) and the
+tasks it submitted.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, Generic, Iterator, List, Optional, Tuple, TypeVar, Union
+
+from pydantic import TypeAdapter
+
+from agents.critic.schemas.critic_schema import ClaimConsensus, ImplicationChain
+from agents.critic.tools.claim_consensus import MAX_CONSENSUS_CLAIMS, claim_consensus_from_view
+from agents.critic.tools.heuristic_candidates import generate_heuristic_candidates
+from agents.critic.tools.implication_chains import verify_implication_candidate
+from agents.pattern_analyzer.schemas.pattern_analyzer_schema import PatternAnalysisResult
+from agents.pattern_analyzer.tools.columnar import ColumnarPatternAnalysis, columnar_view
+from telemetry import bind_context, get_logger, incr, observe, timed
+
+logger = get_logger("critic.backend")
+
+T = TypeVar("T")
+
+BACKEND_MODES = ("inline", "thread", "process")
+CRITIC_BACKEND = os.getenv("TRUTHLENS_CRITIC_BACKEND", "inline").strip().lower()
+CRITIC_WORKERS = int(os.getenv("TRUTHLENS_CRITIC_WORKERS", "0")) or (os.cpu_count() or 1)
+PROCESS_MIN_CLAIMS = int(os.getenv("TRUTHLENS_CRITIC_PROCESS_MIN_CLAIMS", "1000"))
+# Verification shards per worker; more than one evens out slow shards.
+SHARDS_PER_WORKER = 2
+# Views a worker process keeps decoded, for the jobs of concurrent runs.
+WORKER_CACHED_JOBS = 4
+
+_CHAINS = TypeAdapter(List[ImplicationChain])
+_CONSENSUS = TypeAdapter(List[ClaimConsensus])
+
+
+@dataclass(frozen=True)
+class SharedView:
+    """
+    A pickled columnar view in a shared-memory block, as sent to workers.
+    """
+
+    name: str
+    size: int
+
+
+class _JobInput:
+    """
+    What a job's tasks read: the view, and the result it was built from
+    (rebuilt from the view on first use in a worker process).
+    """
+
+    __slots__ = ("view", "_pa")
+
+    def __init__(self, view: ColumnarPatternAnalysis, pa: Optional[PatternAnalysisResult] = None) -> None:
+        self.view = view
+        self._pa = pa
+
+    @property
+    def pa(self) -> PatternAnalysisResult:
+        if self._pa is None:
+            self._pa = self.view.to_result()
+        return self._pa
+
+
+JobRef = Union[_JobInput, SharedView]
+
+
+# --- worker side ------------------------------------------------------------
+
+# Jobs decoded by this worker process, by shared-memory block name. Worker
+# processes run one task at a time, so no lock is needed.
+_WORKER_JOBS: "OrderedDict[str, _JobInput]" = OrderedDict()
+
+
+def _load(ref: JobRef) -> _JobInput:
+    if isinstance(ref, _JobInput):
+        return ref
+    job = _WORKER_JOBS.get(ref.name)
+    if job is not None:
+        _WORKER_JOBS.move_to_end(ref.name)
+        return job
+    shm = SharedMemory(name=ref.name)
+    data = shm.buf[: ref.size]
+    try:
+        job = _JobInput(pickle.loads(data))
+    finally:
+        data.release()
+        shm.close()
+    _WORKER_JOBS[ref.name] = job
+    while len(_WORKER_JOBS) > WORKER_CACHED_JOBS:
+        _WORKER_JOBS.popitem(last=False)
+    return job
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _claim_consensus_task(ref: JobRef, max_claims: int) -> Union[bytes, List[ClaimConsensus]]:
+    consensus = claim_consensus_from_view(_load(ref).view, max_claims)
+    return _CONSENSUS.dump_json(consensus) if isinstance(ref, SharedView) else consensus
+
+
+def _heuristic_candidates_task(ref: JobRef) -> Tuple[List[Dict[str, str]], float]:
+    return generate_heuristic_candidates(_load(ref).pa)
+
+
+def _verify_task(ref: JobRef, candidates: List[Dict[str, str]], start: int) -> Union[bytes, List[ImplicationChain]]:
+    view = _load(ref).view
+    chains = [verify_implication_candidate(view, cand, idx) for idx, cand in enumerate(candidates, start=start)]
+    return _CHAINS.dump_json(chains) if isinstance(ref, SharedView) else chains
+
+
+# --- caller side ------------------------------------------------------------
+
+
+class _InlineExecutor(Executor):
+    """
+    Runs each task in submit(); the returned future is already done.
+    """
+
+    def submit(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> "Future[T]":
+        future: "Future[T]" = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+_INLINE = _InlineExecutor()
+
+
+class CriticTask(Generic[T]):
+    """
+    A submitted task. result() waits for it and decodes what a worker
+    process sent back.
+    """
+
+    def __init__(self, future: "Future[Any]", adapter: Optional[TypeAdapter] = None) -> None:
+        self.future = future
+        self._adapter = adapter
+
+    def result(self) -> T:
+        value = self.future.result()
+        if self._adapter is not None and isinstance(value, bytes):
+            return self._adapter.validate_json(value)
+        return value
+
+
+class CriticJob:
+    """
+    One PatternAnalysisResult handed to the backend; see CriticBackend.job().
+    """
+
+    def __init__(self, executor: Executor, ref: JobRef, mode: str, shards: int) -> None:
+        self.mode = mode
+        self._executor = executor
+        self._ref = ref
+        self._shards = max(1, shards)
+        self._futures: List[Future] = []
+
+    def _submit(self, task: str, fn: Callable[..., Any], *args: Any) -> "Future[Any]":
+        incr("critic.backend.tasks", mode=self.mode, task=task)
+        if self.mode != "process":
+            fn = bind_context(fn)
+        future = self._executor.submit(fn, self._ref, *args)
+        self._futures.append(future)
+        return future
+
+    def submit_claim_consensus(self, max_claims: int = MAX_CONSENSUS_CLAIMS) -> CriticTask[List[ClaimConsensus]]:
+        """
+        Start build_claim_consensus() for the job's result.
+        """
+        return CriticTask(self._submit("claim_consensus", _claim_consensus_task, max_claims), _CONSENSUS)
+
+    def submit_heuristic_candidates(self) -> CriticTask[Tuple[List[Dict[str, str]], float]]:
+        """
+        Start generate_heuristic_candidates() for the job's result.
+        """
+        return CriticTask(self._submit("heuristic_candidates", _heuristic_candidates_task))
+
+    def heuristic_candidates(self, pa: PatternAnalysisResult) -> Tuple[List[Dict[str, str]], float]:
+        """
+        generate_heuristic_candidates() run by the backend; `pa` must be the
+        job's result (the signature matches, for generate_implication_candidates).
+        """
+        return self.submit_heuristic_candidates().result()
+
+    def verify(self, candidates: List[Dict[str, str]]) -> List[ImplicationChain]:
+        """
+        verify_implication_candidates() for the job's result, in shards.
+        """
+        if not candidates:
+            return []
+        size = -(-len(candidates) // self._shards)
+        tasks: List[CriticTask[List[ImplicationChain]]] = [
+            CriticTask(self._submit("verify", _verify_task, candidates[lo : lo + size], lo + 1), _CHAINS)
+            for lo in range(0, len(candidates), size)
+        ]
+        return [chain for task in tasks for chain in task.result()]
+
+    def close(self) -> None:
+        # Tasks whose results were never asked for need not run.
+        for future in self._futures:
+            future.cancel()
+
+
+class CriticBackend:
+    """
+    Where the Critic's CPU-bound work runs: "inline", "thread" or "process"
+    (see the module docstring). Pools are created on first use and shared by
+    all jobs.
+    """
+
+    def __init__(
+        self,
+        mode: str = CRITIC_BACKEND,
+        workers: int = CRITIC_WORKERS,
+        min_process_claims: int = PROCESS_MIN_CLAIMS,
+    ) -> None:
+        if mode not in BACKEND_MODES:
+            raise ValueError(f"Unknown Critic backend {mode!r}; expected one of {', '.join(BACKEND_MODES)}.")
+        self.mode = mode
+        self.workers = max(1, workers)
+        self.min_process_claims = min_process_claims
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.mode == "process":
+                    # spawn, not fork: the parent runs request and persister
+                    # threads whose locks fork would copy mid-use.
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context("spawn"))
+                elif self.mode == "thread":
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="critic")
+                else:
+                    self._executor = _INLINE
+            return self._executor
+
+    def warm_up(self) -> None:
+        """
+        Start every worker now rather than on the first job.
+        """
+        if self.mode == "inline":
+            return
+        pool = self._pool()
+        for future in [pool.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+
+    @contextmanager
+    def job(self, pa: PatternAnalysisResult) -> Iterator[CriticJob]:
+        """
+        Hand `pa` to the backend for the block. In process mode its view is
+        placed in shared memory, which is released when the block ends.
+        """
+        view = columnar_view(pa)
+        if self.mode != "process" or view.claim_count < self.min_process_claims:
+            if self.mode == "thread":
+                job = CriticJob(self._pool(), _JobInput(view, pa), "thread", 1)
+            else:
+                job = CriticJob(_INLINE, _JobInput(view, pa), "inline", 1)
+            try:
+                yield job
+            finally:
+                job.close()
+            return
+
+        with timed("critic.backend.handoff_ms"):
+            blob = pickle.dumps(view, protocol=pickle.HIGHEST_PROTOCOL)
+            shm = SharedMemory(create=True, size=len(blob))
+            shm.buf[: len(blob)] = blob
+        observe("critic.backend.handoff_kib", len(blob) / 1024)
+        job = CriticJob(self._pool(), SharedView(shm.name, len(blob)), "process", self.workers * SHARDS_PER_WORKER)
+        try:
+            yield job
+        finally:
+            job.close()
+            shm.close()
+            shm.unlink()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None and executor is not _INLINE:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Global singleton for this process
+_BACKEND: Optional[CriticBackend] = None
+_BACKEND_LOCK = threading.Lock()
+
+
+def get_critic_backend() -> CriticBackend:
+    """
+    The backend configured by TRUTHLENS_CRITIC_BACKEND and TRUTHLENS_CRITIC_WORKERS.
+    """
+    global _BACKEND
+    with _BACKEND_LOCK:
+        if _BACKEND is None:
+            _BACKEND = CriticBackend()
+            logger.info("Critic backend: %s (%d workers).", _BACKEND.mode, _BACKEND.workers)
+        return _BACKEND
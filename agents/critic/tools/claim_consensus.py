@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+from collections import Counter, defaultdict
+from typing import Dict, List, Sequence, Set, Tuple
+
+from agents.critic.schemas.critic_schema import ClaimConsensus
+from agents.pattern_analyzer.schemas.pattern_analyzer_schema import PatternAnalysisResult
+from agents.pattern_analyzer.tools.columnar import ColumnarPatternAnalysis, columnar_view
+from agents.tokenization import tokenize
+from telemetry import get_logger, incr, observe, timed
+
+logger = get_logger("critic.claim_consensus")
+
+# MinHash signature length and LSH banding: 16 bands of 4 rows put the
+# collision curve's midpoint near Jaccard 0.5.
+NUM_PERM = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS
+# Token-set Jaccard from which two claims count as the same canonical claim.
+SIMILARITY_THRESHOLD = float(os.getenv("TRUTHLENS_CONSENSUS_SIMILARITY", "0.5"))
+# Canonical claims reported per statement, most widely covered first.
+MAX_CONSENSUS_CLAIMS = int(os.getenv("TRUTHLENS_MAX_CONSENSUS_CLAIMS", "20"))
+
+# One salted 64-byte blake2b digest yields 16 independent 32-bit hash values.
+_VALUES_PER_DIGEST = 16
+_SALTS = [i.to_bytes(16, "little") for i in range(NUM_PERM // _VALUES_PER_DIGEST)]
+_UNPACK = struct.Struct(f"<{_VALUES_PER_DIGEST}I").unpack
+
+
+def claim_tokens(text: str) -> Set[str]:
+    return set(tokenize(text))
+
+
+class MinHasher:
+    """
+    MinHash signatures over token sets. Each distinct token is hashed with
+    NUM_PERM hash functions once; a signature is then the element-wise min
+    of its tokens' hash values.
+    """
+
+    def __init__(self) -> None:
+        self._token_values: Dict[str, Tuple[int, ...]] = {}
+
+    def _values(self, token: str) -> Tuple[int, ...]:
+        values = self._token_values.get(token)
+        if values is None:
+            data = token.encode("utf-8")
+            values = sum((_UNPACK(hashlib.blake2b(data, salt=salt).digest()) for salt in _SALTS), ())
+            self._token_values[token] = values
+        return values
+
+    def signature(self, tokens: Set[str]) -> Tuple[int, ...]:
+        return tuple(map(min, zip(*(self._values(t) for t in tokens))))
+
+
+class _UnionFind:
+    def __init__(self, n: int) -> None:
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def cluster_claims(token_sets: Sequence[Set[str]], threshold: float = SIMILARITY_THRESHOLD) -> List[List[int]]:
+    """
+    Group claims whose token sets have Jaccard >= `threshold`.
+
+    Claims are only compared when their MinHash signatures collide in an LSH
+    band, and then only against the first claim of that band bucket, so the
+    work grows with the number of claims rather than its square.
+    """
+    hasher = MinHasher()
+    signatures = [hasher.signature(tokens) if tokens else None for tokens in token_sets]
+    uf = _UnionFind(len(token_sets))
+    comparisons = 0
+    for band in range(LSH_BANDS):
+        buckets: Dict[Tuple[int, ...], int] = {}
+        lo = band * LSH_ROWS
+        for i, signature in enumerate(signatures):
+            if signature is None:
+                continue
+            head = buckets.setdefault(signature[lo : lo + LSH_ROWS], i)
+            if head != i and uf.find(head) != uf.find(i):
+                comparisons += 1
+                if _jaccard(token_sets[head], token_sets[i]) >= threshold:
+                    uf.union(head, i)
+    incr("critic.consensus.comparisons", float(comparisons))
+
+    clusters: Dict[int, List[int]] = defaultdict(list)
+    for i, tokens in enumerate(token_sets):
+        if tokens:
+            clusters[uf.find(i)].append(i)
+    return list(clusters.values())
+
+
+def _canonical_text(members: List[int], texts: List[str], token_sets: List[Set[str]]) -> str:
+    """
+    The member claim whose tokens are most shared across the cluster.
+    """
+    counts = Counter(t for i in members for t in token_sets[i])
+    best = max(
+        members,
+        key=lambda i: (sum(counts[t] for t in token_sets[i]) / len(token_sets[i]), -len(texts[i])),
+    )
+    return texts[best]
+
+
+def _assess(supporting: Set[str], refuting: Set[str]) -> str:
+    if len(supporting | refuting) <= 1:
+        return "isolated"
+    if supporting and refuting:
+        return "contested"
+    if refuting:
+        return "widely refuted"
+    return "high consensus"
+
+
+def build_claim_consensus(
+    pa: PatternAnalysisResult,
+    max_claims: int = MAX_CONSENSUS_CLAIMS,
+) -> List[ClaimConsensus]:
+    """
+    Cluster the key claims of all articles into canonical claims and record,
+    per canonical claim, which sources support it, refute it (denial
+    modality) or do not mention it. The `max_claims` canonical claims covered
+    by the most sources are returned.
+    """
+    return claim_consensus_from_view(columnar_view(pa), max_claims)
+
+
+def claim_consensus_from_view(
+    view: ColumnarPatternAnalysis,
+    max_claims: int = MAX_CONSENSUS_CLAIMS,
+) -> List[ClaimConsensus]:
+    """
+    build_claim_consensus() over a columnar view, for the Critic workers
+    (agents/critic/tools/backend.py).
+    """
+    all_texts = view.claims["text"]
+    refs: List[int] = [j for j in range(view.claim_count) if all_texts[j]]
+    if not refs:
+        return []
+
+    token_cache: Dict[str, Set[str]] = {}
+    texts = [all_texts[j].strip() for j in refs]
+    token_sets = [token_cache.setdefault(t, claim_tokens(t)) for t in texts]
+    urls = [view.urls[view.claim_article[j]] for j in refs]
+    classes = [view.claim_classes[j] for j in refs]
+    with timed("critic.consensus_ms"):
+        clusters = cluster_claims(token_sets)
+
+    # Only the most widely covered clusters are reported, so pick them before
+    # building the (per-source) consensus records.
+    stances: List[Dict[str, str]] = []
+    for members in clusters:
+        stance: Dict[str, str] = {}
+        for i in members:
+            url = urls[i]
+            # A source that denies the claim anywhere counts as refuting it.
+            if stance.get(url) != "denial":
+                stance[url] = "denial" if classes[i] == "denial" else "support"
+        stances.append(stance)
+    ranked = sorted(range(len(clusters)), key=lambda c: (-len(stances[c]), clusters[c][0]))[:max_claims]
+
+    all_sources = list(view.url_index)
+    results: List[ClaimConsensus] = []
+    for c in ranked:
+        members, stance = clusters[c], stances[c]
+        speculative = {urls[i] for i in members if classes[i] == "speculation"}
+        supporting = [u for u, s in stance.items() if s == "support"]
+        refuting = [u for u, s in stance.items() if s == "denial"]
+        notes: List[str] = []
+        hedged = speculative & set(supporting)
+        if hedged:
+            notes.append(f"{len(hedged)} of {len(supporting)} supporting sources only speculate.")
+        if len(members) > len(stance):
+            notes.append(f"{len(members)} claim variants merged.")
+
+        results.append(
+            ClaimConsensus(
+                canonical_claim=_canonical_text(members, texts, token_sets),
+                supporting_sources=supporting,
+                refuting_sources=refuting,
+                ignoring_sources=[u for u in all_sources if u not in stance],
+                consensus_assessment=_assess(set(supporting), set(refuting)),
+                notes=" ".join(notes) or None,
+            )
+        )
+
+    observe("critic.consensus_clusters", float(len(clusters)))
+    logger.info("Clustered %d claims into %d canonical claims.", len(refs), len(clusters))
+    return results
@@ -1,15 +1,24 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from agents.critic.schemas.critic_schema import CriticResult, ImplicationChain
-from agents.critic.tools.implication_chains import build_implication_chains_tool
+from agents.critic.tools.backend import get_critic_backend
+from agents.critic.tools.claim_consensus import build_claim_consensus
+from agents.critic.tools.gap_analysis import build_gaps
+from agents.critic.tools.historical_evidence import build_historical_evidence
+from agents.critic.tools.implication_chains import build_implication_chains
+from agents.critic.tools.narrative_phases import build_narrative_phases
+from agents.critic.tools.temporal_index import TemporalIndex
 from agents.pattern_analyzer.schemas.pattern_analyzer_schema import (
     ArticleAnalysis,
     PatternAnalysisResult,
 )
+from agents.run_context import run_cancelled, with_run_context
+from memory import claim_archive
 from memory.critic_store import CriticMemory
 from memory.pattern_analysis_store import PatternAnalysisMemory
+from telemetry import traced
 
 
 def _load_latest_pattern_analysis() -> PatternAnalysisResult:
@@ -42,21 +51,31 @@ def critic_input_tool() -> Dict[str, Any]:
     """
     pa: PatternAnalysisResult = _load_latest_pattern_analysis()
 
-    def _sort_key(a: ArticleAnalysis) -> str:
-        return a.publish_date or ""
-
-    sorted_articles: List[ArticleAnalysis] = sorted(pa.analyzed_articles, key=_sort_key)
+    # publish_date strings are dd-mm-yyyy (or whatever the source reported),
+    # so order by the parsed timestamp; undated articles go last.
+    sorted_articles: List[ArticleAnalysis] = TemporalIndex(pa.analyzed_articles).ordered()
 
     allowed_urls = [a.url for a in pa.analyzed_articles]
+    claim_consensus = build_claim_consensus(pa)
 
     return {
         "pattern_analysis": pa.model_dump(),
         "articles_sorted_by_date": [a.model_dump() for a in sorted_articles],
+        "claim_consensus": [c.model_dump() for c in claim_consensus],
+        "narrative_phases": [p.model_dump() for p in build_narrative_phases(pa)],
+        "historical_evidence": [h.model_dump() for h in build_historical_evidence(pa.statement, claim_consensus)],
         "allowed_urls": allowed_urls,
     }
 
 
-def run_critic() -> CriticResult:
+@traced("stage.critic")
+@with_run_context
+def run_critic(
+    pa: Optional[PatternAnalysisResult] = None,
+    chains: Optional[List[ImplicationChain]] = None,
+    candidate_source: Optional[str] = None,
+    candidates: Optional[List[Dict[str, str]]] = None,
+) -> CriticResult:
     """
     Main Critic pipeline function.
 
@@ -67,24 +86,54 @@ def run_critic() -> CriticResult:
       - Save CriticResult to local CriticMemory.
       - Return CriticResult.
 
-    For now, this implements ONLY USP 1 (Chain-of-Implications) and leaves
-    other sections empty. We'll plug in additional tools (claim consensus,
-    narrative phases, gaps) here later.
-    """
-    # 1) Load latest PatternAnalysisResult
-    pa: PatternAnalysisResult = _load_latest_pattern_analysis()
+    Besides USP 1 (Chain-of-Implications) it fills claim consensus, the
+    temporal narrative phases and rule-based gaps and caveats, all computed
+    without further LLM calls.
 
-    # 2) Build implication chains using the existing tool.
-    #    This returns a dict:
-    #      { "statement": "...", "implication_chains": [ {...}, ... ] }
-    chains_payload: Dict[str, Any] = build_implication_chains_tool()
+    If `pa` is given (e.g. by the batch runner), it is used instead of the
+    latest PatternAnalysisResult in local memory. If `chains` is given (e.g.
+    by incremental re-analysis, which re-verifies only some candidates), the
+    implication chains are taken as-is instead of being built, and
+    `candidate_source` is reported as the path that generated them. If
+    `candidates` is given instead (e.g. by the speculative pipeline, which
+    generates them early), they are verified but not generated.
 
-    raw_chains = chains_payload.get("implication_chains", [])
-    implication_chains: List[ImplicationChain] = [
-        ImplicationChain(**c) for c in raw_chains
-    ]
+    Clustering, heuristic candidates and verification run on the Critic
+    backend (agents/critic/tools/backend.py, TRUTHLENS_CRITIC_BACKEND).
 
-    # 3) Build a minimal high_level_summary.
+    If the run is cancelled (agents/run_context.py), the Gemini candidate call
+    is skipped or abandoned and the result is marked `truncated`; the rest
+    needs no upstream calls and is still computed.
+    """
+    # 1) Load latest PatternAnalysisResult
+    if pa is None:
+        pa = _load_latest_pattern_analysis()
+
+    with get_critic_backend().job(pa) as job:
+        # Claim clustering does not depend on the chains; on a thread or
+        # process backend it runs while they are built.
+        consensus_task = job.submit_claim_consensus()
+
+        # 2) Build implication chains for that PatternAnalysisResult.
+        #    This returns a dict:
+        #      { "statement": "...", "implication_chains": [ {...}, ... ] }
+        if chains is not None:
+            implication_chains: List[ImplicationChain] = list(chains)
+        elif candidates is not None:
+            implication_chains = job.verify(candidates)
+        else:
+            chains_payload: Dict[str, Any] = build_implication_chains(pa, job=job)
+
+            raw_chains = chains_payload.get("implication_chains", [])
+            implication_chains = [ImplicationChain(**c) for c in raw_chains]
+            candidate_source = chains_payload.get("candidate_source")
+
+        # 3) Cluster claims into canonical claims and segment coverage into
+        #    narrative phases over the temporal index.
+        claim_consensus = consensus_task.result()
+    narrative_phases = build_narrative_phases(pa)
+
+    # 4) Build a minimal high_level_summary.
     #    For now we keep this simple; later you can:
     #      - call a small LLM helper, or
     #      - compute a more descriptive summary from chains + pattern_analysis.
@@ -92,28 +141,36 @@ def run_critic() -> CriticResult:
         high_level_summary = (
             "This analysis identifies one or more chains of implications between claims "
             "found in the analyzed articles and evaluates how well each step is supported "
-            "by the available sources. Other USP sections (claim consensus, temporal "
-            "phases, gaps) are not yet computed in this version."
+            "by the available sources. Claims are clustered across sources for consensus and "
+            "coverage is grouped into temporal narrative phases, with gaps and caveats "
+            "derived from both."
         )
     else:
         high_level_summary = (
             "No clear implication chains were detected from the narrative summaries of "
-            "the analyzed articles. Other USP sections are not yet computed."
+            "the analyzed articles. Claims are clustered across sources for consensus and "
+            "coverage is grouped into temporal narrative phases, with gaps and caveats "
+            "derived from both."
         )
 
-    # 4) Assemble CriticResult for USP 1 only.
+    # 5) Assemble CriticResult.
     result = CriticResult(
         statement=pa.statement,
         high_level_summary=high_level_summary,
         implication_chains=implication_chains,
-        claim_consensus=[],
-        narrative_phases=[],
-        gaps_and_caveats=[],
+        claim_consensus=claim_consensus,
+        narrative_phases=narrative_phases,
+        gaps_and_caveats=build_gaps(pa, implication_chains, claim_consensus),
+        historical_evidence=build_historical_evidence(pa.statement, claim_consensus),
+        candidate_source=candidate_source,
+        truncated=run_cancelled(),
     )
 
-    # 5) Persist CriticResult in local CriticMemory (latest only).
+    # 6) Persist CriticResult in local CriticMemory (latest only) and
+    #    archive its chains for later statements.
     critic_memory = CriticMemory()
     critic_memory.save_result(result)
+    claim_archive.archive_critic_result(result)
 
     return result
 
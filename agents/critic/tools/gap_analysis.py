@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from agents.critic.schemas.critic_schema import ClaimConsensus, Gap, ImplicationChain
+from agents.critic.tools.claim_consensus import SIMILARITY_THRESHOLD, claim_tokens
+from agents.critic.tools.narrative_phases import long_gaps
+from agents.critic.tools.temporal_index import TemporalIndex
+from agents.pattern_analyzer.schemas.pattern_analyzer_schema import PatternAnalysisResult
+from agents.pattern_analyzer.tools.columnar import ColumnarPatternAnalysis, columnar_view
+from agents.pattern_analyzer.tools.dates import format_timestamp
+from telemetry import get_logger, observe, timed
+
+logger = get_logger("critic.gap_analysis")
+
+# Examples named in an aggregated gap description.
+MAX_EXAMPLES = 3
+# Source classes a same-class caveat is not worth raising for.
+NEUTRAL_CLASSES = {"unknown", "mainstream"}
+
+
+def _examples(items: List[str]) -> str:
+    shown = "; ".join(f"'{item}'" for item in items[:MAX_EXAMPLES])
+    if len(items) > MAX_EXAMPLES:
+        shown += f" and {len(items) - MAX_EXAMPLES} more"
+    return shown
+
+
+def _step_label(premise: str, conclusion: str) -> str:
+    return f"{premise} -> {conclusion}"
+
+
+def _single_source_gaps(chains: List[ImplicationChain]) -> List[Gap]:
+    steps: List[str] = []
+    affected: List[str] = []
+    for chain in chains:
+        single = [s for s in chain.steps if len(s.supporting_sources) == 1 and not s.refuting_sources]
+        if single:
+            steps.extend(_step_label(s.premise, s.conclusion) for s in single)
+            affected.append(chain.description)
+    if not steps:
+        return []
+    return [
+        Gap(
+            description=f"{len(steps)} implication step(s) rest on a single source: {_examples(steps)}.",
+            affected_chains=affected,
+            why_it_matters=(
+                "One outlet's account cannot be cross-checked; the link may reflect that "
+                "outlet's framing rather than an established connection."
+            ),
+        )
+    ]
+
+
+def _homogeneous_support_gaps(
+    chains: List[ImplicationChain],
+    consensus: List[ClaimConsensus],
+    view: ColumnarPatternAnalysis,
+) -> List[Gap]:
+    """
+    Support that comes from two or more sources which all share one country
+    (or one non-mainstream source class).
+    """
+    # (field, value) -> (implication or claim labels, affected chain descriptions)
+    groups: Dict[Tuple[str, str], Tuple[List[str], List[str]]] = defaultdict(lambda: ([], []))
+
+    def _check(urls: List[str], label: str, chain: Optional[str]) -> None:
+        if len(urls) < 2:
+            return
+        rows = [view.url_index[u] for u in urls if u in view.url_index]
+        if len(rows) != len(urls):
+            return
+        for field in ("source_country", "source_class"):
+            column = view.articles[field]
+            codes = {column.codes[r] for r in rows}
+            value = column.values[next(iter(codes))]
+            if len(codes) != 1 or not value or (field == "source_class" and value.lower() in NEUTRAL_CLASSES):
+                continue
+            labels, affected = groups[(field, value)]
+            labels.append(label)
+            if chain and chain not in affected:
+                affected.append(chain)
+
+    for chain in chains:
+        for step in chain.steps:
+            _check(step.supporting_sources, _step_label(step.premise, step.conclusion), chain.description)
+    for item in consensus:
+        _check(item.supporting_sources, item.canonical_claim, None)
+
+    gaps: List[Gap] = []
+    for (field, value), (labels, affected) in groups.items():
+        where = f"outlets in {value}" if field == "source_country" else f"{value} outlets"
+        gaps.append(
+            Gap(
+                description=(
+                    f"Support for {len(labels)} implication(s) or claim(s) comes only from "
+                    f"{where}: {_examples(labels)}."
+                ),
+                affected_chains=affected,
+                why_it_matters=(
+                    "Agreement among sources that share a country or outlet type may reflect a shared "
+                    "perspective or a common upstream source rather than independent confirmation."
+                ),
+            )
+        )
+    return gaps
+
+
+def _prefix_tokens(text: str) -> Set[str]:
+    return {t[:4] for t in claim_tokens(text) if len(t) >= 3}
+
+
+def _is_subject_denial(view: ColumnarPatternAnalysis, row: int) -> bool:
+    """
+    A denial voiced by the party claim `row` blames (e.g. blame_target
+    "China", modality "denied by the Chinese foreign ministry").
+    """
+    blame_target = view.claim("blame_target", row)
+    if not blame_target or view.claim_classes[row] != "denial":
+        return False
+    voiced_by = _prefix_tokens(f"{view.claim('modality', row) or ''} {view.claim('evidence', row) or ''}")
+    return bool(_prefix_tokens(blame_target) & voiced_by)
+
+
+def _subject_denial_gaps(consensus: List[ClaimConsensus], view: ColumnarPatternAnalysis) -> List[Gap]:
+    claims: List[str] = []
+    subjects: List[str] = []
+    texts = view.claims["text"]
+    for item in consensus:
+        if not item.refuting_sources:
+            continue
+        canonical = claim_tokens(item.canonical_claim)
+        denials: List[int] = []
+        for url in item.refuting_sources:
+            article = view.url_index.get(url)
+            for j in view.claim_rows(article) if article is not None else ():
+                tokens = claim_tokens(texts[j])
+                if tokens and len(tokens & canonical) / len(tokens | canonical) >= SIMILARITY_THRESHOLD:
+                    if view.claim_classes[j] == "denial":
+                        denials.append(j)
+        if denials and all(_is_subject_denial(view, j) for j in denials):
+            claims.append(item.canonical_claim)
+            for j in denials:
+                target = view.claim("blame_target", j)
+                if target not in subjects:
+                    subjects.append(target)
+    if not claims:
+        return []
+    return [
+        Gap(
+            description=(
+                f"{len(claims)} claim(s) are disputed only by the party they blame "
+                f"({', '.join(subjects[:MAX_EXAMPLES])}): {_examples(claims)}."
+            ),
+            affected_chains=[],
+            why_it_matters=(
+                "A denial by the accused party is not independent evidence; no third-party "
+                "source confirms or refutes these claims."
+            ),
+        )
+    ]
+
+
+def _temporal_hole_gaps(index: TemporalIndex) -> List[Gap]:
+    # The silences that would start a new narrative phase, so the caveat and
+    # the phases agree on what counts as a hole.
+    ts = index.timestamps
+    holes = [(length, ts[i - 1], ts[i]) for length, i in long_gaps(ts)]
+    gaps: List[Gap] = []
+    if holes:
+        longest = sorted(holes, reverse=True)[:MAX_EXAMPLES]
+        shown = ", ".join(
+            f"{format_timestamp(start)} and {format_timestamp(end)} ({length / 86400.0:.1f} days)"
+            for length, start, end in sorted(longest, key=lambda h: h[1])
+        )
+        if len(holes) > MAX_EXAMPLES:
+            shown += f" (and {len(holes) - MAX_EXAMPLES} shorter silences)"
+        gaps.append(
+            Gap(
+                description=f"No analyzed coverage between {shown}.",
+                affected_chains=[],
+                why_it_matters=(
+                    "Developments during these periods (corrections, official statements, new "
+                    "evidence) may be missing from the analysis."
+                ),
+            )
+        )
+    if index.undated and len(index.undated) * 2 >= len(index.undated) + len(index):
+        gaps.append(
+            Gap(
+                description=(
+                    f"{len(index.undated)} of {len(index.undated) + len(index)} articles "
+                    "have no readable publish date."
+                ),
+                affected_chains=[],
+                why_it_matters="The order in which claims appeared, and so the narrative phases, are uncertain.",
+            )
+        )
+    return gaps
+
+
+def build_gaps(
+    pa: PatternAnalysisResult,
+    chains: List[ImplicationChain],
+    consensus: List[ClaimConsensus],
+) -> List[Gap]:
+    """
+    Deterministic gaps and caveats from the implication chains, the claim
+    consensus and the articles: single-source steps, support from one
+    country or outlet class only, claims disputed only by their subject, and
+    holes in the coverage timeline. One pass over each input; no LLM call.
+    """
+    with timed("critic.gap_analysis_ms"):
+        view = columnar_view(pa)
+        gaps = (
+            _single_source_gaps(chains)
+            + _homogeneous_support_gaps(chains, consensus, view)
+            + _subject_denial_gaps(consensus, view)
+            + _temporal_hole_gaps(TemporalIndex(pa.analyzed_articles))
+        )
+    observe("critic.gaps", float(len(gaps)))
+    return gaps
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import os
+import re
+from collections import defaultdict
+from itertools import combinations
+from typing import Dict, List, Optional, Set, Tuple
+
+from agents.critic.tools.claim_consensus import claim_tokens
+from agents.pattern_analyzer.schemas.pattern_analyzer_schema import PatternAnalysisResult
+from telemetry import get_logger, observe
+
+logger = get_logger("critic.heuristic_candidates")
+
+# Share of articles that must contribute to a heuristic candidate before the
+# LLM is skipped.
+MIN_HEURISTIC_COVERAGE = float(os.getenv("TRUTHLENS_HEURISTIC_MIN_COVERAGE", "0.6"))
+MAX_HEURISTIC_CANDIDATES = int(os.getenv("TRUTHLENS_MAX_HEURISTIC_CANDIDATES", "12"))
+# Summaries that must mention both claims of a co-occurrence candidate.
+MIN_COOCCURRENCE = 2
+# Share of a claim's tokens a text must contain to count as mentioning it.
+MENTION_THRESHOLD = 0.6
+# Claims considered per summary for co-occurrence pairs.
+MAX_MENTIONS_PER_SUMMARY = 6
+# Tokens found in more than this share of claims carry no signal for matching
+# and are left out of the inverted index.
+COMMON_TOKEN_SHARE = 0.02
+MIN_COMMON_TOKEN_CLAIMS = 20
+MIN_FRAGMENT_TOKENS = 2
+MAX_FRAGMENT_WORDS = 30
+
+# "A <cue> B": A is the premise.
+_FORWARD_CUES = re.compile(
+    r"\b(led to|leads to|leading to|resulted in|results in|resulting in|caused|causes|causing|"
+    r"triggered|triggers|prompted|prompting|sparked|forced|paved the way for)\b",
+    re.IGNORECASE,
+)
+# "B <cue> A": A is the premise.
+_BACKWARD_CUES = re.compile(
+    r"\b(because of|because|due to|as a result of|in response to|following|after|amid)\b",
+    re.IGNORECASE,
+)
+_SENTENCE_RE = re.compile(r"(?<=[.!?;])\s+")
+_WORD_RE = re.compile(r"\w+")
+
+
+def _clean(fragment: str) -> str:
+    return fragment.strip(" ,;:.-—\"'").strip()
+
+
+def _cue_pairs(sentence: str) -> List[Tuple[str, str, str]]:
+    """
+    (premise, consequence, cue) pairs stated by causal cue phrases in one sentence.
+    """
+    pairs: List[Tuple[str, str, str]] = []
+    m = _FORWARD_CUES.search(sentence)
+    if m:
+        pairs.append((_clean(sentence[: m.start()]), _clean(sentence[m.end() :]), m.group(1).lower()))
+        return pairs
+    m = _BACKWARD_CUES.search(sentence)
+    if m:
+        cue = m.group(1).lower()
+        if m.start() == 0 and "," in sentence:
+            # "Following A, B" / "In response to A, B"
+            premise, consequence = sentence[m.end() :].split(",", 1)
+        else:
+            consequence, premise = sentence[: m.start()], sentence[m.end() :]
+        pairs.append((_clean(premise), _clean(consequence), cue))
+    return pairs
+
+
+class _ClaimIndex:
+    """
+    Distinct key-claim texts with an inverted index over their informative
+    tokens, for anchoring text fragments to claims without scanning every
+    claim. Ties are broken by claim text, never by position, so the result
+    does not depend on the order articles arrived in.
+    """
+
+    def __init__(self, pa: PatternAnalysisResult) -> None:
+        self.texts: List[str] = []
+        self.tokens: List[Set[str]] = []
+        self.first_seen: List[float] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        seen: Dict[str, int] = {}
+        for article in pa.analyzed_articles:
+            ts = article.publish_ts if article.publish_ts is not None else float("inf")
+            for claim in article.key_claims:
+                text = (claim.text or "").strip()
+                key = text.lower()
+                if not text:
+                    continue
+                if key in seen:
+                    i = seen[key]
+                    self.first_seen[i] = min(self.first_seen[i], ts)
+                    self.texts[i] = min(self.texts[i], text)
+                    continue
+                tokens = claim_tokens(text)
+                if not tokens:
+                    continue
+                seen[key] = len(self.texts)
+                for token in tokens:
+                    self.postings[token].append(len(self.texts))
+                self.texts.append(text)
+                self.tokens.append(tokens)
+                self.first_seen.append(ts)
+
+        limit = max(MIN_COMMON_TOKEN_CLAIMS, COMMON_TOKEN_SHARE * len(self.texts))
+        common = {t for t, claims in self.postings.items() if len(claims) > limit}
+        for token in common:
+            del self.postings[token]
+        self.informative: List[int] = [len(tokens - common) for tokens in self.tokens]
+
+    def mentioned(self, tokens: Set[str], of_fragment: bool = False) -> List[int]:
+        """
+        Claims with at least MENTION_THRESHOLD of their informative tokens in
+        `tokens` (or, with `of_fragment`, of the shorter of the two), best
+        covered first.
+        """
+        hits: Dict[int, int] = defaultdict(int)
+        for token in tokens:
+            for i in self.postings.get(token, ()):
+                hits[i] += 1
+        query = sum(1 for t in tokens if t in self.postings)
+        scored = []
+        for i, n in hits.items():
+            base = min(self.informative[i], query) if of_fragment else self.informative[i]
+            if n / base >= MENTION_THRESHOLD:
+                scored.append((n / base, i))
+        return [i for _, i in sorted(scored, key=lambda s: (-s[0], self.texts[s[1]]))]
+
+    def anchor(self, fragment: str) -> Optional[str]:
+        matches = self.mentioned(claim_tokens(fragment), of_fragment=True)
+        return self.texts[matches[0]] if matches else None
+
+
+def generate_heuristic_candidates(pa: PatternAnalysisResult) -> Tuple[List[Dict[str, str]], float]:
+    """
+    Implication candidates without an LLM, from:
+      - causal cue phrases ("led to", "due to", "in response to", ...) in
+        narrative summaries and claim texts,
+      - claims whose blame_target is the subject of another claim,
+      - pairs of claims mentioned together in several narrative summaries.
+
+    Each side is anchored to the key claim it matches where possible, so the
+    candidate can be verified against key_claims. Returns the candidates
+    (most widely evidenced first) and the share of articles that contributed
+    to at least one of them.
+    """
+    index = _ClaimIndex(pa)
+    support: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+    reasons: Dict[Tuple[str, str], str] = {}
+
+    def _add(premise: str, consequence: str, url: str, reason: str) -> None:
+        if premise.lower() == consequence.lower():
+            return
+        key = (premise, consequence)
+        support[key].add(url)
+        reasons[key] = min(reasons.get(key, reason), reason)
+
+    cooccurring: Dict[Tuple[int, int], Set[str]] = defaultdict(set)
+    for article in pa.analyzed_articles:
+        texts = [c.text for c in article.key_claims if c.text]
+        if article.narrative_summary:
+            texts.append(article.narrative_summary)
+
+        # 1) Causal cue phrases.
+        for text in texts:
+            for sentence in _SENTENCE_RE.split(text):
+                for premise, consequence, cue in _cue_pairs(sentence):
+                    if not all(
+                        len(claim_tokens(f)) >= MIN_FRAGMENT_TOKENS and len(_WORD_RE.findall(f)) <= MAX_FRAGMENT_WORDS
+                        for f in (premise, consequence)
+                    ):
+                        continue
+                    p_anchor, c_anchor = index.anchor(premise), index.anchor(consequence)
+                    if p_anchor or c_anchor:
+                        _add(p_anchor or premise, c_anchor or consequence, article.url, f"causal cue '{cue}'")
+
+        # 2) blame_target: the blamed party's own reported action is the premise.
+        for claim in article.key_claims:
+            if not claim.blame_target or not claim.text:
+                continue
+            target = claim_tokens(claim.blame_target)
+            for i in index.mentioned(target):
+                other = index.texts[i]
+                if target <= index.tokens[i] and other.lower() != claim.text.strip().lower():
+                    _add(other, claim.text.strip(), article.url, f"blames {claim.blame_target}")
+
+        # 3) Claims mentioned together in this summary.
+        if article.narrative_summary:
+            mentioned = index.mentioned(claim_tokens(article.narrative_summary))[:MAX_MENTIONS_PER_SUMMARY]
+            for a, b in combinations(sorted(mentioned), 2):
+                cooccurring[(a, b)].add(article.url)
+
+    for (a, b), urls in cooccurring.items():
+        if len(urls) < MIN_COOCCURRENCE:
+            continue
+        # The claim reported first is taken as the premise.
+        first, second = sorted((a, b), key=lambda i: (index.first_seen[i], index.texts[i]))
+        for url in urls:
+            _add(index.texts[first], index.texts[second], url, f"mentioned together in {len(urls)} summaries")
+
+    ranked = sorted(support.items(), key=lambda item: (-len(item[1]), item[0]))[:MAX_HEURISTIC_CANDIDATES]
+    candidates = [
+        {
+            "premise": premise,
+            "consequence": consequence,
+            "reasoning": f"{reasons[(premise, consequence)]} ({len(urls)} source(s))",
+            "source": "heuristic",
+        }
+        for (premise, consequence), urls in ranked
+    ]
+
+    eligible = [a for a in pa.analyzed_articles if a.narrative_summary or a.key_claims]
+    covered = set().union(*(urls for _, urls in ranked)) if ranked else set()
+    coverage = len(covered) / len(eligible) if eligible else 0.0
+    observe("critic.heuristic_coverage", coverage)
+    logger.info("Heuristic candidates: %d, covering %.0f%% of articles.", len(candidates), coverage * 100)
+    return candidates, coverage
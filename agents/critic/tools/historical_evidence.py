@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from typing import List, Optional, Set, Tuple
+
+from agents.critic.schemas.critic_schema import ClaimConsensus, HistoricalEvidence
+from agents.critic.tools.claim_consensus import SIMILARITY_THRESHOLD, claim_tokens
+from agents.pattern_analyzer.tools.dates import format_timestamp
+from memory import claim_archive
+from telemetry import get_logger, incr, timed
+
+logger = get_logger("critic.historical_evidence")
+
+# Earlier claims reported per canonical claim, most similar first.
+MAX_HISTORY_HITS = int(os.getenv("TRUTHLENS_HISTORY_MAX_HITS", "3"))
+# Archive hits fetched per canonical claim before the similarity check.
+HISTORY_CANDIDATES = 4 * MAX_HISTORY_HITS
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def build_historical_evidence(
+    statement: str,
+    consensus: List[ClaimConsensus],
+    archive: Optional[claim_archive.ClaimArchive] = None,
+) -> List[HistoricalEvidence]:
+    """
+    Claims archived for other statements that match a canonical claim of
+    this one: full-text archive hits, kept when their token Jaccard with the
+    canonical claim reaches the consensus SIMILARITY_THRESHOLD. At most
+    MAX_HISTORY_HITS per canonical claim, one per earlier statement and URL.
+    Empty when the archive is disabled or unreadable.
+    """
+    archive = archive or claim_archive.get_claim_archive()
+    if archive is None or not consensus:
+        return []
+
+    evidence: List[HistoricalEvidence] = []
+    try:
+        with timed("critic.historical_evidence_ms"):
+            for item in consensus:
+                canonical = claim_tokens(item.canonical_claim)
+                scored: List[Tuple[float, int]] = []
+                hits = archive.search_claims(item.canonical_claim, exclude_statement=statement, limit=HISTORY_CANDIDATES)
+                for i, hit in enumerate(hits):
+                    similarity = _jaccard(canonical, claim_tokens(hit.text))
+                    if similarity >= SIMILARITY_THRESHOLD:
+                        scored.append((similarity, i))
+                seen: Set[Tuple[str, str]] = set()
+                for similarity, i in sorted(scored, key=lambda s: (-s[0], s[1])):
+                    hit = hits[i]
+                    if (hit.statement, hit.url) in seen:
+                        continue
+                    seen.add((hit.statement, hit.url))
+                    evidence.append(
+                        HistoricalEvidence(
+                            canonical_claim=item.canonical_claim,
+                            earlier_statement=hit.statement,
+                            source_url=hit.url,
+                            claim_text=hit.text,
+                            modality_class=hit.modality_class,
+                            publish_date=format_timestamp(hit.publish_ts) if hit.publish_ts is not None else None,
+                            similarity=round(similarity, 3),
+                        )
+                    )
+                    if len(seen) >= MAX_HISTORY_HITS:
+                        break
+    except sqlite3.Error as e:
+        logger.warning("Claim archive search failed: %s", e)
+        return []
+
+    incr("critic.historical_evidence", float(len(evidence)))
+    return evidence
@@ -2,20 +2,33 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Any, Dict, List, Optional, Tuple
-
-import google.generativeai as genai
+from array import array
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, List, Optional, Tuple
 
 from agents.critic.schemas.critic_schema import (
     ImplicationChain,
     ImplicationStep,
 )
+from agents.critic.tools.claim_consensus import build_claim_consensus
+from agents.critic.tools.gap_analysis import build_gaps
+from agents.critic.tools.heuristic_candidates import MIN_HEURISTIC_COVERAGE, generate_heuristic_candidates
 from agents.pattern_analyzer.schemas.pattern_analyzer_schema import (
-    ArticleAnalysis,
-    Claim,
     PatternAnalysisResult,
 )
+from agents.llm_client import generate_text
+from agents.run_context import RunCancelled
+from agents.pattern_analyzer.tools.columnar import ColumnarPatternAnalysis, columnar_view
 from memory.pattern_analysis_store import PatternAnalysisMemory
+from telemetry import get_logger, incr, traced
+
+if TYPE_CHECKING:
+    from agents.critic.tools.backend import CriticJob
+
+logger = get_logger("critic.implication_chains")
+
+# "auto": heuristic candidates, Gemini only when they cover too few articles;
+# "heuristic" or "llm" forces one path.
+CANDIDATE_MODE = os.getenv("TRUTHLENS_IMPLICATION_CANDIDATES", "auto").strip().lower()
 
 
 # --- Helpers to load Pattern Analysis ----------------------------------------
@@ -42,7 +55,7 @@ def _load_latest_pattern_analysis() -> PatternAnalysisResult:
 # --- LLM candidate generation (Gemini 2.5 Flash) -----------------------------
 
 
-def _generate_implication_candidates(pa: PatternAnalysisResult) -> List[Dict[str, str]]:
+def generate_llm_candidates(pa: PatternAnalysisResult) -> List[Dict[str, str]]:
     """
     Use Gemini 2.5 Flash to propose candidate implication pairs (premise, consequence)
     based on article narrative summaries.
@@ -61,12 +74,9 @@ def _generate_implication_candidates(pa: PatternAnalysisResult) -> List[Dict[str
 
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
-        print("[ImplicationChains] WARNING: GOOGLE_API_KEY not set. Returning no candidates.")
+        logger.warning("GOOGLE_API_KEY not set. Returning no candidates.")
         return []
 
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel("gemini-2.5-flash")
-
     prompt = f"""
 You are helping to analyze logical implications in news coverage about this statement:
 
@@ -92,8 +102,7 @@ Summaries:
 """.strip()
 
     try:
-        response = model.generate_content(prompt)
-        text = (response.text or "").strip()
+        text = generate_text(prompt, api_key=api_key, caller="implication_candidates")
 
         # Try to clean common markdown fences if the model adds them
         if text.startswith("```"):
@@ -102,7 +111,7 @@ Summaries:
             # crude but helps in many cases
         candidates = json.loads(text)
         if not isinstance(candidates, list):
-            print("[ImplicationChains] LLM returned non-list JSON; ignoring.")
+            logger.warning("LLM returned non-list JSON; ignoring.")
             return []
         # Keep only objects with required keys
         clean: List[Dict[str, str]] = []
@@ -117,71 +126,96 @@ Summaries:
                     {"premise": prem, "consequence": cons, "reasoning": reas}
                 )
         return clean
+    except RunCancelled as e:
+        logger.info("No LLM candidates: %s", e)
+        return []
     except Exception as e:
-        print(f"[ImplicationChains] Error generating candidates: {e}")
+        logger.error("Error generating candidates: %s", e)
         return []
 
 
+def _candidate_key(cand: Dict[str, str]) -> Tuple[str, str]:
+    return (cand["premise"].strip().lower(), cand["consequence"].strip().lower())
+
+
+def generate_implication_candidates(
+    pa: PatternAnalysisResult,
+    llm: Optional[Callable[[PatternAnalysisResult], List[Dict[str, str]]]] = None,
+    heuristic: Optional[Callable[[PatternAnalysisResult], Tuple[List[Dict[str, str]], float]]] = None,
+) -> Tuple[List[Dict[str, str]], str]:
+    """
+    Candidate implication pairs and the path that produced them:
+    "heuristic" (no LLM call), "llm", or "heuristic+llm" when the heuristic
+    candidates covered too few articles and Gemini was asked as well.
+
+    `llm` replaces the Gemini call (e.g. with candidates generated
+    speculatively while extraction was running, see pipeline/speculative.py).
+    `heuristic` replaces generate_heuristic_candidates (e.g. with
+    CriticJob.heuristic_candidates, see agents/critic/tools/backend.py).
+    """
+    llm = llm or generate_llm_candidates
+    heuristic = heuristic or generate_heuristic_candidates
+    if CANDIDATE_MODE == "llm":
+        path, candidates = "llm", llm(pa)
+    else:
+        candidates, coverage = heuristic(pa)
+        well_covered = bool(candidates) and coverage >= MIN_HEURISTIC_COVERAGE
+        if CANDIDATE_MODE == "heuristic" or well_covered or not os.getenv("GOOGLE_API_KEY"):
+            path = "heuristic"
+        else:
+            logger.info("Heuristic coverage %.0f%% is too low; asking the LLM.", coverage * 100)
+            known = {_candidate_key(c) for c in candidates}
+            extra = [c for c in llm(pa) if _candidate_key(c) not in known]
+            path = "heuristic+llm" if candidates else "llm"
+            candidates = candidates + extra
+
+    incr("critic.candidates", float(len(candidates)), path=path)
+    return candidates, path
+
+
 # --- Verification over key_claims -------------------------------------------
 
 
-def _normalize_text(t: str) -> List[str]:
-    return [w for w in t.lower().replace(",", " ").replace(".", " ").split() if w]
+# Share of a candidate side's tokens a key claim must contain to match it.
+SIMILARITY_THRESHOLD = 0.3
 
 
-def _jaccard_similarity(a_words: List[str], b_words: List[str]) -> float:
-    if not a_words or not b_words:
-        return 0.0
-    sa, sb = set(a_words), set(b_words)
-    inter = len(sa & sb)
-    if inter == 0:
-        return 0.0
-    return inter / float(len(sa))
+def _target_tokens(view: ColumnarPatternAnalysis, text: str) -> FrozenSet[int]:
+    return frozenset(view.token_ids(text))
 
 
-def _classify_modality(modality: Optional[str]) -> Optional[str]:
+def _containment(target: FrozenSet[int], claim_ids: array) -> float:
     """
-    Map free-text modality into one of: 'affirmation', 'denial', 'speculation'.
-    Very crude first version; refine as needed.
+    Share of the target's tokens that also occur in the claim.
     """
-    if not modality:
-        return None
-
-    m = modality.lower()
-    if any(k in m for k in ["denies", "denied", "refutes", "refuted", "false"]):
-        return "denial"
-    if any(k in m for k in ["reports", "reported", "claims", "claimed", "alleges", "stated"]):
-        return "affirmation"
-    if any(k in m for k in ["alleged", "allegedly", "suggests", "may", "might", "possibly"]):
-        return "speculation"
-    # Default: treat unknown as speculation rather than hard affirmation/denial
-    return "speculation"
+    if not target or not claim_ids:
+        return 0.0
+    return len(target.intersection(claim_ids)) / len(target)
 
 
 def _check_claim_support(
-    key_claims: List[Claim],
-    target_text: str,
-    similarity_threshold: float = 0.3,
-) -> Optional[str]:
+    view: ColumnarPatternAnalysis,
+    target: FrozenSet[int],
+    similarity_threshold: float = SIMILARITY_THRESHOLD,
+) -> List[Optional[str]]:
     """
-    Fuzzy match target_text against a list of key claims.
-    Returns classified modality ('affirmation', 'denial', 'speculation') or None.
+    Fuzzy match the `target` tokens (see _target_tokens) against the key claims of every article.
+    Returns, per article row, the classified modality ('affirmation', 'denial', 'speculation')
+    of its best matching claim, or None.
     """
-    target_words = _normalize_text(target_text)
-    if not target_words:
-        return None
-
-    best_sim = 0.0
-    best_modality: Optional[str] = None
-
-    for claim in key_claims:
-        claim_words = _normalize_text(claim.text)
-        sim = _jaccard_similarity(target_words, claim_words)
-        if sim >= similarity_threshold and sim > best_sim:
-            classified = _classify_modality(claim.modality)
-            if classified:
-                best_sim = sim
-                best_modality = classified
+    best_sim = [0.0] * len(view)
+    best_modality: List[Optional[str]] = [None] * len(view)
+    if not target:
+        return best_modality
+
+    # One pass over the claim columns instead of a loop per article.
+    for claim_ids, classified, row in zip(view.claim_token_ids, view.claim_classes, view.claim_article):
+        if not classified:
+            continue
+        sim = _containment(target, claim_ids)
+        if sim >= similarity_threshold and sim > best_sim[row]:
+            best_sim[row] = sim
+            best_modality[row] = classified
 
     return best_modality
 
@@ -189,115 +223,179 @@ def _check_claim_support(
 # --- Public tool: build implication chains ----------------------------------
 
 
-def build_implication_chains_tool() -> Dict[str, Any]:
+def candidate_touches_articles(cand: Dict[str, str], view: ColumnarPatternAnalysis) -> bool:
+    """
+    True if any key claim in `view` (e.g. a view of the added articles,
+    built once for all candidates) matches the candidate's premise or
+    consequence, i.e. adding these articles can change its verdict.
+    """
+    premise, consequence = _target_tokens(view, cand["premise"]), _target_tokens(view, cand["consequence"])
+    return any(m is not None for m in _check_claim_support(view, premise) + _check_claim_support(view, consequence))
+
+
+def verify_implication_candidate(
+    view: ColumnarPatternAnalysis,
+    cand: Dict[str, str],
+    idx: int,
+) -> ImplicationChain:
+    """
+    Verify one candidate against key_claims across the articles of `view`
+    (see columnar_view) and turn it into a one-step ImplicationChain
+    numbered `idx`.
+    """
+    premise_text = cand["premise"]
+    conseq_text = cand["consequence"]
+    reasoning = cand.get("reasoning", "")
+    origin = "Heuristic" if cand.get("source") == "heuristic" else "LLM"
+    premise_tokens = _target_tokens(view, premise_text)
+    conseq_tokens = _target_tokens(view, conseq_text)
+
+    premise_votes = {"affirmation": 0, "denial": 0, "speculation": 0}
+    conseq_votes = {"affirmation": 0, "denial": 0, "speculation": 0}
+
+    supporting_sources: List[str] = []
+    refuting_sources: List[str] = []
+
+    # Phase 2: Loop through articles to check support/refutation
+    source_names = view.articles["source_name"]
+    premise_mods = _check_claim_support(view, premise_tokens)
+    conseq_mods = _check_claim_support(view, conseq_tokens)
+    for row, (url, p_mod, c_mod) in enumerate(zip(view.urls, premise_mods, conseq_mods)):
+
+        if p_mod:
+            premise_votes[p_mod] += 1
+        if c_mod:
+            conseq_votes[c_mod] += 1
+
+        # Use URL as canonical source id (or fallback to source_name)
+        src_label = url or (source_names[row] or "unknown_source")
+
+        # supported if this article affirms A AND (affirms B or speculates on B)
+        if p_mod == "affirmation" and c_mod in ("affirmation", "speculation"):
+            supporting_sources.append(src_label)
+
+        # refuted if this article affirms A but denies B
+        if p_mod == "affirmation" and c_mod == "denial":
+            refuting_sources.append(src_label)
+
+    # Decide chain-level verdict for this A -> B
+    if len(supporting_sources) > 1 and not refuting_sources:
+        overall = "consistent"
+        step_assessment = (
+            "well supported by multiple sources with no clear refutations"
+        )
+    elif len(supporting_sources) == 1 and not refuting_sources:
+        overall = "partially supported"
+        step_assessment = "weakly supported (single-source implication)"
+    elif refuting_sources:
+        overall = "contradicted"
+        step_assessment = (
+            "contested: at least one source affirms the premise but denies the consequence"
+        )
+    else:
+        # Check if the premise itself is mostly denied
+        if premise_votes["denial"] > premise_votes["affirmation"]:
+            overall = "contradicted"
+            step_assessment = (
+                "premise itself appears more often denied than affirmed"
+            )
+        else:
+            overall = "speculative"
+            step_assessment = (
+                f"inferred only by {'article wording' if origin == 'Heuristic' else 'LLM'}, "
+                "with no strong article-level corroboration"
+            )
+
+    step = ImplicationStep(
+        premise=premise_text,
+        conclusion=conseq_text,
+        supporting_sources=supporting_sources,
+        refuting_sources=refuting_sources,
+        assessment=step_assessment,
+    )
+
+    chain_description = f"Implication chain {idx}: {premise_text} -> {conseq_text}"
+    notes = (
+        f"{origin} reasoning: {reasoning}. "
+        f"Premise votes: {premise_votes}. Consequence votes: {conseq_votes}."
+    )
+
+    return ImplicationChain(
+        description=chain_description,
+        steps=[step],
+        overall_assessment=overall,
+        notes=notes,
+    )
+
+
+def verify_implication_candidates(
+    pa: PatternAnalysisResult,
+    candidates: List[Dict[str, str]],
+) -> List[ImplicationChain]:
+    """
+    PHASE 2 of build_implication_chains_tool, without any I/O: verify each
+    candidate {"premise", "consequence", "reasoning"} against key_claims across
+    all articles and turn it into a one-step ImplicationChain with a verdict.
+    """
+    view = columnar_view(pa)
+    return [
+        verify_implication_candidate(view, cand, idx)
+        for idx, cand in enumerate(candidates, start=1)
+    ]
+
+
+@traced("critic.implication_chains")
+def build_implication_chains(pa: PatternAnalysisResult, job: Optional["CriticJob"] = None) -> Dict[str, Any]:
     """
-    Tool entrypoint for USP 1: Chain-of-Implications Verification.
+    USP 1: Chain-of-Implications Verification for a given PatternAnalysisResult.
 
-    PHASE 1: Use Gemini 2.5 Flash to propose candidate implication pairs from
-             article narrative summaries.
+    PHASE 1: Propose candidate implication pairs, heuristically from cue
+             phrases, blame targets and co-occurring claims, or with Gemini
+             2.5 Flash from article narrative summaries when the heuristic
+             candidates cover too few articles.
     PHASE 2: Verify each candidate against key_claims across all articles to
              determine how strongly the implication A -> B is supported or
              contradicted.
 
+    With a `job` (agents/critic/tools/backend.py) the heuristic candidates
+    and the verification run on the Critic backend.
+
     Returns:
       {
         "statement": "...",
-        "implication_chains": [ ImplicationChain-as-dict, ... ]
+        "implication_chains": [ ImplicationChain-as-dict, ... ],
+        "candidate_source": "heuristic" | "llm" | "heuristic+llm"
       }
     """
-    pa: PatternAnalysisResult = _load_latest_pattern_analysis()
-    articles: List[ArticleAnalysis] = pa.analyzed_articles
-
-    # Phase 1: LLM candidate generation
-    candidates = _generate_implication_candidates(pa)
+    # Phase 1: candidate generation
+    candidates, path = generate_implication_candidates(
+        pa, heuristic=job.heuristic_candidates if job is not None else None
+    )
     if not candidates:
-        print("[ImplicationChains] No candidates generated by LLM.")
-        return {"statement": pa.statement, "implication_chains": []}
-
-    implication_chains: List[ImplicationChain] = []
-
-    for idx, cand in enumerate(candidates, start=1):
-        premise_text = cand["premise"]
-        conseq_text = cand["consequence"]
-        reasoning = cand.get("reasoning", "")
-
-        premise_votes = {"affirmation": 0, "denial": 0, "speculation": 0}
-        conseq_votes = {"affirmation": 0, "denial": 0, "speculation": 0}
-
-        supporting_sources: List[str] = []
-        refuting_sources: List[str] = []
-
-        # Phase 2: Loop through articles to check support/refutation
-        for art in articles:
-            p_mod = _check_claim_support(art.key_claims, premise_text)
-            c_mod = _check_claim_support(art.key_claims, conseq_text)
-
-            if p_mod:
-                premise_votes[p_mod] += 1
-            if c_mod:
-                conseq_votes[c_mod] += 1
-
-            # Use URL as canonical source id (or fallback to source_name)
-            src_label = art.url or (art.source_name or "unknown_source")
-
-            # supported if this article affirms A AND (affirms B or speculates on B)
-            if p_mod == "affirmation" and c_mod in ("affirmation", "speculation"):
-                supporting_sources.append(src_label)
-
-            # refuted if this article affirms A but denies B
-            if p_mod == "affirmation" and c_mod == "denial":
-                refuting_sources.append(src_label)
-
-        # Decide chain-level verdict for this A -> B
-        if len(supporting_sources) > 1 and not refuting_sources:
-            overall = "consistent"
-            step_assessment = (
-                "well supported by multiple sources with no clear refutations"
-            )
-        elif len(supporting_sources) == 1 and not refuting_sources:
-            overall = "partially supported"
-            step_assessment = "weakly supported (single-source implication)"
-        elif refuting_sources:
-            overall = "contradicted"
-            step_assessment = (
-                "contested: at least one source affirms the premise but denies the consequence"
-            )
-        else:
-            # Check if the premise itself is mostly denied
-            if premise_votes["denial"] > premise_votes["affirmation"]:
-                overall = "contradicted"
-                step_assessment = (
-                    "premise itself appears more often denied than affirmed"
-                )
-            else:
-                overall = "speculative"
-                step_assessment = (
-                    "inferred only by LLM, with no strong article-level corroboration"
-                )
-
-        step = ImplicationStep(
-            premise=premise_text,
-            conclusion=conseq_text,
-            supporting_sources=supporting_sources,
-            refuting_sources=refuting_sources,
-            assessment=step_assessment,
-        )
-
-        chain_description = f"Implication chain {idx}: {premise_text} -> {conseq_text}"
-        notes = (
-            f"LLM reasoning: {reasoning}. "
-            f"Premise votes: {premise_votes}. Consequence votes: {conseq_votes}."
-        )
+        logger.info("No implication candidates generated (%s).", path)
+        return {"statement": pa.statement, "implication_chains": [], "candidate_source": path}
 
-        chain = ImplicationChain(
-            description=chain_description,
-            steps=[step],
-            overall_assessment=overall,
-            notes=notes,
-        )
-        implication_chains.append(chain)
+    if job is not None:
+        implication_chains = job.verify(candidates)
+    else:
+        implication_chains = verify_implication_candidates(pa, candidates)
 
     return {
         "statement": pa.statement,
         "implication_chains": [c.model_dump() for c in implication_chains],
-    }
\ No newline at end of file
+        "candidate_source": path,
+    }
+
+
+def build_implication_chains_tool() -> Dict[str, Any]:
+    """
+    Tool entrypoint for USP 1: runs build_implication_chains() on the latest
+    PatternAnalysisResult in local memory.
+    """
+    pa: PatternAnalysisResult = _load_latest_pattern_analysis()
+    payload = build_implication_chains(pa)
+
+    chains = [ImplicationChain(**c) for c in payload["implication_chains"]]
+    gaps = build_gaps(pa, chains, build_claim_consensus(pa))
+    payload["gaps_and_caveats"] = [g.model_dump() for g in gaps]
+    return payload
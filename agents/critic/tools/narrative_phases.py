@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import heapq
+import os
+import statistics
+from typing import List, Set, Tuple
+
+from agents.critic.schemas.critic_schema import NarrativePhase
+from agents.critic.tools.temporal_index import TemporalIndex
+from agents.pattern_analyzer.schemas.pattern_analyzer_schema import ArticleAnalysis, PatternAnalysisResult
+from agents.pattern_analyzer.tools.dates import format_timestamp
+from telemetry import get_logger, observe
+
+logger = get_logger("critic.narrative_phases")
+
+# A silence between two articles starts a new phase when it is at least this
+# long and at least GAP_FACTOR times the median gap of the story.
+MIN_PHASE_GAP_SECONDS = float(os.getenv("TRUTHLENS_PHASE_MIN_GAP_HOURS", "24")) * 3600.0
+GAP_FACTOR = 3.0
+MAX_PHASES = int(os.getenv("TRUTHLENS_MAX_NARRATIVE_PHASES", "4"))
+KEY_SOURCES_PER_PHASE = 3
+
+
+def long_gaps(timestamps: List[float]) -> List[Tuple[float, int]]:
+    """
+    The unusually long gaps in sorted `timestamps`, as (length, i) for the
+    gap between timestamps[i - 1] and timestamps[i]. The one criterion for
+    both phase boundaries and the Critic's temporal-hole caveat
+    (gap_analysis.py).
+    """
+    if len(timestamps) < 2:
+        return []
+    gaps = [timestamps[i] - timestamps[i - 1] for i in range(1, len(timestamps))]
+    threshold = max(MIN_PHASE_GAP_SECONDS, GAP_FACTOR * statistics.median(gaps))
+    return [(gap, i) for i, gap in enumerate(gaps, start=1) if gap >= threshold]
+
+
+def segment_by_gaps(timestamps: List[float], max_phases: int = MAX_PHASES) -> List[Tuple[int, int]]:
+    """
+    Split sorted `timestamps` into [lo, hi) runs at long_gaps().
+
+    If more than max_phases - 1 gaps qualify, the longest are kept.
+    """
+    n = len(timestamps)
+    if n == 0:
+        return []
+    if n == 1 or max_phases <= 1:
+        return [(0, n)]
+
+    cuts = long_gaps(timestamps)
+    if len(cuts) > max_phases - 1:
+        cuts = heapq.nlargest(max_phases - 1, cuts)
+    positions = sorted(i for _, i in cuts)
+
+    bounds = [0, *positions, n]
+    return list(zip(bounds, bounds[1:]))
+
+
+def _phase_name(position: int, total: int) -> str:
+    if total == 1:
+        return "single_wave"
+    if position == 0:
+        return "initial_coverage"
+    if position == total - 1:
+        return "latest_coverage"
+    return f"follow_up_{position}"
+
+
+def _claim_key(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _describe(articles: List[ArticleAnalysis], seen_claims: Set[str]) -> str:
+    outlets = {a.source_name or a.url for a in articles}
+    countries = sorted({a.source_country for a in articles if a.source_country})
+    new_claims = 0
+    for article in articles:
+        for claim in article.key_claims:
+            key = _claim_key(claim.text)
+            if key and key not in seen_claims:
+                seen_claims.add(key)
+                new_claims += 1
+
+    parts = [
+        f"{len(articles)} article(s) from {len(outlets)} outlet(s)",
+        f"{new_claims} claim(s) not reported earlier",
+    ]
+    if countries:
+        parts.append("coverage from " + ", ".join(countries))
+    return "; ".join(parts) + "."
+
+
+def _key_sources(articles: List[ArticleAnalysis]) -> List[str]:
+    ranked = sorted(enumerate(articles), key=lambda pair: (-len(pair[1].key_claims), pair[0]))
+    return [article.url for _, article in ranked[:KEY_SOURCES_PER_PHASE]]
+
+
+def build_narrative_phases(pa: PatternAnalysisResult) -> List[NarrativePhase]:
+    """
+    Group the analyzed articles into phases of coverage separated by long
+    silences. Articles without a readable publish date are left out.
+    """
+    index = TemporalIndex(pa.analyzed_articles)
+    if index.undated:
+        logger.info("%d articles have no readable publish date; left out of narrative phases.", len(index.undated))
+
+    segments = segment_by_gaps(index.timestamps)
+    phases: List[NarrativePhase] = []
+    seen_claims: Set[str] = set()
+    for position, (lo, hi) in enumerate(segments):
+        articles = index.articles[lo:hi]
+        start, end = format_timestamp(index.timestamps[lo]), format_timestamp(index.timestamps[hi - 1])
+        phases.append(
+            NarrativePhase(
+                phase_name=_phase_name(position, len(segments)),
+                time_range=start if start == end else f"{start} to {end}",
+                description=_describe(articles, seen_claims),
+                key_sources=_key_sources(articles),
+            )
+        )
+
+    observe("critic.narrative_phases", float(len(phases)))
+    return phases
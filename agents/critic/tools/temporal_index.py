@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import List, Optional, Sequence, Tuple
+
+from agents.pattern_analyzer.schemas.pattern_analyzer_schema import ArticleAnalysis
+from agents.pattern_analyzer.tools.dates import parse_publish_dates
+
+
+class TemporalIndex:
+    """
+    Articles sorted by publish time, with O(log n) window queries.
+
+    Uses each article's publish_ts, parsing publish_date for articles stored
+    before publish_ts existed. Articles without a readable date are kept
+    aside in `undated`.
+    """
+
+    def __init__(self, articles: Sequence[ArticleAnalysis]) -> None:
+        missing = [a for a in articles if a.publish_ts is None]
+        parsed = dict(zip(map(id, missing), parse_publish_dates(a.publish_date for a in missing)))
+
+        dated: List[Tuple[float, int, ArticleAnalysis]] = []
+        self.undated: List[ArticleAnalysis] = []
+        for position, article in enumerate(articles):
+            ts = article.publish_ts if article.publish_ts is not None else parsed[id(article)]
+            if ts is None:
+                self.undated.append(article)
+            else:
+                dated.append((ts, position, article))
+        dated.sort(key=lambda entry: (entry[0], entry[1]))
+
+        self.timestamps: List[float] = [ts for ts, _, _ in dated]
+        self.articles: List[ArticleAnalysis] = [article for _, _, article in dated]
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def ordered(self) -> List[ArticleAnalysis]:
+        """
+        All articles, oldest first, undated ones last.
+        """
+        return self.articles + self.undated
+
+    def bounds(self, start: Optional[float] = None, end: Optional[float] = None) -> Tuple[int, int]:
+        """
+        [lo, hi) positions of the articles published in [start, end].
+        """
+        lo = 0 if start is None else bisect_left(self.timestamps, start)
+        hi = len(self.timestamps) if end is None else bisect_right(self.timestamps, end)
+        return lo, max(lo, hi)
+
+    def window(self, start: Optional[float] = None, end: Optional[float] = None) -> List[ArticleAnalysis]:
+        lo, hi = self.bounds(start, end)
+        return self.articles[lo:hi]
+
+    def span(self) -> Optional[Tuple[float, float]]:
+        if not self.timestamps:
+            return None
+        return self.timestamps[0], self.timestamps[-1]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 
 
@@ -16,6 +16,9 @@ class SourceInfo(BaseModel):
     source_class: Optional[str] = None
     source_country: Optional[str] = None
     historical_verdicts: Optional[str] = None
+    # URLs of duplicates collapsed into this source (tracking/AMP/mirror
+    # variants and syndicated copies); only `url` is sent to extraction.
+    aliases: List[str] = Field(default_factory=list)
 
 
 class FactFinderResult(BaseModel):
@@ -24,3 +27,6 @@ class FactFinderResult(BaseModel):
     """
     statement: str
     sources: List[SourceInfo]
+    # The run was cancelled or hit its deadline before the search finished;
+    # `sources` holds what had arrived by then.
+    truncated: bool = False
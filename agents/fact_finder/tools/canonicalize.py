@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import re
+import urllib.parse
+from typing import Optional
+
+# Query parameters that only track the click and never change the page.
+TRACKING_PARAM_PREFIXES = ("utm_", "at_", "_hs", "mc_")
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mkt_tok", "ref", "ref_src",
+    "cmpid", "ocid", "smid", "sr_share", "guccounter", "_ga", "spm", "amp", "outputtype",
+}
+
+# Host prefixes that serve the same article as the bare domain.
+MIRROR_HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+
+_AMP_CACHE_RE = re.compile(r"^/[cvi]/(?:s/)?(?P<rest>.+)$")
+
+
+def strip_tracking_params(url: str) -> str:
+    """
+    `url` without tracking parameters or fragment; everything else untouched.
+    """
+    parts = urllib.parse.urlsplit(url.strip())
+    query = [
+        (k, v)
+        for k, v in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PARAM_PREFIXES)
+    ]
+    return urllib.parse.urlunsplit(
+        (parts.scheme, parts.netloc, parts.path, urllib.parse.urlencode(query), "")
+    )
+
+
+def resolve_amp(url: str) -> str:
+    """
+    The regular page behind an AMP URL, derived from the URL alone:
+    Google AMP cache links (<x>.cdn.ampproject.org/c/s/host/path), amp.
+    hosts, /amp path segments and .amp.html suffixes. Non-AMP URLs are
+    returned unchanged.
+    """
+    parts = urllib.parse.urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    path = parts.path
+    netloc = parts.netloc
+
+    if host.endswith(".cdn.ampproject.org"):
+        match = _AMP_CACHE_RE.match(path)
+        if match:
+            target_host, _, target_path = match.group("rest").partition("/")
+            netloc, path = target_host, "/" + target_path
+            host = target_host.lower()
+
+    if host.startswith("amp."):
+        netloc = netloc[len("amp."):] if netloc.lower().startswith("amp.") else host[len("amp."):]
+
+    if path.endswith(".amp.html"):
+        path = path[: -len(".amp.html")] + ".html"
+    elif path.endswith(".amp"):
+        path = path[: -len(".amp")]
+    segments = [s for s in path.split("/") if s.lower() != "amp"]
+    path = "/".join(segments) or "/"
+    if parts.path.endswith("/") and not path.endswith("/"):
+        path += "/"
+
+    scheme = parts.scheme or "https"
+    return urllib.parse.urlunsplit((scheme, netloc, path, parts.query, parts.fragment))
+
+
+def clean_url(url: str) -> str:
+    """
+    Fetchable form of `url`: AMP resolved, tracking parameters dropped.
+    """
+    return strip_tracking_params(resolve_amp(url))
+
+
+def normalize_host(host: str) -> str:
+    """
+    Lower-case, IDNA-decoded host without trailing dot or mirror prefixes
+    (www., m., mobile., amp.).
+    """
+    host = host.strip().lower().rstrip(".")
+    try:
+        host = host.encode("ascii").decode("idna") if "xn--" in host else host
+    except UnicodeError:
+        pass
+    for prefix in MIRROR_HOST_PREFIXES:
+        if host.startswith(prefix) and host.count(".") >= 2:
+            host = host[len(prefix):]
+            break
+    return host
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalized form of `url` used to detect the same page under different
+    spellings: https, normalized host, AMP resolved, no fragment, no tracking
+    parameters, sorted query, no trailing slash. Used as a key only; fetch
+    `clean_url(url)` instead.
+    """
+    parts = urllib.parse.urlsplit(resolve_amp(url))
+    host = normalize_host(parts.hostname or "")
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    query = [
+        (k, v)
+        for k, v in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PARAM_PREFIXES)
+    ]
+    path = parts.path.rstrip("/") or "/"
+    return urllib.parse.urlunsplit(("https", host, path, urllib.parse.urlencode(sorted(query)), ""))
+
+
+def outlet_key(url: str, source_name: Optional[str] = None) -> str:
+    """
+    Identity of the publishing outlet: the source name when Firecrawl gave
+    one, else the site's registrable domain (approximated by the last two host
+    labels, three for hosts like bbc.co.uk).
+    """
+    if source_name and source_name.strip():
+        return source_name.strip().lower()
+    host = urllib.parse.urlsplit(canonical_url(url)).hostname or ""
+    labels = host.split(".")
+    keep = 3 if len(labels) >= 3 and len(labels[-1]) == 2 and labels[-2] in {"co", "com", "org", "net", "gov", "ac"} else 2
+    return ".".join(labels[-keep:])
@@ -1,27 +1,93 @@
 import os
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional
 
 import requests
 from dotenv import load_dotenv
 from pydantic import ValidationError
 
 from agents.fact_finder.schemas.fact_finder_schema import SourceInfo, FactFinderResult
+from agents.fact_finder.tools.canonicalize import canonical_url, outlet_key
+from agents.fact_finder.tools.near_duplicates import DuplicateFilter, collapse_duplicates
+from agents.fact_finder.tools.query_fanout import QueryVariant, fan_out_enabled, fan_out_search
+from agents.firecrawl_client import firecrawl_request
+from agents.run_context import run_cancelled, with_run_context
 from memory.local_store import LocalFactFinderMemory
+from memory.response_cache import cache_key, get_response_cache
 from memory.session_store import save_fact_finder_result_session
+from memory.source_registry import REGISTRY_FIELDS, get_source_registry
+from telemetry import get_logger, incr, span, traced
+
+logger = get_logger("fact_finder")
 
 load_dotenv()
 
 FIRECRAWL_API_KEY = os.getenv("FIRECRAWL_API_KEY")
-FIRECRAWL_SEARCH_URL = "https://api.firecrawl.dev/v2/search"
+# Base URL can point at a local stub (see benchmarks/stub_server.py).
+FIRECRAWL_API_URL = os.getenv("FIRECRAWL_API_URL", "https://api.firecrawl.dev").rstrip("/")
+FIRECRAWL_SEARCH_URL = f"{FIRECRAWL_API_URL}/v2/search"
+
+# Share of recent outlets the source registry knew, from which the search
+# stops asking Firecrawl for source_class and source_country.
+REGISTRY_MIN_COVERAGE = float(os.getenv("TRUTHLENS_REGISTRY_MIN_COVERAGE", "0.8"))
 
 
 class FirecrawlError(Exception):
     """Custom exception for Firecrawl-related errors."""
 
 
-def call_firecrawl_search(statement: str, limit: int = 5) -> Dict[str, Any]:
+def _search_scrape_format(lean: bool = False) -> Dict[str, Any]:
+    """
+    JSON scrape format for search results. The lean variant leaves the outlet
+    fields (source_class, source_country) to the source registry.
+    """
+    properties: Dict[str, Any] = {
+        "title": {"type": "string"},
+        "url": {"type": "string"},
+        "description": {"type": "string"},
+        "source_name": {"type": "string"},
+        "source_type": {"type": "string"},
+        "source_class": {"type": "string"},
+        "source_country": {"type": "string"},
+        "historical_verdicts": {"type": "string"},
+        "publish_date": {"type": "string", "format": "date"},
+    }
+    if lean:
+        del properties["source_class"], properties["source_country"]
+        prompt = (
+            "Extract the following fields for this result: "
+            "title of the article, direct URL, a brief description, "
+            "the name of the publication (source_name), "
+            "any historical verdicts related to the statements (historical_verdicts), "
+            "and the publication date in dd-mm-yyyy format."
+        )
+    else:
+        prompt = (
+            "Extract the following fields for this result: "
+            "title of the article, direct URL, a brief description, "
+            "the name of the publication (source_name), the country of the publication (source_country), "
+            "any historical verdicts related to the statements (historical_verdicts), "
+            "the type of publication source class (state_media/mainstream/partisan/unknown), and the publication date in dd-mm-yyyy format."
+        )
+    return {
+        "type": "json",
+        "schema": {"type": "object", "properties": properties, "required": ["url"]},
+        "prompt": prompt,
+    }
+
+
+def call_firecrawl_search(
+    statement: str,
+    limit: int = 5,
+    *,
+    query: Optional[str] = None,
+    tbs: Optional[str] = None,
+    location: Optional[str] = None,
+) -> Dict[str, Any]:
     """
     Low-level call to Firecrawl's /v2/search endpoint for a given statement.
+
+    `query` overrides the search text (fan-out variants); `tbs` and `location`
+    are passed through to Firecrawl's time and location filters.
     """
     if not FIRECRAWL_API_KEY:
         raise FirecrawlError("FIRECRAWL_API_KEY is not set in environment")
@@ -29,71 +95,102 @@ def call_firecrawl_search(statement: str, limit: int = 5) -> Dict[str, Any]:
     # CAP LIMIT AT 20
     limit = min(limit, 20)
 
-    payload = {
-        "query": statement,
+    registry = get_source_registry()
+    lean = registry is not None and registry.coverage() >= REGISTRY_MIN_COVERAGE
+    incr("fact_finder.search_schema", variant="lean" if lean else "full")
+
+    payload: Dict[str, Any] = {
+        "query": query or statement,
         "sources": ["web", "news"],
         "limit": limit,
-        "scrapeOptions": {
-            "formats": [
-                {
-                    "type": "json",
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "title": {"type": "string"},
-                            "url": {"type": "string"},
-                            "description": {"type": "string"},
-                            "source_name": {"type": "string"},
-                            "source_type": {"type": "string"},
-                            "source_class": {"type": "string"},
-                            "source_country": {"type": "string"},
-                            "historical_verdicts": {"type": "string"},
-                            "publish_date": {"type": "string", "format": "date"},
-                        },
-                        "required": ["url"],
-                    },
-                    "prompt": (
-                        "Extract the following fields for this result: "
-                        "title of the article, direct URL, a brief description, "
-                        "the name of the publication (source_name), the country of the publication (source_country), "
-                        "any historical verdicts related to the statements (historical_verdicts), "
-                        "the type of publication source class (state_media/mainstream/partisan/unknown), and the publication date in dd-mm-yyyy format."
-                    ),
-                }
-            ]
-        },
+        "scrapeOptions": {"formats": [_search_scrape_format(lean=lean)]},
     }
 
+    if tbs:
+        payload["tbs"] = tbs
+    if location:
+        payload["location"] = location
+
     headers = {
         "Authorization": f"Bearer {FIRECRAWL_API_KEY}",
         "Content-Type": "application/json",
     }
 
+    cache = get_response_cache()
+    key = cache_key("firecrawl_search", payload)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
     try:
-        response = requests.post(
-            FIRECRAWL_SEARCH_URL,
-            json=payload,
-            headers=headers,
-            timeout=60,  # KEEP timeout at 60s as you requested
-        )
-        response.raise_for_status()
-        return response.json()
+        with span("firecrawl.search", limit=limit):
+            response = firecrawl_request(
+                "POST",
+                FIRECRAWL_SEARCH_URL,
+                endpoint="search",
+                json=payload,
+                headers=headers,
+                timeout=60,  # KEEP timeout at 60s as you requested
+            )
+            response.raise_for_status()
+            data = response.json()
     except requests.exceptions.RequestException as e:
+        incr("firecrawl.errors", endpoint="search")
         body = getattr(e.response, "text", None) if getattr(e, "response", None) else None
         raise FirecrawlError(f"Firecrawl API error: {e}. Body: {body}") from e
 
+    if cache is not None:
+        cache.put(key, data)
+    return data
 
-def run_fact_finder(statement: str, limit: int = 5) -> FactFinderResult:
-    """
-    High-level Fact-Finder logic:
 
-    - Calls Firecrawl search.
-    - Normalizes + validates results into SourceInfo objects.
-    - Persists them to memory (both file-backed and session).
-    - Returns a FactFinderResult instance.
+def _normalize_outlet_field(field: str, value: Optional[str]) -> Optional[str]:
+    if not value or not value.strip():
+        return None
+    value = value.strip()
+    if value.lower() in {"unknown", "n/a", "none", "null"}:
+        return None
+    if field == "source_class":
+        return value.lower().replace(" ", "_").replace("-", "_")
+    return value
+
+
+def _apply_source_registry(sources: List[SourceInfo]) -> None:
+    """
+    Record the outlet fields Firecrawl reported for each source in the source
+    registry, then fill in (or, where the registry is confident, replace) them
+    with the registry's majority values, so an outlet is described the same
+    way on every run.
     """
-    api_data = call_firecrawl_search(statement=statement, limit=limit)
+    registry = get_source_registry()
+    if registry is None:
+        return
+    reported: List[Dict[str, Optional[str]]] = []
+    for source in sources:
+        fields = {
+            field: _normalize_outlet_field(field, getattr(source, field)) for field in REGISTRY_FIELDS
+        }
+        registry.record(outlet_key(source.url), fields, url=canonical_url(source.url))
+        reported.append(fields)
+    registry.refresh()
+
+    for source, fields in zip(sources, reported):
+        record = registry.lookup(outlet_key(source.url))
+        if record is None:
+            continue
+        for field, value in record.fields.items():
+            if fields[field] is not None and fields[field] != value:
+                incr("source_registry.overrides", field=field)
+            setattr(source, field, value)
 
+
+def _sources_from_search(api_data: Dict[str, Any]) -> List[SourceInfo]:
+    """
+    Validate one search response into SourceInfo objects (news first, then web),
+    dropping repeats of the exact same URL. Outlet fields are reconciled with
+    the source registry.
+    """
     all_sources: List[SourceInfo] = []
     seen_urls: set[str] = set()
 
@@ -121,10 +218,98 @@ def run_fact_finder(statement: str, limit: int = 5) -> FactFinderResult:
             all_sources.append(source)
             seen_urls.add(url)
 
+    _apply_source_registry(all_sources)
+    return all_sources
+
+
+@traced("stage.fact_finder")
+@with_run_context
+def run_fact_finder(
+    statement: str,
+    limit: int = 5,
+    fan_out: Optional[bool] = None,
+    on_source: Optional[Callable[[SourceInfo], None]] = None,
+) -> FactFinderResult:
+    """
+    High-level Fact-Finder logic:
+
+    - Calls Firecrawl search (or, in fan-out mode, several query variants
+      concurrently, merged and ranked for relevance and outlet diversity).
+    - Normalizes + validates results into SourceInfo objects.
+    - Collapses URL variants and syndicated copies into one source each,
+      keeping the other URLs as aliases.
+    - Persists them to memory (both file-backed and session).
+    - Returns a FactFinderResult instance.
+
+    `fan_out` defaults to TRUTHLENS_FANOUT. In fan-out mode up to
+    TRUTHLENS_FANOUT_MAX_SOURCES (default 2 * limit) sources are kept, and the
+    search stops once `limit` distinct outlets are covered.
+
+    If `on_source` is given (streaming, see pipeline/streaming.py), each
+    distinct source is passed to it as soon as it is validated, before the
+    search has finished. Duplicates are then filtered online, keeping the
+    first arrival of each cluster.
+
+    A `run_context` (agents/run_context.py) bounds the search: once it is
+    cancelled, a fan-out search returns the variants that completed, marked
+    `truncated`, and a single search raises RunCancelled.
+    """
+    if fan_out is None:
+        fan_out = fan_out_enabled()
+    fan_out_max_sources = int(os.getenv("TRUTHLENS_FANOUT_MAX_SOURCES", "0")) or 2 * limit
+
+    dedup = DuplicateFilter() if on_source is not None else None
+
+    def _emit(source: SourceInfo) -> Optional[SourceInfo]:
+        if dedup is None:
+            return source
+        if fan_out and len(dedup.accepted) >= fan_out_max_sources:
+            return None
+        rep = dedup.add(source)
+        if rep is not None:
+            on_source(rep)
+        return rep
+
+    if fan_out:
+
+        def _search_variant(variant: QueryVariant) -> List[SourceInfo]:
+            return _sources_from_search(
+                call_firecrawl_search(
+                    statement=statement,
+                    limit=limit,
+                    query=variant.query,
+                    tbs=variant.tbs,
+                    location=variant.location,
+                )
+            )
+
+        all_sources = fan_out_search(
+            statement,
+            _search_variant,
+            max_sources=fan_out_max_sources,
+            target_outlets=int(os.getenv("TRUTHLENS_FANOUT_TARGET_OUTLETS", "0")) or limit,
+            on_source=_emit if dedup is not None else None,
+        ).sources
+    else:
+        all_sources = _sources_from_search(call_firecrawl_search(statement=statement, limit=limit))
+        if dedup is not None:
+            for source in all_sources:
+                _emit(source)
+            all_sources = dedup.accepted
+
+    if dedup is None:
+        all_sources = collapse_duplicates(all_sources)
+
+    logger.info("Validated %d sources for statement %r.", len(all_sources), statement)
+
     # Normalize statement minimally
     normalized_statement = statement.strip()
 
-    fact_result = FactFinderResult(statement=normalized_statement, sources=all_sources)
+    fact_result = FactFinderResult(
+        statement=normalized_statement,
+        sources=all_sources,
+        truncated=run_cancelled(),
+    )
 
     # Persist to file-backed local memory (so you can inspect anytime)
     file_memory = LocalFactFinderMemory()
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from typing import Dict, List, Optional
+
+from agents.fact_finder.schemas.fact_finder_schema import SourceInfo
+from agents.fact_finder.tools.canonicalize import canonical_url, clean_url
+from telemetry import get_logger, incr
+
+logger = get_logger("fact_finder.dedup")
+
+SIMHASH_BITS = 64
+# Max differing bits for two title+description fingerprints to count as one article.
+DEFAULT_MAX_DISTANCE = int(os.getenv("TRUTHLENS_NEAR_DUP_MAX_DISTANCE", "6"))
+# Texts shorter than this (in tokens) are too generic to fingerprint reliably.
+MIN_TOKENS = 6
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _tokens(source: SourceInfo) -> List[str]:
+    return _TOKEN_RE.findall(f"{source.title or ''} {source.description or ''}".lower())
+
+
+def simhash(tokens: List[str]) -> int:
+    """
+    64-bit SimHash over word unigrams and bigrams.
+    """
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit, w in enumerate(weights) if w > 0)
+
+
+def _completeness(source: SourceInfo) -> int:
+    fields = (
+        source.title,
+        source.description,
+        source.source_name,
+        source.publish_date,
+        source.source_class,
+        source.source_country,
+    )
+    return sum(1 for f in fields if f) + (1 if source.source_type == "news" else 0)
+
+
+def collapse_duplicates(
+    sources: List[SourceInfo],
+    max_distance: int = DEFAULT_MAX_DISTANCE,
+) -> List[SourceInfo]:
+    """
+    Keep one representative per cluster of duplicate sources and record the
+    others' URLs in its `aliases`.
+
+    Sources are clustered when their canonical URLs match (tracking-parameter,
+    AMP and mirror-host variants) or their title+description SimHashes are
+    within `max_distance` bits (syndicated copies). Candidate pairs come from
+    banded LSH: with 64 bits split into max_distance + 1 bands, any pair within
+    the distance shares at least one identical band. The representative is
+    the most complete entry, earliest in the input on ties; its URL is
+    replaced by the cleaned (de-AMPed, untracked) form. Order follows the
+    representatives' original positions.
+    """
+    n = len(sources)
+    parent = list(range(n))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int) -> None:
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+
+    by_canonical: Dict[str, int] = {}
+    for i, source in enumerate(sources):
+        key = canonical_url(source.url)
+        if key in by_canonical:
+            union(by_canonical[key], i)
+            incr("fact_finder.duplicates", kind="canonical")
+        else:
+            by_canonical[key] = i
+
+    bands = max_distance + 1
+    band_width = SIMHASH_BITS // bands
+    fingerprints: Dict[int, int] = {}
+    buckets: Dict[tuple, List[int]] = {}
+    for i, source in enumerate(sources):
+        tokens = _tokens(source)
+        if len(tokens) < MIN_TOKENS:
+            continue
+        fp = fingerprints[i] = simhash(tokens)
+        for b in range(bands):
+            band = fp >> (b * band_width) & ((1 << band_width) - 1)
+            for j in buckets.setdefault((b, band), []):
+                if find(i) != find(j) and bin(fp ^ fingerprints[j]).count("1") <= max_distance:
+                    union(i, j)
+                    incr("fact_finder.duplicates", kind="near")
+            buckets[(b, band)].append(i)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(n):
+        clusters.setdefault(find(i), []).append(i)
+
+    result: List[SourceInfo] = []
+    for root in sorted(clusters):
+        members = clusters[root]
+        rep_index = max(members, key=lambda i: (_completeness(sources[i]), -i))
+        rep = sources[rep_index]
+        url = clean_url(rep.url)
+        aliases: List[str] = []
+        for i in members:
+            for alias in [sources[i].url, *sources[i].aliases]:
+                if alias != url and alias not in aliases:
+                    aliases.append(alias)
+        result.append(rep.model_copy(update={"url": url, "aliases": aliases}))
+
+    if len(result) < n:
+        logger.info("Collapsed %d sources into %d distinct articles.", n, len(result))
+    return result
+
+
+class DuplicateFilter:
+    """
+    Online variant of collapse_duplicates() for streamed sources.
+
+    add() accepts the first source of each cluster (with a cleaned URL) and
+    folds later duplicates into that representative's aliases, so sources can
+    be handed to extraction as soon as they arrive. Unlike the batch version
+    the representative is the first arrival, not the most complete entry.
+    """
+
+    def __init__(self, max_distance: int = DEFAULT_MAX_DISTANCE) -> None:
+        self.max_distance = max_distance
+        self._bands = max_distance + 1
+        self._band_width = SIMHASH_BITS // self._bands
+        self._by_canonical: Dict[str, SourceInfo] = {}
+        self._buckets: Dict[tuple, List[tuple]] = {}
+        self.accepted: List[SourceInfo] = []
+
+    def _band_keys(self, fp: int) -> List[tuple]:
+        mask = (1 << self._band_width) - 1
+        return [(b, fp >> (b * self._band_width) & mask) for b in range(self._bands)]
+
+    def _attach(self, rep: SourceInfo, source: SourceInfo) -> None:
+        for alias in [source.url, *source.aliases]:
+            if alias != rep.url and alias not in rep.aliases:
+                rep.aliases.append(alias)
+
+    def add(self, source: SourceInfo) -> Optional[SourceInfo]:
+        """
+        The new representative for `source`, or None if it duplicates one
+        already accepted.
+        """
+        key = canonical_url(source.url)
+        rep = self._by_canonical.get(key)
+        if rep is not None:
+            incr("fact_finder.duplicates", kind="canonical")
+            self._attach(rep, source)
+            return None
+
+        tokens = _tokens(source)
+        fp = simhash(tokens) if len(tokens) >= MIN_TOKENS else None
+        if fp is not None:
+            for band_key in self._band_keys(fp):
+                for other_fp, other in self._buckets.get(band_key, []):
+                    if bin(fp ^ other_fp).count("1") <= self.max_distance:
+                        incr("fact_finder.duplicates", kind="near")
+                        self._by_canonical[key] = other
+                        self._attach(other, source)
+                        return None
+
+        rep = source.model_copy(update={"url": clean_url(source.url), "aliases": []})
+        self._attach(rep, source)
+        self._by_canonical[key] = rep
+        if fp is not None:
+            for band_key in self._band_keys(fp):
+                self._buckets.setdefault(band_key, []).append((fp, rep))
+        self.accepted.append(rep)
+        return rep
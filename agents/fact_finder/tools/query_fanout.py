@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from agents.fact_finder.schemas.fact_finder_schema import SourceInfo
+from agents.fact_finder.tools.canonicalize import canonical_url, outlet_key
+from agents.run_context import RunCancelled
+from telemetry import bind_context, get_logger, incr, observe
+
+logger = get_logger("fact_finder.fanout")
+
+DEFAULT_MAX_VARIANTS = int(os.getenv("TRUTHLENS_FANOUT_MAX_VARIANTS", "4"))
+# Comma-separated Firecrawl `location` values for regional variants, e.g. "India,Germany".
+DEFAULT_LOCATIONS = [
+    loc.strip() for loc in os.getenv("TRUTHLENS_FANOUT_LOCATIONS", "").split(",") if loc.strip()
+]
+
+# Later results from an outlet that is already in the ranking count for less.
+DIVERSITY_DECAY = 0.5
+
+_STOPWORDS = {
+    "the", "and", "for", "that", "with", "this", "from", "are", "was", "were", "has",
+    "have", "had", "its", "into", "over", "after", "about", "than", "been", "will",
+    "would", "could", "says", "said", "report", "reports", "claim", "claims",
+}
+_ENTITY_RE = re.compile(r"\b[A-Z][\w'’-]*(?:\s+(?:of\s+|the\s+)?[A-Z][\w'’-]*)*")
+_NUMBER_RE = re.compile(r"\b(?:1[89]|20)\d{2}\b|\b\d+(?:\.\d+)?%")
+
+
+def fan_out_enabled() -> bool:
+    return os.getenv("TRUTHLENS_FANOUT", "0").strip().lower() in {"1", "true", "yes", "on"}
+
+
+@dataclass
+class QueryVariant:
+    kind: str
+    query: str
+    tbs: Optional[str] = None  # Firecrawl time filter, e.g. "qdr:m" (past month)
+    location: Optional[str] = None
+
+
+@dataclass
+class FanOutResult:
+    sources: List[SourceInfo]
+    variants_run: List[str] = field(default_factory=list)
+    stopped_early: bool = False
+
+
+def _content_tokens(text: str) -> List[str]:
+    return [t for t in re.findall(r"\w+", text.lower()) if len(t) > 2 and t not in _STOPWORDS]
+
+
+def _entities(statement: str) -> List[str]:
+    """
+    Capitalized name sequences (skipping a lone sentence-initial word), years
+    and percentages.
+    """
+    found: List[str] = []
+    for match in _ENTITY_RE.finditer(statement):
+        text = match.group(0).strip()
+        if match.start() == 0 and " " not in text:
+            continue
+        found.append(text)
+    found.extend(_NUMBER_RE.findall(statement))
+    return list(dict.fromkeys(found))
+
+
+def build_query_variants(
+    statement: str,
+    max_variants: int = DEFAULT_MAX_VARIANTS,
+    locations: Optional[List[str]] = None,
+) -> List[QueryVariant]:
+    """
+    The statement itself first, then entity-focused, recent-only, fact-check
+    and regional phrasings, capped at `max_variants`.
+    """
+    statement = statement.strip()
+    variants = [QueryVariant(kind="original", query=statement)]
+
+    entities = _entities(statement)
+    if entities:
+        entity_query = " ".join(f'"{e}"' if " " in e else e for e in entities)
+        if entity_query.lower() != statement.lower():
+            variants.append(QueryVariant(kind="entity", query=entity_query))
+
+    # Only restrict to recent coverage when the statement is not pinned to a year.
+    if not re.search(r"\b(?:1[89]|20)\d{2}\b", statement):
+        variants.append(QueryVariant(kind="recent", query=statement, tbs="qdr:m"))
+
+    variants.append(QueryVariant(kind="fact_check", query=f"{statement} fact check"))
+
+    for loc in DEFAULT_LOCATIONS if locations is None else locations:
+        variants.append(QueryVariant(kind=f"regional:{loc}", query=statement, location=loc))
+
+    return variants[: max(1, max_variants)]
+
+
+@dataclass
+class _Candidate:
+    source: SourceInfo
+    outlet: str
+    best_position: int
+    variants: int = 1
+
+
+def _relevance(statement_tokens: set, source: SourceInfo) -> float:
+    if not statement_tokens:
+        return 0.0
+    text_tokens = set(_content_tokens(f"{source.title or ''} {source.description or ''}"))
+    return len(statement_tokens & text_tokens) / len(statement_tokens)
+
+
+def _rank_sources(
+    statement: str,
+    candidates: Dict[str, _Candidate],
+    max_sources: int,
+) -> List[SourceInfo]:
+    """
+    Order merged sources by relevance to the statement, search position and
+    how many variants returned them, discounting repeats from one outlet.
+    """
+    statement_tokens = set(_content_tokens(statement))
+    scored = [
+        (
+            _relevance(statement_tokens, c.source)
+            + 0.5 / (1 + c.best_position)
+            + 0.25 * (c.variants - 1),
+            key,
+            c,
+        )
+        for key, c in candidates.items()
+    ]
+
+    ranked: List[SourceInfo] = []
+    per_outlet: Dict[str, int] = {}
+    remaining = sorted(scored, key=lambda item: (-item[0], item[1]))
+    while remaining and len(ranked) < max_sources:
+        best = max(
+            remaining,
+            key=lambda item: item[0] * DIVERSITY_DECAY ** per_outlet.get(item[2].outlet, 0),
+        )
+        remaining.remove(best)
+        ranked.append(best[2].source)
+        per_outlet[best[2].outlet] = per_outlet.get(best[2].outlet, 0) + 1
+    return ranked
+
+
+def fan_out_search(
+    statement: str,
+    search: Callable[[QueryVariant], List[SourceInfo]],
+    *,
+    max_sources: int,
+    target_outlets: int,
+    max_variants: int = DEFAULT_MAX_VARIANTS,
+    on_source: Optional[Callable[[SourceInfo], Optional[SourceInfo]]] = None,
+) -> FanOutResult:
+    """
+    Run all query variants concurrently and merge their sources.
+
+    Results are merged on canonical URL as variants complete. Once
+    `target_outlets` distinct outlets are covered, the remaining variants are
+    abandoned (queued ones cancelled, in-flight ones left to finish in the
+    background), so latency stays close to a single search. Failing variants
+    are skipped; if every variant fails, the first error is raised. Variants
+    abandoned because the run was cancelled are skipped the same way.
+
+    `on_source` (streaming mode) is called with each newly seen URL as soon as
+    its variant completes; it returns the source to keep (possibly rewritten)
+    or None to drop it. Only kept sources are ranked.
+    """
+    variants = build_query_variants(statement, max_variants=max_variants)
+    candidates: Dict[str, _Candidate] = {}
+    outlets: set = set()
+    variants_run: List[str] = []
+    first_error: Optional[BaseException] = None
+    stopped_early = False
+    start = time.perf_counter()
+
+    executor = ThreadPoolExecutor(max_workers=len(variants), thread_name_prefix="fanout")
+    try:
+        pending: Dict[Future, QueryVariant] = {
+            executor.submit(bind_context(search), v): v for v in variants
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                variant = pending.pop(future)
+                try:
+                    sources = future.result()
+                except RunCancelled as e:
+                    first_error = first_error or e
+                    continue
+                except Exception as e:
+                    incr("fact_finder.fanout.errors", kind=variant.kind)
+                    logger.warning("Fan-out variant %s failed: %s", variant.kind, e)
+                    first_error = first_error or e
+                    continue
+
+                variants_run.append(variant.kind)
+                incr("fact_finder.fanout.variants", kind=variant.kind)
+                for position, source in enumerate(sources):
+                    key = canonical_url(source.url)
+                    existing = candidates.get(key)
+                    if existing is None:
+                        if on_source is not None:
+                            source = on_source(source)
+                            if source is None:
+                                continue
+                        outlet = outlet_key(source.url, source.source_name)
+                        candidates[key] = _Candidate(source=source, outlet=outlet, best_position=position)
+                        outlets.add(outlet)
+                    else:
+                        existing.variants += 1
+                        existing.best_position = min(existing.best_position, position)
+                        if source.url != existing.source.url and source.url not in existing.source.aliases:
+                            existing.source.aliases.append(source.url)
+
+            if pending and len(outlets) >= target_outlets:
+                stopped_early = True
+                for future in pending:
+                    future.cancel()
+                incr("fact_finder.fanout.early_stop")
+                break
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if not variants_run and first_error is not None:
+        raise first_error
+
+    observe("fact_finder.fanout.duration_ms", (time.perf_counter() - start) * 1000.0)
+    observe("fact_finder.fanout.variants_used", float(len(variants_run)))
+    logger.info(
+        "Fan-out ran %d/%d variants (%s); %d unique sources from %d outlets%s.",
+        len(variants_run),
+        len(variants),
+        ", ".join(variants_run),
+        len(candidates),
+        len(outlets),
+        " (stopped early)" if stopped_early else "",
+    )
+    return FanOutResult(
+        sources=_rank_sources(statement, candidates, max_sources),
+        variants_run=variants_run,
+        stopped_early=stopped_early,
+    )
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import Any
+
+import requests
+
+from agents.rate_limit import (
+    MAX_RATE_LIMIT_RETRIES,
+    acquire,
+    backoff_seconds,
+    report_rate_limited,
+    retry_after_seconds,
+)
+from agents.run_context import call_abortable, check_cancelled, clip_timeout
+from telemetry import incr
+
+
+def firecrawl_request(method: str, url: str, *, endpoint: str, **kwargs: Any) -> requests.Response:
+    """
+    Single Firecrawl HTTP call shared by the Fact-Finder and Pattern Analyzer.
+
+    Waits for a slot from the shared rate-limit scheduler before every attempt.
+    A 429 pauses the endpoint for Retry-After seconds (process-wide) and is
+    retried up to TRUTHLENS_RATE_LIMIT_RETRIES times; any other response is
+    returned as-is for the caller to check.
+
+    Inside a run context (agents/run_context.py) the timeout is clipped to the
+    run's deadline, and a cancelled run raises RunCancelled instead of sending
+    (or waiting for) the request.
+    """
+    attempt = 0
+    while True:
+        check_cancelled()
+        acquire("firecrawl", endpoint)
+        incr("firecrawl.requests", endpoint=endpoint)
+        if "timeout" in kwargs:
+            kwargs["timeout"] = clip_timeout(kwargs["timeout"])
+        response = call_abortable("firecrawl", requests.request, method, url, **kwargs)
+        if response.status_code != 429 or attempt >= MAX_RATE_LIMIT_RETRIES:
+            return response
+        delay = retry_after_seconds(response.headers.get("Retry-After"))
+        report_rate_limited(
+            "firecrawl",
+            endpoint,
+            delay if delay is not None else backoff_seconds(attempt),
+        )
+        attempt += 1
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import os
+import threading
+from typing import Optional, Tuple
+
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+
+from agents.rate_limit import (
+    MAX_RATE_LIMIT_RETRIES,
+    acquire,
+    backoff_seconds,
+    report_rate_limited,
+    retry_after_seconds,
+)
+from agents.run_context import RunCancelled, call_abortable, check_cancelled
+from memory.response_cache import cache_key, get_response_cache
+from telemetry import get_logger, incr, observe, span
+
+DEFAULT_GEMINI_MODEL = "gemini-2.5-flash"
+
+logger = get_logger("llm")
+
+# The (api_key, endpoint) genai is configured with. genai.configure replaces
+# the process-wide client, so it runs only when these change.
+_CONFIGURED: Optional[Tuple[str, Optional[str]]] = None
+_CONFIGURE_LOCK = threading.Lock()
+
+
+def _configure(api_key: str) -> None:
+    global _CONFIGURED
+    # GEMINI_API_ENDPOINT redirects calls to a REST stub (see benchmarks/stub_server.py).
+    endpoint = os.getenv("GEMINI_API_ENDPOINT")
+    with _CONFIGURE_LOCK:
+        if _CONFIGURED == (api_key, endpoint):
+            return
+        if endpoint:
+            genai.configure(
+                api_key=api_key,
+                transport="rest",
+                client_options={"api_endpoint": endpoint},
+            )
+        else:
+            genai.configure(api_key=api_key)
+        _CONFIGURED = (api_key, endpoint)
+
+
+def generate_text(
+    prompt: str,
+    *,
+    api_key: str,
+    caller: str,
+    model_name: str = DEFAULT_GEMINI_MODEL,
+) -> str:
+    """
+    Single Gemini generate_content call shared by the LLM helpers.
+
+    Records call count, latency and token usage (labelled by `caller`) and
+    returns the stripped response text. Requests go through the shared
+    rate-limit scheduler and 429s are retried after the advertised cooldown;
+    other API errors are re-raised so callers keep their own fallback
+    behaviour. Identical prompts are answered from the shared response cache.
+
+    If the current run is cancelled (agents/run_context.py), no call is made
+    and a call in flight is abandoned; both raise RunCancelled, which the
+    callers' fallbacks treat like any other API error.
+    """
+    cache = get_response_cache()
+    key = cache_key("gemini", {"model": model_name, "prompt": prompt})
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    _configure(api_key)
+    model = genai.GenerativeModel(model_name)
+
+    attempt = 0
+    while True:
+        check_cancelled()
+        acquire("gemini", model_name)
+        incr("gemini.requests", caller=caller, model=model_name)
+        try:
+            with span("gemini.generate_content", caller=caller, model=model_name) as s:
+                response = call_abortable("gemini", model.generate_content, prompt)
+
+                usage = getattr(response, "usage_metadata", None)
+                if usage is not None:
+                    for field_name, metric in (
+                        ("prompt_token_count", "gemini.prompt_tokens"),
+                        ("candidates_token_count", "gemini.output_tokens"),
+                        ("total_token_count", "gemini.total_tokens"),
+                    ):
+                        value = getattr(usage, field_name, None)
+                        if value:
+                            observe(metric, float(value), caller=caller, model=model_name)
+                            s.set_attribute(field_name, int(value))
+            break
+        except (google_exceptions.TooManyRequests, google_exceptions.ResourceExhausted) as e:
+            incr("gemini.errors", caller=caller, model=model_name)
+            if attempt >= MAX_RATE_LIMIT_RETRIES:
+                raise
+            headers = getattr(getattr(e, "response", None), "headers", None) or {}
+            delay = retry_after_seconds(headers.get("Retry-After"))
+            report_rate_limited(
+                "gemini",
+                model_name,
+                delay if delay is not None else backoff_seconds(attempt),
+            )
+            attempt += 1
+        except RunCancelled:
+            raise
+        except Exception:
+            incr("gemini.errors", caller=caller, model=model_name)
+            raise
+
+    observe("gemini.latency_ms", s.duration_ms, caller=caller, model=model_name)
+    logger.debug("%s: Gemini call took %.0f ms", caller, s.duration_ms)
+    text = (response.text or "").strip()
+    if cache is not None and text:
+        cache.put(key, text)
+    return text
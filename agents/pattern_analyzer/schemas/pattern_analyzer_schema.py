@@ -79,14 +79,17 @@ class Claim(BaseModel):
 
     text: str
     modality: Optional[str] = None
+    modality_class: Optional[str] = None     # "affirmation", "denial" or "speculation"
     blame_target: Optional[str] = None
     evidence: Optional[str] = None
+    publish_ts: Optional[float] = None       # its article's publish time (UTC epoch seconds)
 
 
 class ArticleAnalysis(BaseModel):
     url: str
     source_name: Optional[str] = None
     publish_date: Optional[str] = None       # from Fact-Finder
+    publish_ts: Optional[float] = None       # publish_date parsed to UTC epoch seconds
     source_type: Optional[str] = None
     title: Optional[str] = None
 
@@ -108,6 +111,18 @@ class ArticleAnalysis(BaseModel):
     # No overall_tone for now; add later when we actually fill it
 
 
+class ExtractionFailure(BaseModel):
+    """
+    A source URL that produced no valid article after all extract attempts.
+    """
+
+    url: str
+    reason: str                              # e.g. "statistics: Field required"
+    attempts: int = 1                        # 0: skipped by the prefetch classifier
+
+
 class PatternAnalysisResult(BaseModel):
     statement: str
-    analyzed_articles: List[ArticleAnalysis]
\ No newline at end of file
+    analyzed_articles: List[ArticleAnalysis]
+    extraction_failures: List[ExtractionFailure] = []
+    truncated: bool = False                  # run cancelled mid-extraction; unextracted URLs fail as "cancelled"
\ No newline at end of file
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import os
+import statistics
+import urllib.parse
+from typing import Dict, Iterable, List, Optional
+
+from agents.fact_finder.schemas.fact_finder_schema import SourceInfo
+from agents.fact_finder.tools.canonicalize import normalize_host
+from memory.extract_host_stats_store import ExtractHostStatsMemory
+from telemetry import get_logger, incr
+
+logger = get_logger("pattern_analyzer.batching")
+
+# Batch size for hosts without enough history (the former fixed BATCH_SIZE).
+DEFAULT_BATCH_SIZE = int(os.getenv("TRUTHLENS_EXTRACT_BATCH_SIZE", "5"))
+# Batch size for hosts with a fast, clean history.
+MAX_BATCH_SIZE = int(os.getenv("TRUTHLENS_EXTRACT_MAX_BATCH_SIZE", "10"))
+# Batch size for slow hosts, so they hold up as few other URLs as possible.
+SLOW_BATCH_SIZE = 2
+# How many times the failed URLs of a batch are split and retried.
+MAX_SPLIT_DEPTH = int(os.getenv("TRUTHLENS_EXTRACT_SPLIT_DEPTH", "2"))
+
+# A host needs this many recorded URLs before it is classified at all.
+MIN_ATTEMPTS = 2
+# Recent failure rate (failure_rate_ewma) from which a host is extracted on its own.
+FLAKY_FAILURE_RATE = 0.5
+# A host is slow when its job latency exceeds this multiple of the median host,
+# and at least SLOW_FLOOR_MS.
+SLOW_LATENCY_FACTOR = 1.5
+SLOW_FLOOR_MS = float(os.getenv("TRUTHLENS_EXTRACT_SLOW_MS", "30000"))
+
+
+def host_of(url: str) -> str:
+    return normalize_host(urllib.parse.urlsplit(url).hostname or "")
+
+
+class AdaptiveBatcher:
+    """
+    Plans extract batches from the per-host history in ExtractHostStatsMemory.
+
+    Fast, reliable hosts are grouped into batches of MAX_BATCH_SIZE, hosts
+    without history into DEFAULT_BATCH_SIZE, slow hosts into SLOW_BATCH_SIZE
+    and flaky hosts get a batch of their own, so one bad host cannot stall or
+    fail the URLs of the others.
+    """
+
+    def __init__(self, memory: Optional[ExtractHostStatsMemory] = None) -> None:
+        self.memory = memory or ExtractHostStatsMemory()
+
+    def classify(self, host: str, stats: Dict[str, Dict]) -> str:
+        """
+        "flaky", "slow", "fast" or "unknown" for `host`, given all host stats.
+        """
+        entry = stats.get(host)
+        if not entry or entry.get("attempts", 0) < MIN_ATTEMPTS:
+            return "unknown"
+        failure_rate = entry.get("failure_rate_ewma")
+        if failure_rate is None:
+            failure_rate = entry["failures"] / entry["attempts"]
+        if failure_rate >= FLAKY_FAILURE_RATE:
+            return "flaky"
+
+        latency = entry.get("latency_ewma_ms")
+        if latency is None:
+            return "unknown"
+        known = [e["latency_ewma_ms"] for e in stats.values() if e.get("latency_ewma_ms") is not None]
+        threshold = max(SLOW_FLOOR_MS, SLOW_LATENCY_FACTOR * statistics.median(known))
+        return "slow" if latency > threshold else "fast"
+
+    def plan(self, sources: List[SourceInfo]) -> List[List[SourceInfo]]:
+        """
+        Split `sources` into extract batches by host class. Batches keep the
+        input order within each class; classes are emitted fast, unknown, slow,
+        then flaky, so the reliable work is submitted first.
+        """
+        stats = self.memory.all_stats()
+        groups: Dict[str, List[SourceInfo]] = {"fast": [], "unknown": [], "slow": [], "flaky": []}
+        for src in sources:
+            groups[self.classify(host_of(src.url), stats)].append(src)
+
+        sizes = {"fast": MAX_BATCH_SIZE, "unknown": DEFAULT_BATCH_SIZE, "slow": SLOW_BATCH_SIZE, "flaky": 1}
+        batches: List[List[SourceInfo]] = []
+        for kind, members in groups.items():
+            size = max(1, sizes[kind])
+            for i in range(0, len(members), size):
+                batches.append(members[i : i + size])
+            if members:
+                incr("extract.batching.sources", float(len(members)), host_class=kind)
+
+        logger.info(
+            "Planned %d extract batches (fast=%d, unknown=%d, slow=%d, flaky=%d sources).",
+            len(batches),
+            *(len(groups[k]) for k in ("fast", "unknown", "slow", "flaky")),
+        )
+        return batches
+
+    def plan_stream(self, batches: Iterable[List[SourceInfo]]) -> Iterable[List[SourceInfo]]:
+        """
+        plan() applied to each batch of a stream as it arrives.
+        """
+        for batch in batches:
+            yield from self.plan(batch)
+
+    def record(
+        self,
+        batch_sources: List[SourceInfo],
+        failed: List[SourceInfo],
+        latency_ms: Optional[float],
+    ) -> None:
+        """
+        Record the outcome of one extract job for every host in it.
+        """
+        failed_ids = {id(src) for src in failed}
+        outcomes: Dict[str, Dict[str, int]] = {}
+        for src in batch_sources:
+            counts = outcomes.setdefault(host_of(src.url), {"ok": 0, "failed": 0})
+            counts["failed" if id(src) in failed_ids else "ok"] += 1
+        self.memory.record(outcomes, latency_ms)
+
+
+def split_in_half(sources: List[SourceInfo]) -> List[List[SourceInfo]]:
+    if len(sources) <= 1:
+        return [sources]
+    mid = (len(sources) + 1) // 2
+    return [sources[:mid], sources[mid:]]
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import math
+import sys
+import threading
+import weakref
+from array import array
+from typing import Any, Dict, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from agents.pattern_analyzer.schemas.pattern_analyzer_schema import (
+    ArticleAnalysis,
+    Claim,
+    ExtractionFailure,
+    PatternAnalysisResult,
+)
+from agents.pattern_analyzer.tools.modality import classify_modality
+from agents.tokenization import Vocabulary
+from telemetry import incr
+
+T = TypeVar("T")
+
+# Article and claim fields stored dictionary-encoded: few distinct values,
+# repeated across many rows.
+ARTICLE_CATEGORIES = ("source_name", "source_country", "source_class", "source_type")
+CLAIM_CATEGORIES = ("modality", "modality_class", "blame_target")
+# Free-text fields, stored as plain lists.
+ARTICLE_TEXTS = ("publish_date", "title", "narrative_summary", "statistics", "stance", "bias_indicators")
+CLAIM_TEXTS = ("text", "evidence")
+
+# Every model field must map to a column, or the round trip would drop it
+# (checked by tests/test_columnar.py).
+
+
+class Categorical(Generic[T]):
+    """
+    Dictionary-encoded column: each distinct value (None included) is stored
+    once in `values`, rows hold its index in a compact unsigned array.
+    """
+
+    __slots__ = ("values", "codes", "_index")
+
+    def __init__(self, items: Iterable[T] = ()) -> None:
+        self.values: List[T] = []
+        self.codes = array("H")
+        self._index: Dict[T, int] = {}
+        for item in items:
+            self.append(item)
+
+    def append(self, value: T) -> None:
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+            if code > 0xFFFF and self.codes.typecode == "H":
+                self.codes = array("I", self.codes)
+        self.codes.append(code)
+
+    def code_of(self, value: T) -> Optional[int]:
+        return self._index.get(value)
+
+    def __getitem__(self, row: int) -> T:
+        return self.values[self.codes[row]]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __iter__(self) -> Iterator[T]:
+        values = self.values
+        return (values[c] for c in self.codes)
+
+
+class FloatColumn:
+    """
+    Optional floats in an array('d'), with NaN standing for None.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, items: Iterable[Optional[float]] = ()) -> None:
+        self.data = array("d", (math.nan if x is None else x for x in items))
+
+    def append(self, value: Optional[float]) -> None:
+        self.data.append(math.nan if value is None else value)
+
+    def __getitem__(self, row: int) -> Optional[float]:
+        value = self.data[row]
+        return None if value != value else value
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __iter__(self) -> Iterator[Optional[float]]:
+        return (None if v != v else v for v in self.data)
+
+
+class ColumnarPatternAnalysis:
+    """
+    Column-oriented copy of a PatternAnalysisResult for the analysis loops.
+
+    Article fields are columns indexed by article row, claim fields columns
+    indexed by claim row; the claims of article i are rows
+    claim_offsets[i]:claim_offsets[i + 1], and claim_article maps a claim row
+    back to its article. Outlet metadata, modalities and blame targets are
+    dictionary-encoded, URLs interned. to_result() rebuilds an equal
+    PatternAnalysisResult.
+    """
+
+    __slots__ = (
+        "statement",
+        "extraction_failures",
+        "truncated",
+        "urls",
+        "url_index",
+        "articles",
+        "claims",
+        "claim_offsets",
+        "claim_article",
+        "vocabulary",
+        "_claim_token_ids",
+        "_claim_classes",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        statement: str,
+        articles: Iterable[ArticleAnalysis],
+        extraction_failures: Iterable[ExtractionFailure] = (),
+        truncated: bool = False,
+    ) -> None:
+        self.statement = statement
+        self.extraction_failures: List[ExtractionFailure] = list(extraction_failures)
+        self.truncated = truncated
+        self.urls: List[str] = []
+        self.url_index: Dict[str, int] = {}
+        self.articles: Dict[str, Any] = {
+            **{f: Categorical() for f in ARTICLE_CATEGORIES},
+            **{f: [] for f in ARTICLE_TEXTS},
+            "publish_ts": FloatColumn(),
+        }
+        self.claims: Dict[str, Any] = {
+            **{f: Categorical() for f in CLAIM_CATEGORIES},
+            **{f: [] for f in CLAIM_TEXTS},
+            "publish_ts": FloatColumn(),
+        }
+        self.claim_offsets = array("I", [0])
+        self.claim_article = array("I")
+        # Token IDs of this view, shared by its claims and every text
+        # matched against them (agents/tokenization.py).
+        self.vocabulary = Vocabulary()
+        self._claim_token_ids: Optional[List[array]] = None
+        self._claim_classes: Optional[List[Optional[str]]] = None
+
+        for row, article in enumerate(articles):
+            url = sys.intern(article.url)
+            self.urls.append(url)
+            self.url_index.setdefault(url, row)
+            for field, column in self.articles.items():
+                column.append(getattr(article, field))
+            for claim in article.key_claims:
+                for field, column in self.claims.items():
+                    column.append(getattr(claim, field))
+                self.claim_article.append(row)
+            self.claim_offsets.append(len(self.claim_article))
+        incr("columnar.views_built")
+
+    @classmethod
+    def from_result(cls, pa: PatternAnalysisResult) -> "ColumnarPatternAnalysis":
+        return cls(pa.statement, pa.analyzed_articles, pa.extraction_failures, pa.truncated)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The vocabulary holds a lock, so a pickled view starts a new one and
+        # rebuilds its token IDs on first use.
+        state = {name: getattr(self, name) for name in self.__slots__ if name not in ("__weakref__", "vocabulary")}
+        state["_claim_token_ids"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.vocabulary = Vocabulary()
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    @property
+    def claim_count(self) -> int:
+        return len(self.claim_article)
+
+    def article(self, field: str, row: int) -> Any:
+        return self.articles[field][row]
+
+    def claim(self, field: str, row: int) -> Any:
+        return self.claims[field][row]
+
+    def claim_rows(self, row: int) -> range:
+        """
+        Claim rows of article `row`.
+        """
+        return range(self.claim_offsets[row], self.claim_offsets[row + 1])
+
+    def token_ids(self, text: str) -> array:
+        return self.vocabulary.token_ids(text)
+
+    @property
+    def claim_token_ids(self) -> List[array]:
+        """
+        Token IDs of each claim text, built on first use.
+        """
+        if self._claim_token_ids is None:
+            self._claim_token_ids = [self.token_ids(text) for text in self.claims["text"]]
+        return self._claim_token_ids
+
+    @property
+    def claim_classes(self) -> List[Optional[str]]:
+        """
+        Each claim's modality class: the stored modality_class, or the
+        classified modality for results stored before it existed.
+        """
+        if self._claim_classes is None:
+            stored: Categorical = self.claims["modality_class"]
+            modality: Categorical = self.claims["modality"]
+            self._claim_classes = [cls or classify_modality(text) for cls, text in zip(stored, modality)]
+        return self._claim_classes
+
+    def claim_model(self, row: int) -> Claim:
+        return Claim(**{field: column[row] for field, column in self.claims.items()})
+
+    def article_model(self, row: int) -> ArticleAnalysis:
+        fields = {field: column[row] for field, column in self.articles.items()}
+        return ArticleAnalysis(
+            url=self.urls[row],
+            key_claims=[self.claim_model(j) for j in self.claim_rows(row)],
+            **fields,
+        )
+
+    def to_result(self) -> PatternAnalysisResult:
+        """
+        The PatternAnalysisResult this view was built from (an equal copy).
+        """
+        return PatternAnalysisResult(
+            statement=self.statement,
+            analyzed_articles=[self.article_model(i) for i in range(len(self))],
+            extraction_failures=list(self.extraction_failures),
+            truncated=self.truncated,
+        )
+
+
+# Views built by columnar_view, by id() of their result. The result is held
+# weakly.
+_VIEWS: Dict[int, Tuple["weakref.ref[PatternAnalysisResult]", ColumnarPatternAnalysis]] = {}
+_VIEWS_LOCK = threading.Lock()
+
+
+def columnar_view(pa: PatternAnalysisResult) -> ColumnarPatternAnalysis:
+    """
+    The columnar view of `pa`, built on first request and shared by every
+    later caller while `pa` is alive. Results are treated as final once
+    viewed: code that edits one in place must call invalidate_columnar_view().
+    """
+    key = id(pa)
+    with _VIEWS_LOCK:
+        cached = _VIEWS.get(key)
+        if cached is not None and cached[0]() is pa:
+            return cached[1]
+    view = ColumnarPatternAnalysis.from_result(pa)
+    with _VIEWS_LOCK:
+        _VIEWS[key] = (weakref.ref(pa, lambda _, key=key: _VIEWS.pop(key, None)), view)
+    return view
+
+
+def invalidate_columnar_view(pa: PatternAnalysisResult) -> None:
+    """
+    Drop the cached view of `pa` after editing it in place; the next
+    columnar_view() call rebuilds it.
+    """
+    with _VIEWS_LOCK:
+        cached = _VIEWS.get(id(pa))
+        if cached is not None and cached[0]() is pa:
+            del _VIEWS[id(pa)]
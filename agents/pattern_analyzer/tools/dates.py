@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import calendar
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_tz
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from telemetry import incr
+
+# Firecrawl is asked for dd-mm-yyyy, so an ambiguous numeric date is read day first.
+DAY_FIRST = True
+
+_MONTHS: Dict[str, int] = {}
+for _i, _name in enumerate(calendar.month_name):
+    if _i:
+        _MONTHS[_name.lower()] = _i
+        _MONTHS[calendar.month_abbr[_i].lower()] = _i
+_MONTHS["sept"] = 9
+
+_ISO_RE = re.compile(
+    r"^(\d{4})-(\d{1,2})-(\d{1,2})"
+    r"(?:[T ](\d{1,2}):(\d{2})(?::(\d{2})(?:\.\d+)?)?\s*(Z|[+-]\d{2}:?\d{2})?)?$",
+    re.IGNORECASE,
+)
+_YMD_RE = re.compile(r"^(\d{4})[/.](\d{1,2})[/.](\d{1,2})$")
+_DMY_RE = re.compile(r"^(\d{1,2})[-/.](\d{1,2})[-/.](\d{2}|\d{4})$")
+_DAY_MONTH_NAME_RE = re.compile(r"^(\d{1,2})(?:st|nd|rd|th)?\s+([a-z]+)\.?,?\s+(\d{4})$", re.IGNORECASE)
+_MONTH_NAME_DAY_RE = re.compile(r"^([a-z]+)\.?\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})$", re.IGNORECASE)
+_MONTH_NAME_RE = re.compile(r"^([a-z]+)\.?,?\s+(\d{4})$", re.IGNORECASE)
+_EPOCH_RE = re.compile(r"^\d{9,13}$")
+
+
+def _timestamp(
+    year: int,
+    month: int,
+    day: int,
+    hour: int = 0,
+    minute: int = 0,
+    second: int = 0,
+    offset_seconds: int = 0,
+) -> Optional[float]:
+    if year < 100:
+        year += 2000 if year < 70 else 1900
+    try:
+        dt = datetime(year, month, day, hour, minute, second, tzinfo=timezone.utc)
+    except ValueError:
+        return None
+    return dt.timestamp() - offset_seconds
+
+
+def _offset(tz: Optional[str]) -> int:
+    if not tz or tz.upper() == "Z":
+        return 0
+    sign = -1 if tz[0] == "-" else 1
+    digits = tz[1:].replace(":", "")
+    return sign * (int(digits[:2]) * 3600 + int(digits[2:]) * 60)
+
+
+def _day_month(a: int, b: int) -> Tuple[int, int]:
+    """
+    (day, month) for a numeric a-b-yyyy date: day first unless that is impossible.
+    """
+    if DAY_FIRST:
+        return (a, b) if b <= 12 else (b, a)
+    return (b, a) if a <= 12 else (a, b)
+
+
+@lru_cache(maxsize=4096)
+def _parse(text: str) -> Optional[float]:
+    m = _ISO_RE.match(text)
+    if m:
+        y, mo, d, hh, mm, ss, tz = m.groups()
+        return _timestamp(int(y), int(mo), int(d), int(hh or 0), int(mm or 0), int(ss or 0), _offset(tz))
+
+    m = _DMY_RE.match(text)
+    if m:
+        day, month = _day_month(int(m.group(1)), int(m.group(2)))
+        return _timestamp(int(m.group(3)), month, day)
+
+    m = _YMD_RE.match(text)
+    if m:
+        return _timestamp(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+
+    m = _DAY_MONTH_NAME_RE.match(text)
+    if m and m.group(2).lower() in _MONTHS:
+        return _timestamp(int(m.group(3)), _MONTHS[m.group(2).lower()], int(m.group(1)))
+
+    m = _MONTH_NAME_DAY_RE.match(text)
+    if m and m.group(1).lower() in _MONTHS:
+        return _timestamp(int(m.group(3)), _MONTHS[m.group(1).lower()], int(m.group(2)))
+
+    m = _MONTH_NAME_RE.match(text)
+    if m and m.group(1).lower() in _MONTHS:
+        return _timestamp(int(m.group(2)), _MONTHS[m.group(1).lower()], 1)
+
+    if _EPOCH_RE.match(text):
+        value = int(text)
+        return value / 1000.0 if len(text) > 10 else float(value)
+
+    # RFC 2822, as in RSS feeds: "Sat, 10 May 2025 14:03:00 +0000".
+    parts = parsedate_tz(text)
+    if parts:
+        return _timestamp(*parts[:6], offset_seconds=parts[9] or 0)
+    return None
+
+
+def parse_publish_date(value: Optional[str]) -> Optional[float]:
+    """
+    UTC epoch seconds for a publish date in any of the formats sources report
+    (dd-mm-yyyy, ISO 8601, "10 May 2025", "May 10, 2025", RFC 2822, epoch),
+    or None if it cannot be read. Results are cached per distinct string.
+    """
+    if not value:
+        return None
+    text = " ".join(str(value).split())
+    if not text:
+        return None
+    result = _parse(text)
+    if result is None:
+        incr("dates.unparsed")
+    return result
+
+
+def parse_publish_dates(values: Iterable[Optional[str]]) -> List[Optional[float]]:
+    """
+    parse_publish_date() over a column of values: each distinct string is
+    parsed once, however often it repeats.
+    """
+    values = list(values)
+    parsed = {v: parse_publish_date(v) for v in set(values)}
+    return [parsed[v] for v in values]
+
+
+def format_timestamp(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d")
@@ -1,27 +1,69 @@
 import os
 import time
 import urllib.parse
-from typing import Any, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import requests
 from pydantic import ValidationError
 
 from agents.fact_finder.schemas.fact_finder_schema import FactFinderResult, SourceInfo
+from agents.fact_finder.tools.canonicalize import canonical_url
+from agents.pattern_analyzer.tools.adaptive_batching import (
+    MAX_SPLIT_DEPTH,
+    AdaptiveBatcher,
+    split_in_half,
+)
+from agents.pattern_analyzer.tools.dates import parse_publish_dates
+from agents.pattern_analyzer.tools.modality import classify_modality
+from agents.pattern_analyzer.tools.prefetch import PrefetchClassifier, prefetch_enabled
 from agents.pattern_analyzer.schemas.pattern_analyzer_schema import (
     ArticleAnalysis,
     Claim,
     ExtractArticle,
+    ExtractionFailure,
     FirecrawlExtractResult,
     PatternAnalysisResult,
 )
+from agents.firecrawl_client import firecrawl_request
+from agents.run_context import (
+    RunCancelled,
+    check_cancelled,
+    run_cancelled,
+    shielded,
+    sleep,
+    with_run_context,
+)
+from memory import claim_archive
 from memory.local_store import LocalFactFinderMemory
 from memory.pattern_analysis_store import PatternAnalysisMemory
+from memory.response_cache import cache_key, get_response_cache
 from memory.session_store import (
     get_latest_fact_finder_result_session,
     save_pattern_analysis_result_session,
 )
+from telemetry import bind_context, get_logger, incr, observe, span, traced
+
+logger = get_logger("pattern_analyzer")
+
+FIRECRAWL_API_URL = os.getenv("FIRECRAWL_API_URL", "https://api.firecrawl.dev").rstrip("/")
+FIRECRAWL_EXTRACT_URL = f"{FIRECRAWL_API_URL}/v2/extract"
+
+# Seconds between extract status polls (lowered by the offline benchmarks).
+EXTRACT_POLL_INTERVAL_SECONDS = float(os.getenv("FIRECRAWL_POLL_INTERVAL_SECONDS", "5"))
+
+# Extract jobs kept in flight at once (each still passes the shared rate limiter).
+EXTRACT_CONCURRENCY = int(os.getenv("TRUTHLENS_EXTRACT_CONCURRENCY", "2"))
 
-FIRECRAWL_EXTRACT_URL = "https://api.firecrawl.dev/v2/extract"
+# Cancel extract jobs upstream (DELETE /v2/extract/<id>) when a run is cancelled.
+# Turned off for the process after the first 404/405, i.e. when the API does not
+# support it.
+CANCEL_EXTRACT_JOBS = os.getenv("TRUTHLENS_FIRECRAWL_CANCEL_JOBS", "1").strip().lower() not in {
+    "0", "false", "no", "off",
+}
+_cancel_supported = True
+
+CANCELLED_REASON = "cancelled"
 
 # Hosts that are primarily video / non-text and should be skipped
 NON_TEXTUAL_HOST_SUBSTRINGS = [
@@ -66,16 +108,23 @@ def _start_extract_job(payload: Dict[str, Any], api_key: str) -> str:
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json",
     }
-    print(f"[PatternAnalyzer] Starting Firecrawl extract job for {len(payload.get('urls', []))} URLs...")
-    response = requests.post(
-        FIRECRAWL_EXTRACT_URL,
-        json=payload,
-        headers=headers,
-        timeout=90,
-    )
-    response.raise_for_status()
+    logger.info("Starting Firecrawl extract job for %d URLs...", len(payload.get("urls", [])))
+    try:
+        with span("firecrawl.extract_start", urls=len(payload.get("urls", []))):
+            response = firecrawl_request(
+                "POST",
+                FIRECRAWL_EXTRACT_URL,
+                endpoint="extract_start",
+                json=payload,
+                headers=headers,
+                timeout=90,
+            )
+            response.raise_for_status()
+    except requests.exceptions.RequestException:
+        incr("firecrawl.errors", endpoint="extract_start")
+        raise
     data = response.json()
-    print(f"[PatternAnalyzer] Firecrawl start-job response: {repr(data)[:500]}")
+    logger.debug("Firecrawl start-job response: %s", repr(data)[:500])
     job_id = data.get("id")
     if not job_id:
         raise RuntimeError(f"Firecrawl extract response missing job id: {data}")
@@ -90,33 +139,41 @@ def _poll_extract_job(job_id: str, api_key: str, timeout_seconds: int = 300) ->
     start_time = time.time()
     attempt = 0
 
-    print(f"[PatternAnalyzer] Polling Firecrawl job {job_id} (timeout={timeout_seconds}s)...")
+    logger.info("Polling Firecrawl job %s (timeout=%ss)...", job_id, timeout_seconds)
 
     while True:
         attempt += 1
         try:
-            response = requests.get(status_url, headers=headers, timeout=60)
+            response = firecrawl_request(
+                "GET",
+                status_url,
+                endpoint="extract_poll",
+                headers=headers,
+                timeout=60,
+            )
             response.raise_for_status()
             data = response.json()
         except requests.exceptions.RequestException as e:
+            incr("firecrawl.errors", endpoint="extract_poll")
             elapsed = time.time() - start_time
-            print(f"[PatternAnalyzer] ERROR polling job {job_id} attempt {attempt}: {e}")
+            logger.error("ERROR polling job %s attempt %d: %s", job_id, attempt, e)
             if elapsed > timeout_seconds:
                 raise TimeoutError(
                     f"Firecrawl extract job {job_id} polling timed out after {elapsed:.1f} seconds. "
                     f"Last error: {e}"
                 ) from e
-            time.sleep(5)
+            sleep(EXTRACT_POLL_INTERVAL_SECONDS)
             continue
 
         status = data.get("status")
-        print(f"[PatternAnalyzer] Job {job_id} attempt {attempt} status: {status!r}")
+        logger.info("Job %s attempt %d status: %r", job_id, attempt, status)
 
         if status == "completed":
-            print(f"[PatternAnalyzer] Job {job_id} completed.")
+            logger.info("Job %s completed.", job_id)
+            observe("firecrawl.extract_job.polls", float(attempt))
             return data
 
-        if status in {"failed", "error"}:
+        if status in {"failed", "error", "cancelled"}:
             raise RuntimeError(f"Firecrawl extract job {job_id} failed: {data}")
 
         elapsed = time.time() - start_time
@@ -126,166 +183,492 @@ def _poll_extract_job(job_id: str, api_key: str, timeout_seconds: int = 300) ->
                 f"Last known status: {status}"
             )
 
-        time.sleep(5)
+        sleep(EXTRACT_POLL_INTERVAL_SECONDS)
 
 
-def run_pattern_analyzer() -> PatternAnalysisResult:
+def _cancel_extract_job(job_id: str, api_key: str) -> None:
     """
-    Pattern Analyzer workflow with batching and verbose debugging.
+    Best-effort upstream cancel of an extract job whose run was cancelled.
+    Runs outside the (already cancelled) run context; never raises.
     """
-    print("[PatternAnalyzer] Loading latest Fact-Finder result from session/local...")
+    global _cancel_supported
+    if not (CANCEL_EXTRACT_JOBS and _cancel_supported):
+        return
+    try:
+        with shielded():
+            response = firecrawl_request(
+                "DELETE",
+                f"{FIRECRAWL_EXTRACT_URL}/{job_id}",
+                endpoint="extract_cancel",
+                headers={"Authorization": f"Bearer {api_key}"},
+                timeout=10,
+            )
+    except requests.exceptions.RequestException as e:
+        incr("firecrawl.extract_cancel", outcome="error")
+        logger.warning("Could not cancel Firecrawl job %s: %s", job_id, e)
+        return
+    if response.status_code in {404, 405, 501}:
+        _cancel_supported = False
+        incr("firecrawl.extract_cancel", outcome="unsupported")
+        logger.info(
+            "Firecrawl does not support cancelling extract jobs (HTTP %d); not trying again.",
+            response.status_code,
+        )
+    elif response.ok:
+        incr("firecrawl.extract_cancel", outcome="cancelled")
+        logger.info("Cancelled Firecrawl job %s.", job_id)
+    else:
+        incr("firecrawl.extract_cancel", outcome="error")
+        logger.warning("Could not cancel Firecrawl job %s: HTTP %d", job_id, response.status_code)
+
+
+def _run_extract_job(
+    payload: Dict[str, Any],
+    api_key: str,
+    batch_index: str,
+) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    Start one extract job and poll it to completion.
+
+    Returns (job result, served from cache). The result is None if the job
+    could not be started or did not complete. Completed results are kept in
+    the shared response cache, so the same batch (same statement and URLs) is
+    never extracted twice per process. If the run is cancelled while the job
+    is polled, polling stops, the job is cancelled upstream and None is
+    returned.
+    """
+    cache = get_response_cache()
+    key = cache_key("firecrawl_extract", payload)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info("Batch %s served from the response cache.", batch_index)
+            return cached, True
+
+    with span("firecrawl.extract_job", batch=batch_index, urls=len(payload["urls"])) as job_span:
+        try:
+            job_id = _start_extract_job(payload=payload, api_key=api_key)
+        except RunCancelled:
+            return None, False
+        except Exception as e:
+            logger.error("ERROR starting extract job for batch %s: %s", batch_index, e)
+            return None, False
+
+        logger.info("Job %s started for batch %s, polling for completion...", job_id, batch_index)
+        job_span.set_attribute("job_id", job_id)
+
+        try:
+            job_result = _poll_extract_job(job_id=job_id, api_key=api_key, timeout_seconds=300)
+        except RunCancelled:
+            logger.info("Run cancelled; stopped polling job %s for batch %s.", job_id, batch_index)
+            job_span.set_attribute("cancelled", True)
+            _cancel_extract_job(job_id, api_key)
+            return None, False
+        except TimeoutError as e:
+            logger.error("TIMEOUT polling job %s for batch %s: %s", job_id, batch_index, e)
+            return None, False
+        except Exception as e:
+            logger.error("ERROR polling job %s for batch %s: %s", job_id, batch_index, e)
+            return None, False
+    observe("firecrawl.extract_job.duration_ms", job_span.duration_ms)
+
+    logger.info("Job %s for batch %s completed. Processing data...", job_id, batch_index)
+    if cache is not None:
+        cache.put(key, job_result)
+    return job_result, False
 
-    fact_result_dict = get_latest_fact_finder_result_session()
-    fact_result: Optional[FactFinderResult] = None
 
+def _load_latest_fact_finder_result() -> FactFinderResult:
+    """
+    Latest Fact-Finder result from the session cache, else from local memory.
+    """
+    logger.info("Loading latest Fact-Finder result from session/local...")
+
+    fact_result_dict = get_latest_fact_finder_result_session()
     if fact_result_dict is not None:
-        print("[PatternAnalyzer] Found Fact-Finder result in session.")
-        fact_result = FactFinderResult(**fact_result_dict)
-    else:
-        print("[PatternAnalyzer] No session result; falling back to LocalFactFinderMemory.")
-        fact_memory = LocalFactFinderMemory()
-        store = fact_memory._read_store()  # type: ignore[attr-defined]
-        if not store:
-            raise ValueError(
-                "No Fact-Finder data found in session or local memory. "
-                "Run the Fact-Finder agent first."
-            )
-        last_key = next(reversed(store))
-        fact_result = FactFinderResult(**store[last_key])
+        logger.info("Found Fact-Finder result in session.")
+        incr("cache.hits", cache="session_fact_finder")
+        return FactFinderResult(**fact_result_dict)
+
+    logger.info("No session result; falling back to LocalFactFinderMemory.")
+    incr("cache.misses", cache="session_fact_finder")
+    fact_memory = LocalFactFinderMemory()
+    store = fact_memory._read_store()  # type: ignore[attr-defined]
+    if not store:
+        raise ValueError(
+            "No Fact-Finder data found in session or local memory. "
+            "Run the Fact-Finder agent first."
+        )
+    last_key = next(reversed(store))
+    return FactFinderResult(**store[last_key])
+
+
+@traced("stage.pattern_analyzer")
+@with_run_context
+def run_pattern_analyzer(
+    fact_result: Optional[FactFinderResult] = None,
+    on_batch: Optional[Callable[[List[ArticleAnalysis]], None]] = None,
+) -> PatternAnalysisResult:
+    """
+    Pattern Analyzer workflow with batching and verbose debugging.
+
+    If `fact_result` is given (e.g. by the batch runner), it is analyzed
+    directly; otherwise the latest Fact-Finder result is loaded from session or
+    local memory. `on_batch` is passed to analyze_source_batches().
+
+    With a `run_context` (agents/run_context.py) that is cancelled mid-way,
+    the articles extracted so far are returned, marked `truncated`.
+    """
+    if fact_result is None:
+        fact_result = _load_latest_fact_finder_result()
 
     if not fact_result.sources:
         raise ValueError("Fact-Finder returned no sources to analyze.")
 
     statement = fact_result.statement
-    print(f"[PatternAnalyzer] Using statement: {statement!r}")
+    logger.info("Using statement: %r", statement)
 
     textual_sources: List[SourceInfo] = [
         src for src in fact_result.sources if src.url and is_textual_url(src.url)
     ]
-    print(f"[PatternAnalyzer] Total textual sources: {len(textual_sources)}")
+    logger.info("Total textual sources: %d", len(textual_sources))
     if not textual_sources:
         raise ValueError("No textual sources available (non-video) to analyze for this statement.")
 
-    BATCH_SIZE = 5
-    batches: List[List[SourceInfo]] = [
-        textual_sources[i : i + BATCH_SIZE] for i in range(0, len(textual_sources), BATCH_SIZE)
-    ]
-    print(f"[PatternAnalyzer] URL batches: {len(batches)} (batch size {BATCH_SIZE})")
+    skipped: List[ExtractionFailure] = []
+    if prefetch_enabled():
+        textual_sources, skipped = PrefetchClassifier().filter(textual_sources)
+        if not textual_sources:
+            raise ValueError("Prefetch found no extractable sources for this statement.")
+
+    batcher = AdaptiveBatcher()
+    batches = batcher.plan(textual_sources)
+    logger.info("URL batches: %d (sizes %s)", len(batches), [len(b) for b in batches])
 
     api_key = os.environ.get("FIRECRAWL_API_KEY")
     if not api_key:
         raise RuntimeError("FIRECRAWL_API_KEY is not set in the environment.")
 
-    all_articles: List[ArticleAnalysis] = []
+    all_articles, failures = analyze_source_batches(
+        statement, batches, api_key, batcher=batcher, on_batch=on_batch
+    )
+    return finalize_pattern_analysis(statement, all_articles, skipped + failures)
 
-    for batch_index, batch_sources in enumerate(batches, start=1):
-        urls = [src.url for src in batch_sources if src.url]
-        if not urls:
-            print(f"[PatternAnalyzer] Batch {batch_index} has no URLs, skipping.")
-            continue
 
-        print(
-            f"[PatternAnalyzer] Starting Firecrawl job for batch {batch_index} "
-            f"with {len(urls)} URLs."
-        )
+def _validation_reason(error: ValidationError) -> str:
+    """
+    Compact "field: message" summary of a pydantic error.
+    """
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'article'}: {err['msg']}"
+        for err in error.errors()
+    )
 
-        payload = _build_extract_payload(statement=statement, urls=urls)
 
-        try:
-            job_id = _start_extract_job(payload=payload, api_key=api_key)
-        except Exception as e:
-            print(f"[PatternAnalyzer] ERROR starting extract job for batch {batch_index}: {e}")
-            continue
+def _validate_articles(
+    data_raw: Dict[str, Any],
+) -> Tuple[List[ExtractArticle], List[Tuple[Optional[str], str]]]:
+    """
+    Validate Firecrawl's `result` array one element at a time, so one bad
+    article does not discard the rest of the batch.
 
-        print(
-            f"[PatternAnalyzer] Job {job_id} started for batch {batch_index}, "
-            "polling for completion..."
-        )
+    Returns (valid articles, [(source_url or None, reason)] for invalid ones).
+    """
+    items = data_raw.get("result", [])
+    if not isinstance(items, list):
+        return [], [(None, f"result: expected a list, got {type(items).__name__}")]
 
+    valid: List[ExtractArticle] = []
+    invalid: List[Tuple[Optional[str], str]] = []
+    for item in items:
         try:
-            job_result = _poll_extract_job(job_id=job_id, api_key=api_key, timeout_seconds=300)
-        except TimeoutError as e:
-            print(f"[PatternAnalyzer] TIMEOUT polling job {job_id} for batch {batch_index}: {e}")
-            continue
-        except Exception as e:
-            print(f"[PatternAnalyzer] ERROR polling job {job_id} for batch {batch_index}: {e}")
-            continue
+            valid.append(ExtractArticle.model_validate(item))
+        except ValidationError as e:
+            url = item.get("source_url") if isinstance(item, dict) else None
+            invalid.append((url if isinstance(url, str) else None, _validation_reason(e)))
+    return valid, invalid
+
+
+def _analyze_batch(
+    statement: str,
+    batch_sources: List[SourceInfo],
+    batch_index: str,
+    api_key: str,
+    batcher: Optional[AdaptiveBatcher] = None,
+) -> Tuple[List[ArticleAnalysis], List[Tuple[SourceInfo, str]]]:
+    """
+    Run one extract job for a batch of sources and map the extracted articles
+    back onto their SourceInfo metadata.
 
-        print(f"[PatternAnalyzer] Job {job_id} for batch {batch_index} completed. Processing data...")
+    Returns (articles, [(failed source, reason)]). Articles are validated one
+    by one; a source fails when its article is invalid or missing, and every
+    source fails when the job itself does. The per-host outcome is recorded
+    with `batcher` unless the result came from the response cache.
+    """
+    batch_sources = [src for src in batch_sources if src.url]
+    if not batch_sources:
+        logger.info("Batch %s has no URLs, skipping.", batch_index)
+        return [], []
+    urls = [src.url for src in batch_sources]
+
+    logger.info("Starting Firecrawl job for batch %s with %d URLs.", batch_index, len(urls))
+
+    payload = _build_extract_payload(statement=statement, urls=urls)
+
+    start = time.perf_counter()
+    job_result, from_cache = _run_extract_job(payload=payload, api_key=api_key, batch_index=batch_index)
+    # A failed or timed-out job's duration is not the hosts' latency.
+    latency_ms = (time.perf_counter() - start) * 1000.0 if job_result is not None else None
+
+    def _done(
+        articles: List[ArticleAnalysis], failed: List[Tuple[SourceInfo, str]]
+    ) -> Tuple[List[ArticleAnalysis], List[Tuple[SourceInfo, str]]]:
+        if batcher is not None and not from_cache:
+            batcher.record(batch_sources, [src for src, _ in failed], latency_ms)
+        return articles, failed
+
+    if job_result is None and run_cancelled():
+        # Not the hosts' fault, so not recorded with the batcher.
+        return [], [(src, CANCELLED_REASON) for src in batch_sources]
+    if job_result is None:
+        return _done([], [(src, "extract job failed") for src in batch_sources])
+
+    data_raw = job_result.get("data")
+    logger.debug(
+        "Raw 'data' for batch %s: type=%s, repr=%s",
+        batch_index,
+        type(data_raw),
+        repr(data_raw)[:500],
+    )
 
-        data_raw = job_result.get("data")
-        print(
-            f"[PatternAnalyzer] Raw 'data' for batch {batch_index}: "
-            f"type={type(data_raw)}, repr={repr(data_raw)[:500]}"
-        )
+    if not isinstance(data_raw, dict):
+        logger.warning("Unexpected 'data' type for batch %s, skipping.", batch_index)
+        reason = f"data: expected an object, got {type(data_raw).__name__}"
+        return _done([], [(src, reason) for src in batch_sources])
+
+    extracted_articles, invalid = _validate_articles(data_raw)
+
+    # Keyed by canonical URL (aliases included) so Firecrawl echoing back a
+    # redirected or variant URL still finds its source.
+    source_lookup_by_url: Dict[str, SourceInfo] = {}
+    for src in batch_sources:
+        for url in [src.url, *src.aliases]:
+            if url:
+                source_lookup_by_url.setdefault(canonical_url(url), src)
+
+    reasons: Dict[int, str] = {}
+    for url, reason in invalid:
+        incr("extract.invalid_articles")
+        logger.warning("Invalid article in batch %s (%s): %s", batch_index, url or "no URL", reason)
+        src = source_lookup_by_url.get(canonical_url(url)) if url else None
+        if src is not None:
+            reasons.setdefault(id(src), reason)
+        elif url is None and len(invalid) == 1 and len(batch_sources) == 1:
+            reasons.setdefault(id(batch_sources[0]), reason)
+
+    articles: List[ArticleAnalysis] = []
+    matched: set = set()
+
+    for extracted in extracted_articles:
+        src = source_lookup_by_url.get(canonical_url(extracted.source_url))
+        if src is not None:
+            matched.add(id(src))
+
+        # Build key_claims list (single structured claim from Firecrawl)
+        claims: List[Claim] = []
+        if extracted.key_claims and extracted.key_claims.text:
+            claims.append(
+                Claim(
+                    text=extracted.key_claims.text,
+                    modality=extracted.key_claims.modality,
+                    modality_class=classify_modality(extracted.key_claims.modality),
+                    blame_target=extracted.key_claims.blame_target,
+                    evidence=extracted.key_claims.evidence,
+                )
+            )
 
-        if not isinstance(data_raw, dict):
-            print(f"[PatternAnalyzer] Unexpected 'data' type for batch {batch_index}, skipping.")
-            continue
+        article = ArticleAnalysis(
+            url=extracted.source_url,
+            source_name=getattr(src, "source_name", None) if src else None,
+            publish_date=getattr(src, "publish_date", None) if src else None,
+            source_type=getattr(src, "source_type", None) if src else None,
+            title=extracted.title or (getattr(src, "title", None) if src else None),
+            source_country=getattr(src, "source_country", None) if src else None,
+            source_class=getattr(src, "source_class", None) if src else None,
+            key_claims=claims,
+            narrative_summary=extracted.narrative_summary,
+            statistics=extracted.statistics or None,
+            stance=extracted.stance,
+            bias_indicators=extracted.bias_indication or None,
+        )
 
-        try:
-            extract = FirecrawlExtractResult.model_validate(data_raw)
-        except ValidationError as e:
-            print(f"[PatternAnalyzer] ValidationError for batch {batch_index}: {e}")
-            continue
+        articles.append(article)
 
-        source_lookup_by_url: Dict[str, SourceInfo] = {
-            src.url: src for src in batch_sources if src.url
-        }
-
-        batch_article_count_before = len(all_articles)
-
-        for extracted in extract.result:
-            src = source_lookup_by_url.get(extracted.source_url)
-
-            # Build key_claims list (single structured claim from Firecrawl)
-            claims: List[Claim] = []
-            if extracted.key_claims and extracted.key_claims.text:
-                claims.append(
-                    Claim(
-                        text=extracted.key_claims.text,
-                        modality=extracted.key_claims.modality,
-                        blame_target=extracted.key_claims.blame_target,
-                        evidence=extracted.key_claims.evidence,
-                    )
+    failed = [
+        (src, reasons.get(id(src), "not in extract result"))
+        for src in batch_sources
+        if id(src) not in matched
+    ]
+    logger.info(
+        "Batch %s contributed %d articles (%d of %d URLs failed).",
+        batch_index,
+        len(articles),
+        len(failed),
+        len(batch_sources),
+    )
+    return _done(articles, failed)
+
+
+def _analyze_batch_with_retry(
+    statement: str,
+    batch_sources: List[SourceInfo],
+    batch_index: str,
+    api_key: str,
+    batcher: Optional[AdaptiveBatcher] = None,
+    depth: int = 0,
+    on_batch: Optional[Callable[[List[ArticleAnalysis]], None]] = None,
+) -> Tuple[List[ArticleAnalysis], List[ExtractionFailure]]:
+    """
+    _analyze_batch(), then requeue only the URLs it failed on: split them in
+    half and retry each half, up to MAX_SPLIT_DEPTH times. A single URL that
+    failed on its own is not retried. Returns the articles and the URLs that
+    still failed after the last attempt. `on_batch` receives the articles of
+    each attempt as soon as they are validated, before any retry. Nothing is
+    started or retried once the run is cancelled; those URLs fail as
+    "cancelled".
+    """
+    if run_cancelled():
+        return [], [
+            ExtractionFailure(url=src.url, reason=CANCELLED_REASON, attempts=depth)
+            for src in batch_sources
+            if src.url
+        ]
+    articles, failed = _analyze_batch(statement, batch_sources, batch_index, api_key, batcher)
+    if on_batch is not None and articles:
+        on_batch(list(articles))
+    if not failed:
+        return articles, []
+    if depth >= MAX_SPLIT_DEPTH or run_cancelled() or (len(failed) == 1 and len(batch_sources) == 1):
+        return articles, [
+            ExtractionFailure(url=src.url, reason=reason, attempts=depth + 1) for src, reason in failed
+        ]
+
+    failures: List[ExtractionFailure] = []
+    parts = split_in_half([src for src, _ in failed])
+    logger.info(
+        "Retrying %d failed URLs from batch %s in %d sub-batches.",
+        len(failed),
+        batch_index,
+        len(parts),
+    )
+    for n, part in enumerate(parts, start=1):
+        incr("extract.batch_retries")
+        part_articles, part_failures = _analyze_batch_with_retry(
+            statement, part, f"{batch_index}.{n}", api_key, batcher, depth + 1, on_batch
+        )
+        articles.extend(part_articles)
+        failures.extend(part_failures)
+    return articles, failures
+
+
+def analyze_source_batches(
+    statement: str,
+    batches: Iterable[List[SourceInfo]],
+    api_key: str,
+    max_workers: int = EXTRACT_CONCURRENCY,
+    batcher: Optional[AdaptiveBatcher] = None,
+    on_batch: Optional[Callable[[List[ArticleAnalysis]], None]] = None,
+) -> Tuple[List[ArticleAnalysis], List[ExtractionFailure]]:
+    """
+    Submit an extract job for each batch as soon as `batches` yields it, with
+    up to `max_workers` jobs in flight. `batches` may be a plain list or a
+    stream that is still being filled (see pipeline/streaming.py). The failed
+    URLs of a batch are split and retried in the same worker, and each job's
+    per-host outcome is recorded with `batcher`. Articles and the URLs that
+    could not be extracted are returned in batch order.
+
+    `on_batch`, if given, is called from the extract workers with the
+    articles of each extract job (a batch or one of its retries) as soon as
+    they are validated, in completion order, so downstream stages can start
+    early (see pipeline/speculative.py). It must return quickly.
+
+    Once the run is cancelled, batches still to come are not submitted and
+    queued ones return at once; their URLs fail as "cancelled".
+    """
+    futures: List[Future] = []
+    skipped: List[ExtractionFailure] = []
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="extract") as executor:
+        for batch_index, batch_sources in enumerate(batches, start=1):
+            if run_cancelled():
+                skipped.extend(
+                    ExtractionFailure(url=src.url, reason=CANCELLED_REASON, attempts=0)
+                    for src in batch_sources
+                    if src.url
+                )
+                continue
+            futures.append(
+                executor.submit(
+                    bind_context(_analyze_batch_with_retry),
+                    statement,
+                    batch_sources,
+                    str(batch_index),
+                    api_key,
+                    batcher,
+                    on_batch=on_batch,
                 )
-
-            article = ArticleAnalysis(
-                url=extracted.source_url,
-                source_name=getattr(src, "source_name", None) if src else None,
-                publish_date=getattr(src, "publish_date", None) if src else None,
-                source_type=getattr(src, "source_type", None) if src else None,
-                title=extracted.title or (getattr(src, "title", None) if src else None),
-                source_country=getattr(src, "source_country", None) if src else None,
-                source_class=getattr(src, "source_class", None) if src else None,
-                key_claims=claims,
-                narrative_summary=extracted.narrative_summary,
-                statistics=extracted.statistics or None,
-                stance=extracted.stance,
-                bias_indicators=extracted.bias_indication or None,
             )
 
-            all_articles.append(article)
+    all_articles: List[ArticleAnalysis] = []
+    all_failures: List[ExtractionFailure] = []
+    for future in futures:
+        articles, failures = future.result()
+        all_articles.extend(articles)
+        all_failures.extend(failures)
+    return all_articles, all_failures + skipped
+
+
+def _stamp_publish_times(articles: List[ArticleAnalysis]) -> None:
+    """
+    Set publish_ts on each article and its claims from its publish_date.
+    """
+    for article, ts in zip(articles, parse_publish_dates(a.publish_date for a in articles)):
+        article.publish_ts = ts
+        for claim in article.key_claims:
+            claim.publish_ts = ts
 
-        batch_article_count_after = len(all_articles)
-        print(
-            f"[PatternAnalyzer] Batch {batch_index} contributed "
-            f"{batch_article_count_after - batch_article_count_before} articles. "
-            f"Total so far: {batch_article_count_after}."
-        )
 
+def finalize_pattern_analysis(
+    statement: str,
+    all_articles: List[ArticleAnalysis],
+    failures: Optional[List[ExtractionFailure]] = None,
+) -> PatternAnalysisResult:
+    """
+    Assemble and persist the PatternAnalysisResult (local and session memory,
+    and the claim archive). A result assembled after the run was cancelled is
+    marked `truncated`; with no articles at all RunCancelled is raised.
+    """
     if not all_articles:
+        check_cancelled()
         raise RuntimeError(
             "Pattern Analyzer could not extract structured data from any article across all batches."
         )
 
-    result = PatternAnalysisResult(statement=fact_result.statement, analyzed_articles=all_articles)
+    if failures:
+        logger.warning("%d source URLs could not be extracted.", len(failures))
+    _stamp_publish_times(all_articles)
+    result = PatternAnalysisResult(
+        statement=statement,
+        analyzed_articles=all_articles,
+        extraction_failures=failures or [],
+        truncated=run_cancelled(),
+    )
 
-    print("[PatternAnalyzer] Saving PatternAnalysisResult to local and session memory.")
+    logger.info("Saving PatternAnalysisResult to local and session memory.")
     pattern_memory = PatternAnalysisMemory()
     pattern_memory.save_result(result)
+    claim_archive.archive_pattern_analysis(result)
 
     save_pattern_analysis_result_session(result.model_dump())
 
-    print("[PatternAnalyzer] Done. Returning result.")
-    return result
\ No newline at end of file
+    logger.info("Done. Returning result.")
+    return result
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Pattern
+
+from agents.pattern_analyzer.schemas.pattern_analyzer_schema import Claim
+
+# Modality classes, highest priority first: a modality that mentions a denial
+# is a denial, and a hedge ("reportedly", "alleged") outweighs a reporting verb.
+PRIORITY = ("denial", "speculation", "affirmation")
+
+# Cue words and phrases per language and class. Matched case-insensitively as
+# whole words (CJK cues, which have no word boundaries, as substrings). Words
+# that are also common nouns ("May", "United States") only count in a verb
+# phrase.
+MODALITY_CUES: Dict[str, Dict[str, List[str]]] = {
+    "en": {
+        "denial": [
+            "denies", "denied", "deny", "denying", "refutes", "refuted", "rejects", "rejected",
+            "false", "debunked", "dismissed", "disputes", "disputed", "contradicts", "contradicted",
+        ],
+        "speculation": [
+            "alleged", "allegedly", "reportedly", "purportedly", "suggests", "suggested", "may have", "may be", "might",
+            "could", "possibly", "possible", "likely", "unconfirmed", "unverified", "rumor", "rumors",
+            "rumour", "rumours", "speculation", "speculates", "speculated", "opinion", "hypothesis",
+        ],
+        "affirmation": [
+            "reports", "reported", "reporting", "claims", "claimed", "alleges", "stated", "states that",
+            "says", "said", "confirms", "confirmed", "announced", "announces", "asserts", "asserted",
+            "factual",
+        ],
+    },
+    "fr": {
+        "denial": ["dément", "démenti", "nie", "nié", "rejette", "réfute", "faux"],
+        "speculation": ["aurait", "pourrait", "présumé", "présumée", "prétendu", "prétendument", "rumeur"],
+        "affirmation": ["affirme", "confirme", "annonce", "rapporte", "déclare", "selon"],
+    },
+    "es": {
+        "denial": ["niega", "negó", "desmiente", "desmintió", "rechaza", "falso"],
+        "speculation": ["presuntamente", "supuestamente", "podría", "posiblemente", "rumor"],
+        "affirmation": ["afirma", "confirma", "informa", "declaró", "anunció", "según"],
+    },
+    "de": {
+        "denial": ["dementiert", "bestreitet", "weist zurück", "widerlegt", "falsch"],
+        "speculation": ["angeblich", "mutmaßlich", "könnte", "möglicherweise", "gerücht"],
+        "affirmation": ["bestätigt", "berichtet", "erklärt", "meldet", "laut"],
+    },
+    "zh": {
+        "denial": ["否认", "驳斥", "辟谣", "不实"],
+        "speculation": ["据称", "可能", "疑似", "传闻", "或许"],
+        "affirmation": ["证实", "报道", "表示", "宣布", "称"],
+    },
+}
+
+# Unknown modality strings were always treated as speculation rather than a
+# hard affirmation or denial.
+DEFAULT_CLASS = "speculation"
+
+_LOCK = threading.Lock()
+_WORD_RE = re.compile(r"\w+")
+_CJK_RE = re.compile(r"[\u2e80-\u9fff\u3040-\u30ff\uac00-\ud7af]")
+
+
+class _Matcher:
+    """
+    Cue lookup compiled from MODALITY_CUES: a dict from word or phrase to the
+    rank of its highest-priority class, probed with each word n-gram of the
+    text, and one regex for CJK cues.
+    """
+
+    def __init__(self, cues: Dict[str, Dict[str, List[str]]]) -> None:
+        self.ranks: Dict[str, int] = {}
+        cjk: Dict[str, int] = {}
+        for rank, kind in enumerate(PRIORITY):
+            for language in cues.values():
+                for cue in language.get(kind, []):
+                    key = " ".join(_WORD_RE.findall(cue.lower()))
+                    target = cjk if _CJK_RE.search(cue) else self.ranks
+                    if key and rank < target.get(key, len(PRIORITY)):
+                        target[key] = rank
+        self.max_words = max((key.count(" ") + 1 for key in self.ranks), default=1)
+        self.cjk_ranks = cjk
+        self.cjk: Optional[Pattern[str]] = (
+            re.compile("|".join(re.escape(c) for c in sorted(cjk, key=len, reverse=True))) if cjk else None
+        )
+
+    def rank(self, text: str) -> int:
+        best = len(PRIORITY)
+        words = _WORD_RE.findall(text.lower())
+        for n in range(1, self.max_words + 1):
+            for i in range(len(words) - n + 1):
+                rank = self.ranks.get(words[i] if n == 1 else " ".join(words[i : i + n]), best)
+                if rank < best:
+                    best = rank
+                    if best == 0:
+                        return best
+        if self.cjk is not None and _CJK_RE.search(text):
+            for m in self.cjk.finditer(text):
+                best = min(best, self.cjk_ranks[m.group(0)])
+        return best
+
+
+_MATCHER = _Matcher(MODALITY_CUES)
+
+
+def register_cues(language: str, kind: str, cues: Iterable[str]) -> None:
+    """
+    Add cue words for `kind` in `language` (e.g. another language's denial
+    verbs) and recompile the matcher.
+    """
+    global _MATCHER
+    if kind not in PRIORITY:
+        raise ValueError(f"Unknown modality class {kind!r}; expected one of {PRIORITY}.")
+    with _LOCK:
+        MODALITY_CUES.setdefault(language, {}).setdefault(kind, []).extend(cues)
+        _MATCHER = _Matcher(MODALITY_CUES)
+        _classify.cache_clear()
+
+
+@lru_cache(maxsize=65536)
+def _classify(modality: str) -> str:
+    rank = _MATCHER.rank(modality)
+    return PRIORITY[rank] if rank < len(PRIORITY) else DEFAULT_CLASS
+
+
+def classify_modality(modality: Optional[str]) -> Optional[str]:
+    """
+    "denial", "speculation" or "affirmation" for a free-text modality, or
+    None if there is none. Memoized per modality string.
+    """
+    if not modality or not modality.strip():
+        return None
+    return _classify(modality.strip())
+
+
+def claim_modality(claim: Claim) -> Optional[str]:
+    """
+    The claim's modality class, as stored at ingestion or classified now.
+    """
+    return claim.modality_class or classify_modality(claim.modality)
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from agents.fact_finder.schemas.fact_finder_schema import SourceInfo
+from agents.fact_finder.tools.canonicalize import canonical_url
+from agents.pattern_analyzer.schemas.pattern_analyzer_schema import ExtractionFailure
+from agents.pattern_analyzer.tools.adaptive_batching import host_of
+from memory.extract_host_stats_store import ExtractHostStatsMemory
+from memory.response_cache import ResponseCache
+from telemetry import bind_context, get_logger, incr, observe
+
+logger = get_logger("pattern_analyzer.prefetch")
+
+PREFETCH_CONCURRENCY = int(os.getenv("TRUTHLENS_PREFETCH_CONCURRENCY", "8"))
+PREFETCH_TIMEOUT_SECONDS = float(os.getenv("TRUTHLENS_PREFETCH_TIMEOUT_SECONDS", "5"))
+PROBE_CACHE_TTL_SECONDS = float(os.getenv("TRUTHLENS_PREFETCH_CACHE_TTL_SECONDS", "3600"))
+
+# Probes of a host with one consistent outcome before it is allowed or
+# blocked without probing.
+LEARN_AFTER_PROBES = 3
+
+# Comma-separated hosts that always pass / never pass the classifier.
+ALLOW_HOSTS = {
+    h.strip().lower() for h in os.getenv("TRUTHLENS_PREFETCH_ALLOW_HOSTS", "").split(",") if h.strip()
+}
+BLOCK_HOSTS = {
+    h.strip().lower() for h in os.getenv("TRUTHLENS_PREFETCH_BLOCK_HOSTS", "").split(",") if h.strip()
+}
+
+# Social and video platforms: posts, not articles.
+SOCIAL_HOSTS = {
+    "youtube.com", "youtu.be", "twitter.com", "x.com", "facebook.com", "fb.watch",
+    "reddit.com", "threads.net", "linkedin.com", "pinterest.com", "t.me", "telegram.me",
+}
+
+TEXTUAL_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+# The host refuses the page itself: paywall, login or bot wall, legal block.
+HOST_BLOCK_STATUSES = {401: "paywall", 402: "paywall", 403: "forbidden", 451: "legal block"}
+DEAD_STATUSES = {404: "dead link", 410: "dead link"}
+
+
+def prefetch_enabled() -> bool:
+    return os.getenv("TRUTHLENS_PREFETCH", "0").strip().lower() in {"1", "true", "yes", "on"}
+
+
+@dataclass
+class ProbeResult:
+    url: str
+    extract: bool
+    reason: str
+    status: Optional[int] = None
+    content_type: Optional[str] = None
+    host_level: bool = False  # the verdict is about the host, not this URL
+
+
+def _host_matches(host: str, hosts: set) -> bool:
+    return any(host == h or host.endswith("." + h) for h in hosts)
+
+
+def _classify_response(url: str, status: int, content_type: Optional[str]) -> ProbeResult:
+    """
+    Verdict for one probe response.
+
+    Only dead links, host refusals and non-text content types are skipped;
+    rate limits, server errors and missing headers get the benefit of the
+    doubt, since Firecrawl fetches from elsewhere and may well succeed.
+    """
+    if status in DEAD_STATUSES:
+        return ProbeResult(url, False, DEAD_STATUSES[status], status, content_type)
+    if status in HOST_BLOCK_STATUSES:
+        return ProbeResult(url, False, HOST_BLOCK_STATUSES[status], status, content_type, host_level=True)
+    if status >= 400:
+        return ProbeResult(url, True, f"status {status}", status, content_type)
+
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    if not media_type or media_type.startswith(TEXTUAL_CONTENT_TYPES):
+        return ProbeResult(url, True, "ok", status, content_type)
+    return ProbeResult(url, False, f"content type {media_type}", status, content_type)
+
+
+# Global singleton for this process
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+_PROBE_CACHE = ResponseCache(ttl_seconds=PROBE_CACHE_TTL_SECONDS)
+
+
+def _get_session() -> requests.Session:
+    """
+    Shared keep-alive session, so probes to one host reuse the connection.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=PREFETCH_CONCURRENCY, pool_maxsize=PREFETCH_CONCURRENCY)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = "Mozilla/5.0 (compatible; TruthLens-prefetch/1.0)"
+            _SESSION = session
+        return _SESSION
+
+
+class PrefetchClassifier:
+    """
+    Cheap check ahead of extraction that drops URLs FIRE-1 cannot use.
+
+    Each URL gets a HEAD request (falling back to a one-byte Range GET when
+    HEAD is refused or carries no content type) over a pooled session.
+    Verdicts are cached per URL, and per host through the probe counters in
+    ExtractHostStatsMemory: a host that keeps refusing is blocked without
+    probing, a host that keeps answering is allowed without probing.
+    """
+
+    def __init__(
+        self,
+        memory: Optional[ExtractHostStatsMemory] = None,
+        max_workers: int = PREFETCH_CONCURRENCY,
+        timeout_seconds: float = PREFETCH_TIMEOUT_SECONDS,
+    ) -> None:
+        self.memory = memory or ExtractHostStatsMemory()
+        self.max_workers = max(1, max_workers)
+        self.timeout_seconds = timeout_seconds
+
+    def _host_verdict(self, url: str, host: str, stats: Dict[str, Dict]) -> Optional[ProbeResult]:
+        if _host_matches(host, ALLOW_HOSTS):
+            return ProbeResult(url, True, "allowlisted host", host_level=True)
+        if _host_matches(host, BLOCK_HOSTS):
+            return ProbeResult(url, False, "blocklisted host", host_level=True)
+        if _host_matches(host, SOCIAL_HOSTS):
+            return ProbeResult(url, False, "social media post", host_level=True)
+
+        entry = stats.get(host) or {}
+        ok, blocked = entry.get("probe_ok", 0), entry.get("probe_blocked", 0)
+        if blocked >= LEARN_AFTER_PROBES and ok == 0:
+            reason = f"learned block: {entry.get('last_probe_reason', 'refused')}"
+            return ProbeResult(url, False, reason, host_level=True)
+        if ok >= LEARN_AFTER_PROBES and blocked == 0:
+            return ProbeResult(url, True, "learned allow", host_level=True)
+        return None
+
+    def _request(self, url: str) -> Tuple[int, Optional[str]]:
+        session = _get_session()
+        response = session.head(url, allow_redirects=True, timeout=self.timeout_seconds)
+        content_type = response.headers.get("Content-Type")
+        if response.status_code in (405, 501) or (response.ok and not content_type):
+            response = session.get(
+                url,
+                headers={"Range": "bytes=0-0"},
+                allow_redirects=True,
+                stream=True,
+                timeout=self.timeout_seconds,
+            )
+            response.close()
+            content_type = response.headers.get("Content-Type")
+        return response.status_code, content_type
+
+    def probe(self, url: str, stats: Optional[Dict[str, Dict]] = None) -> ProbeResult:
+        """
+        Verdict for one URL, from the host lists, the URL cache or a probe.
+        """
+        host = host_of(url)
+        verdict = self._host_verdict(url, host, self.memory.all_stats() if stats is None else stats)
+        if verdict is not None:
+            return verdict
+
+        key = f"probe:{canonical_url(url)}"
+        cached = _PROBE_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+        start = time.perf_counter()
+        try:
+            status, content_type = self._request(url)
+            result = _classify_response(url, status, content_type)
+        except requests.exceptions.Timeout:
+            result = ProbeResult(url, True, "probe timed out")
+        except requests.exceptions.RequestException as e:
+            result = ProbeResult(url, False, f"unreachable ({type(e).__name__})")
+        observe("prefetch.probe_ms", (time.perf_counter() - start) * 1000.0)
+
+        # Dead links, wrong content types and timeouts say nothing about the host.
+        if result.status is not None and (result.extract or result.host_level):
+            self.memory.record_probe(host, blocked=not result.extract, reason=result.reason)
+        _PROBE_CACHE.put(key, result)
+        return result
+
+    def filter(self, sources: List[SourceInfo]) -> Tuple[List[SourceInfo], List[ExtractionFailure]]:
+        """
+        Probe `sources` concurrently. Returns the sources worth extracting (in
+        input order) and an ExtractionFailure (attempts=0) for each skipped one.
+        """
+        if not sources:
+            return [], []
+        stats = self.memory.all_stats()
+        workers = min(self.max_workers, len(sources))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch") as executor:
+            results = list(executor.map(bind_context(lambda s: self.probe(s.url, stats)), sources))
+
+        keep: List[SourceInfo] = []
+        skipped: List[ExtractionFailure] = []
+        for source, result in zip(sources, results):
+            incr("prefetch.verdicts", verdict="extract" if result.extract else "skip", reason=result.reason)
+            if result.extract:
+                keep.append(source)
+            else:
+                skipped.append(ExtractionFailure(url=source.url, reason=f"prefetch: {result.reason}", attempts=0))
+
+        if skipped:
+            logger.info(
+                "Prefetch skipped %d of %d URLs: %s",
+                len(skipped),
+                len(sources),
+                "; ".join(f"{f.url} ({f.reason})" for f in skipped),
+            )
+        return keep, skipped
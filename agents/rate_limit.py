@@ -0,0 +1,380 @@
+"""
+Shared rate-limit scheduler for upstream APIs (Firecrawl, Gemini).
+
+Every outbound request calls acquire(provider, endpoint) first. Limits are
+token buckets keyed by provider ("firecrawl") and, optionally, by endpoint
+("firecrawl.search"); a request must pass every bucket that applies to it.
+
+- Limits come from configure_rate_limit() or env, e.g. TRUTHLENS_FIRECRAWL_RPM,
+  TRUTHLENS_FIRECRAWL_SEARCH_RPM, TRUTHLENS_GEMINI_RPM.
+- When a bucket is empty, waiters are served interactive-first, then by the
+  run that has been served least so far, so one large run cannot starve the
+  others. Batch work opts in with priority_scope("batch").
+- With TRUTHLENS_RATE_LIMIT_DB set, bucket state lives in a SQLite file so
+  several processes on the host share one quota.
+- report_rate_limited() (called on a 429) pauses the key for Retry-After
+  seconds in every thread and, with the SQLite backend, every process.
+- A waiting request gives up with RunCancelled when its run is cancelled or
+  passes its deadline (agents/run_context.py).
+"""
+
+from __future__ import annotations
+
+import email.utils
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from agents.run_context import current_run_context
+from telemetry import current_run_id, get_logger, incr, observe
+
+logger = get_logger("rate_limit")
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+_PRIORITY_NAMES = {"interactive": PRIORITY_INTERACTIVE, "batch": PRIORITY_BATCH}
+
+_PRIORITY: ContextVar[int] = ContextVar("truthlens_rate_priority", default=PRIORITY_INTERACTIVE)
+
+DEFAULT_BURST_SECONDS = float(os.getenv("TRUTHLENS_RATE_LIMIT_BURST_SECONDS", "1"))
+DEFAULT_BACKOFF_SECONDS = 2.0
+# How many times callers retry a request that came back 429.
+MAX_RATE_LIMIT_RETRIES = int(os.getenv("TRUTHLENS_RATE_LIMIT_RETRIES", "3"))
+
+
+@contextmanager
+def priority_scope(priority: str | int) -> Iterator[None]:
+    """
+    Run the block at the given priority ("interactive" or "batch").
+    """
+    value = _PRIORITY_NAMES[priority] if isinstance(priority, str) else int(priority)
+    token = _PRIORITY.set(value)
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP date).
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def backoff_seconds(attempt: int) -> float:
+    """
+    Fallback pause after the `attempt`-th 429 when no Retry-After was given.
+    """
+    return min(60.0, DEFAULT_BACKOFF_SECONDS * (2 ** attempt))
+
+
+# --- Buckets ----------------------------------------------------------------
+
+
+class TokenBucket:
+    """
+    Thread-safe in-process token bucket: `rate` tokens per second, bursts up
+    to `capacity`. With rate=None the bucket is unlimited but still honours
+    cooldowns set by penalize().
+    """
+
+    def __init__(self, rate: Optional[float], capacity: Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, (rate or 0.0) * DEFAULT_BURST_SECONDS)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take `tokens` if available and return 0; otherwise return the seconds
+        to wait before trying again.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._blocked_until > now:
+                return self._blocked_until - now
+            if self.rate is None:
+                return 0.0
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def penalize(self, seconds: float) -> None:
+        """
+        Empty the bucket and block it for `seconds` (e.g. after a 429).
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._blocked_until = max(self._blocked_until, now + seconds)
+            self._tokens = 0.0
+            self._updated = now
+
+
+class SqliteTokenBucket:
+    """
+    Token bucket whose state is a row in a SQLite file, shared by every process
+    that points TRUTHLENS_RATE_LIMIT_DB at the same path. Updates run in
+    BEGIN IMMEDIATE transactions, so SQLite's file lock serialises them.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        key: str,
+        rate: Optional[float],
+        capacity: Optional[float] = None,
+    ) -> None:
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, (rate or 0.0) * DEFAULT_BURST_SECONDS)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, "
+            "blocked_until REAL NOT NULL DEFAULT 0)"
+        )
+
+    def _load(self, now: float) -> Tuple[float, float, float]:
+        row = self._conn.execute(
+            "SELECT tokens, updated, blocked_until FROM rate_buckets WHERE key = ?",
+            (self.key,),
+        ).fetchone()
+        if row is None:
+            return self.capacity, now, 0.0
+        return row
+
+    def _store(self, tokens: float, updated: float, blocked_until: float) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO rate_buckets (key, tokens, updated, blocked_until) "
+            "VALUES (?, ?, ?, ?)",
+            (self.key, tokens, updated, blocked_until),
+        )
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                available, updated, blocked_until = self._load(now)
+                if blocked_until > now:
+                    return blocked_until - now
+                if self.rate is None:
+                    return 0.0
+                available = min(self.capacity, available + max(0.0, now - updated) * self.rate)
+                if available >= tokens:
+                    self._store(available - tokens, now, blocked_until)
+                    return 0.0
+                self._store(available, now, blocked_until)
+                return (tokens - available) / self.rate
+            finally:
+                self._conn.execute("COMMIT")
+
+    def penalize(self, seconds: float) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                _, _, blocked_until = self._load(now)
+                self._store(0.0, now, max(blocked_until, now + seconds))
+            finally:
+                self._conn.execute("COMMIT")
+
+
+# --- Scheduler --------------------------------------------------------------
+
+
+@dataclass
+class _Waiter:
+    priority: int
+    run_id: str
+    seq: int
+
+
+class QuotaScheduler:
+    """
+    Hands out one bucket's tokens to waiting threads in priority/fairness order.
+
+    Only the head waiter polls the bucket; everyone else sleeps on the
+    condition until the head is served. The head is the waiter with the lowest
+    priority class, then the run with the fewest grants since the queue was
+    last empty, then the oldest ticket.
+    """
+
+    def __init__(self, key: str, bucket: TokenBucket | SqliteTokenBucket) -> None:
+        self.key = key
+        self.bucket = bucket
+        self._cond = threading.Condition()
+        self._waiters: List[_Waiter] = []
+        self._served: Dict[str, int] = {}
+        self._seq = itertools.count()
+
+    def _head(self) -> _Waiter:
+        return min(
+            self._waiters,
+            key=lambda w: (w.priority, self._served.get(w.run_id, 0), w.seq),
+        )
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Block until this thread is granted `tokens`. Returns seconds waited.
+        Raises RunCancelled, without taking tokens, if the current run is
+        cancelled while waiting.
+        """
+        start = time.monotonic()
+        waiter = _Waiter(
+            priority=_PRIORITY.get(),
+            run_id=current_run_id() or "-",
+            seq=next(self._seq),
+        )
+        ctx = current_run_context()
+        unregister = ctx.on_cancel(self._wake) if ctx is not None else None
+        granted = False
+        try:
+            with self._cond:
+                self._waiters.append(waiter)
+                try:
+                    while True:
+                        if ctx is not None:
+                            ctx.check()
+                        timeout: Optional[float] = None
+                        if self._head() is waiter:
+                            timeout = self.bucket.try_acquire(tokens)
+                            if timeout <= 0:
+                                granted = True
+                                break
+                        if ctx is not None:
+                            timeout = ctx.clip(timeout)
+                        self._cond.wait(timeout=timeout)
+                finally:
+                    self._waiters.remove(waiter)
+                    if granted and self._waiters:
+                        self._served[waiter.run_id] = self._served.get(waiter.run_id, 0) + 1
+                    elif not self._waiters:
+                        self._served.clear()
+                    self._cond.notify_all()
+        finally:
+            if unregister is not None:
+                unregister()
+        return time.monotonic() - start
+
+    def _wake(self) -> None:
+        with self._cond:
+            self._cond.notify_all()
+
+    def penalize(self, seconds: float) -> None:
+        self.bucket.penalize(seconds)
+        with self._cond:
+            self._cond.notify_all()
+
+
+_SCHEDULERS: Dict[str, QuotaScheduler] = {}
+_LIMITS: Dict[str, Optional[float]] = {}
+_SCHEDULERS_LOCK = threading.Lock()
+
+
+def _key(provider: str, endpoint: Optional[str] = None) -> str:
+    return f"{provider}.{endpoint}" if endpoint else provider
+
+
+def _limit_from_env(key: str) -> Optional[float]:
+    # e.g. TRUTHLENS_FIRECRAWL_RPM=100, TRUTHLENS_FIRECRAWL_SEARCH_RPM=50
+    rpm = os.getenv(f"TRUTHLENS_{key.upper().replace('.', '_').replace('-', '_')}_RPM")
+    return float(rpm) if rpm else None
+
+
+def _make_scheduler(key: str, requests_per_minute: Optional[float]) -> QuotaScheduler:
+    rate = requests_per_minute / 60.0 if requests_per_minute else None
+    db_path = os.getenv("TRUTHLENS_RATE_LIMIT_DB")
+    if db_path:
+        bucket: TokenBucket | SqliteTokenBucket = SqliteTokenBucket(db_path, key, rate)
+    else:
+        bucket = TokenBucket(rate)
+    return QuotaScheduler(key, bucket)
+
+
+def configure_rate_limit(
+    provider: str,
+    requests_per_minute: Optional[float],
+    endpoint: Optional[str] = None,
+) -> None:
+    """
+    Set (or clear, with None/0) the process-wide request rate for a provider,
+    or for one of its endpoints.
+    """
+    key = _key(provider, endpoint)
+    with _SCHEDULERS_LOCK:
+        _LIMITS[key] = requests_per_minute or None
+        _SCHEDULERS[key] = _make_scheduler(key, _LIMITS[key])
+
+
+def _scheduler_for(key: str) -> QuotaScheduler:
+    with _SCHEDULERS_LOCK:
+        scheduler = _SCHEDULERS.get(key)
+        if scheduler is None:
+            if key not in _LIMITS:
+                _LIMITS[key] = _limit_from_env(key)
+            scheduler = _SCHEDULERS[key] = _make_scheduler(key, _LIMITS[key])
+        return scheduler
+
+
+def acquire(provider: str, endpoint: Optional[str] = None) -> None:
+    """
+    Wait for a request slot for `provider` ("firecrawl", "gemini") and, if
+    given, `endpoint` ("search", "extract", a model name, ...). Returns at once
+    when no limit or cooldown applies.
+    """
+    keys = [_key(provider)] + ([_key(provider, endpoint)] if endpoint else [])
+    waited = sum(_scheduler_for(key).acquire() for key in keys)
+    if waited > 0.001:
+        priority = "batch" if _PRIORITY.get() == PRIORITY_BATCH else "interactive"
+        incr("rate_limit.throttled", provider=provider, endpoint=endpoint or "", priority=priority)
+        observe(
+            "rate_limit.wait_ms",
+            waited * 1000.0,
+            provider=provider,
+            endpoint=endpoint or "",
+            priority=priority,
+        )
+
+
+def report_rate_limited(
+    provider: str,
+    endpoint: Optional[str] = None,
+    retry_after: Optional[float] = None,
+) -> None:
+    """
+    Record an upstream 429: pause the endpoint (or provider) for
+    `retry_after` seconds so no thread or process sends into the cooldown.
+    """
+    seconds = retry_after if retry_after is not None else DEFAULT_BACKOFF_SECONDS
+    incr("rate_limit.upstream_429", provider=provider, endpoint=endpoint or "")
+    logger.warning(
+        "%s rate limited (429); pausing for %.1fs.",
+        _key(provider, endpoint),
+        seconds,
+    )
+    _scheduler_for(_key(provider, endpoint)).penalize(seconds)
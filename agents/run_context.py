@@ -0,0 +1,293 @@
+"""
+Cooperative cancellation and deadlines for pipeline runs.
+
+A RunContext is installed for a block with run_context_scope() (or passed to a
+stage entrypoint as `run_context=`) and, like the run ID, travels into worker
+threads through bind_context(). Nothing is interrupted forcibly; instead the
+places where a run spends its time check it:
+
+- rate-limit waits (agents/rate_limit.py) wake up and give up,
+- Firecrawl and Gemini calls (agents/firecrawl_client.py, agents/llm_client.py)
+  are not started, and calls in flight are abandoned: the caller raises at
+  once and the response, when it arrives, is dropped,
+- extract polling stops and the job is cancelled upstream where Firecrawl
+  accepts it (agents/pattern_analyzer/tools/firecrawl_pattern_analyzer.py),
+- request timeouts are clipped to the time left before the deadline.
+
+Stages keep what they had when the run was cancelled and set `truncated` on
+their result; a stage with nothing to return raises RunCancelled.
+
+  ctx = RunContext.with_timeout(30)
+  fact = run_fact_finder(statement, run_context=ctx)
+  ...
+  ctx.cancel("client disconnected")  # from any thread
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from telemetry import bind_context, get_logger, incr
+
+logger = get_logger("run_context")
+
+T = TypeVar("T")
+
+DEADLINE_REASON = "deadline exceeded"
+
+
+class RunCancelled(Exception):
+    """
+    Raised where a cancelled (or expired) run cannot continue.
+    """
+
+    def __init__(self, reason: str = "cancelled") -> None:
+        super().__init__(f"Run cancelled: {reason}")
+        self.reason = reason
+
+
+class RunContext:
+    """
+    Cancellation flag plus an optional deadline (time.monotonic() seconds).
+
+    A child context is cancelled with its parent and never outlives the
+    parent's deadline. cancel() is thread-safe and idempotent; callbacks
+    registered with on_cancel() run once, in the cancelling thread.
+    """
+
+    def __init__(self, deadline: Optional[float] = None, parent: Optional["RunContext"] = None) -> None:
+        if parent is not None and parent.deadline is not None:
+            deadline = parent.deadline if deadline is None else min(deadline, parent.deadline)
+        self.deadline = deadline
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: Dict[int, Callable[[], None]] = {}
+        self._next_id = 0
+        self._unlink: Optional[Callable[[], None]] = None
+        if parent is not None:
+            self._unlink = parent.on_cancel(lambda: self.cancel(parent.reason or "cancelled"))
+
+    @classmethod
+    def with_timeout(cls, seconds: Optional[float], parent: Optional["RunContext"] = None) -> "RunContext":
+        deadline = time.monotonic() + seconds if seconds else None
+        return cls(deadline=deadline, parent=parent)
+
+    def child(self, timeout: Optional[float] = None) -> "RunContext":
+        return RunContext.with_timeout(timeout, parent=self)
+
+    def close(self) -> None:
+        """
+        Detach from the parent (for short-lived children of a long-lived context).
+        """
+        if self._unlink is not None:
+            self._unlink()
+            self._unlink = None
+
+    # --- state ----------------------------------------------------------
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel(DEADLINE_REASON)
+            return True
+        return False
+
+    def remaining(self) -> Optional[float]:
+        """
+        Seconds left before the deadline (0 once cancelled), or None without one.
+        """
+        if self._event.is_set():
+            return 0.0
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def clip(self, seconds: Optional[float]) -> Optional[float]:
+        """
+        `seconds` (a timeout or a wait) shortened to the time left.
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return seconds
+        return remaining if seconds is None else min(seconds, remaining)
+
+    def check(self) -> None:
+        if self.cancelled:
+            raise RunCancelled(self.reason or "cancelled")
+
+    # --- cancellation -----------------------------------------------------
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks = list(self._callbacks.values())
+            self._callbacks.clear()
+        incr("run.cancelled", reason=reason)
+        logger.info("Run cancelled (%s).", reason)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:  # a failing callback must not stop the others
+                logger.warning("Cancel callback failed: %s", e)
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Call `callback` when the context is cancelled (at once if it already
+        is). Returns a function that unregisters it. Deadlines fire callbacks
+        only once some waiter notices them; waits are clipped to the deadline.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                key = self._next_id
+                self._next_id += 1
+                self._callbacks[key] = callback
+                return lambda: self._callbacks.pop(key, None)
+        callback()
+        return lambda: None
+
+    def wait(self, seconds: float) -> bool:
+        """
+        Sleep up to `seconds`, waking early on cancellation or the deadline.
+        Returns True if the run is cancelled.
+        """
+        timeout = self.clip(seconds)
+        if timeout:
+            self._event.wait(timeout)
+        return self.cancelled
+
+
+_CURRENT: ContextVar[Optional[RunContext]] = ContextVar("truthlens_run_context", default=None)
+
+
+def current_run_context() -> Optional[RunContext]:
+    return _CURRENT.get()
+
+
+@contextmanager
+def run_context_scope(ctx: Optional[RunContext]) -> Iterator[Optional[RunContext]]:
+    """
+    Make `ctx` the current run context inside the block. With ctx=None the
+    enclosing context (if any) stays in effect.
+    """
+    if ctx is None:
+        yield _CURRENT.get()
+        return
+    token = _CURRENT.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _CURRENT.reset(token)
+
+
+@contextmanager
+def shielded() -> Iterator[None]:
+    """
+    Run the block outside any run context, e.g. to send an upstream cancel
+    request after the run itself was cancelled.
+    """
+    token = _CURRENT.set(None)
+    try:
+        yield
+    finally:
+        _CURRENT.reset(token)
+
+
+def with_run_context(fn: Callable[..., T]) -> Callable[..., T]:
+    """
+    Decorator for stage entrypoints: accept a keyword-only `run_context` and
+    run `fn` inside it (or inside the caller's context when it is omitted).
+    """
+
+    @functools.wraps(fn)
+    def _wrapper(*args: Any, run_context: Optional[RunContext] = None, **kwargs: Any) -> T:
+        with run_context_scope(run_context):
+            return fn(*args, **kwargs)
+
+    return _wrapper
+
+
+def run_cancelled() -> bool:
+    """
+    True if the current run was cancelled or has passed its deadline.
+    """
+    ctx = _CURRENT.get()
+    return ctx is not None and ctx.cancelled
+
+
+def check_cancelled() -> None:
+    """
+    Raise RunCancelled if the current run was cancelled or has passed its deadline.
+    """
+    ctx = _CURRENT.get()
+    if ctx is not None:
+        ctx.check()
+
+
+def clip_timeout(seconds: Optional[float]) -> Optional[float]:
+    ctx = _CURRENT.get()
+    return seconds if ctx is None else ctx.clip(seconds)
+
+
+def sleep(seconds: float) -> None:
+    """
+    time.sleep() that raises RunCancelled as soon as the current run is cancelled.
+    """
+    ctx = _CURRENT.get()
+    if ctx is None:
+        time.sleep(seconds)
+    elif ctx.wait(seconds):
+        raise RunCancelled(ctx.reason or "cancelled")
+
+
+def call_abortable(kind: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    fn(*args, **kwargs), abandoned if the current run is cancelled first.
+
+    Blocking client calls (HTTP requests, Gemini generate_content) cannot be
+    interrupted, so with a run context the call runs on a daemon thread and the
+    caller waits for either its result or the cancellation. An abandoned call
+    finishes in the background and its result is dropped. Without a run
+    context this is a plain call.
+    """
+    ctx = _CURRENT.get()
+    if ctx is None:
+        return fn(*args, **kwargs)
+    ctx.check()
+
+    wake = threading.Event()
+    outcome: List[Any] = []
+
+    def _target() -> None:
+        try:
+            outcome.append((True, fn(*args, **kwargs)))
+        except BaseException as e:
+            outcome.append((False, e))
+        finally:
+            wake.set()
+
+    unregister = ctx.on_cancel(wake.set)
+    threading.Thread(target=bind_context(_target), name=f"abortable-{kind}", daemon=True).start()
+    try:
+        while not outcome:
+            wake.wait(ctx.remaining())
+            if not outcome and ctx.cancelled:
+                incr("run.aborted_calls", kind=kind)
+                raise RunCancelled(ctx.reason or "cancelled")
+    finally:
+        unregister()
+
+    ok, value = outcome[0]
+    if ok:
+        return value
+    raise value
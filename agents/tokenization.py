@@ -0,0 +1,132 @@
+"""
+Tokenization shared by the claim matchers.
+
+Text is NFKC-normalized and casefolded, split into words, stripped of
+stopwords (en, fr, es, de) and lightly stemmed; runs of CJK characters, which
+have no spaces to split on, become overlapping character bigrams. Each text's
+distinct tokens are cached per text. A Vocabulary interns tokens to integer
+IDs for the texts compared together (one columnar view), and gives each text
+its sorted IDs as a compact array; it is dropped with the view, so IDs do not
+accumulate over the life of the process.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import unicodedata
+from array import array
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Tuple
+
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+# A run of CJK characters, or a run of other word characters.
+_TOKEN_RE = re.compile(rf"([{_CJK}]+)|([^\W{_CJK}]+)")
+
+STOPWORDS: FrozenSet[str] = frozenset(
+    # en
+    "a an the of to in on for and or but not no is are was were be been being by with at as that this "
+    "these those it its from has have had will would shall should can do does did than then there their "
+    "they them he she his her we our you your i into over about after before also which who whom what "
+    "when where while more most some such only other any all each so very just up out if".split()
+    # fr
+    + "le la les un une des du de et ou est sont été au aux ce ces cet cette dans par pour sur avec "
+    "qui que qu il elle ils elles se sa son ses leur leurs ne pas plus".split()
+    # es
+    + "el los las una unos unas del al y o es son fue fueron por para con que se su sus en lo como "
+    "más pero sin sobre este esta estos estas".split()
+    # de
+    + "der die das den dem des ein eine einer eines einem einen und oder ist sind war waren zu im "
+    "mit von für auf aus bei nach über als auch nicht sich es er sie wird wurde".split()
+)
+
+# Words this short are never stemmed.
+MIN_STEM_LENGTH = 4
+# Texts cached with their distinct tokens.
+TOKEN_CACHE_SIZE = 65536
+
+
+def normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """
+    Light suffix stripping, so "sanctions", "sanctioned" and "sanctioning"
+    (or "fire", "fires", "fired", "firing") share one token. Not a full
+    Porter stemmer: a plural ending is removed first, then an -ed, -ing or
+    -ly ending, then a doubled final consonant and a trailing "e", and only
+    from words of MIN_STEM_LENGTH or more.
+    """
+    if len(word) < MIN_STEM_LENGTH or not word.isalpha():
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        word = word[:-3] + "y"  # "countries" -> "country"; "dies" -> "die" below
+    elif word.endswith(("sses", "shes", "ches", "xes", "zes")):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+    if word.endswith("ied"):
+        word = word[:-1] if len(word) == 4 else word[:-3] + "y"  # "died" -> "die", "denied" -> "deny"
+    elif word.endswith("ing") and len(word) > 5:
+        word = word[:-3]
+    elif word.endswith("ed") and len(word) > 4:
+        word = word[:-2]
+    elif word.endswith("ly") and len(word) > 5:
+        word = word[:-2]
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "lsz":
+        word = word[:-1]  # "stopped" -> "stop"
+    if len(word) > 3 and word.endswith("e"):
+        word = word[:-1]  # "fire" and "fired" -> "fir"
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Matching tokens of `text`, in order (with repeats).
+    """
+    tokens: List[str] = []
+    for cjk, word in _TOKEN_RE.findall(normalize(text)):
+        if cjk:
+            tokens.extend(cjk[i : i + 2] for i in range(max(1, len(cjk) - 1)))
+        elif word not in STOPWORDS:
+            tokens.append(stem(word))
+    return tokens
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def distinct_tokens(text: str) -> Tuple[str, ...]:
+    """
+    The distinct tokens of `text`. Cached per text.
+    """
+    return tuple(set(tokenize(text)))
+
+
+class Vocabulary:
+    """
+    Token IDs assigned on first sight. IDs are only comparable between
+    arrays from the same Vocabulary.
+    """
+
+    __slots__ = ("_ids", "_lock")
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def token_id(self, token: str) -> int:
+        tid = self._ids.get(token)
+        if tid is None:
+            with self._lock:
+                tid = self._ids.setdefault(token, len(self._ids))
+        return tid
+
+    def token_ids(self, text: str) -> array:
+        """
+        Sorted, distinct token IDs of `text` as an unsigned-int array.
+        """
+        return array("I", sorted(map(self.token_id, distinct_tokens(text))))
+
+    def __len__(self) -> int:
+        return len(self._ids)
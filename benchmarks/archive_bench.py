@@ -0,0 +1,184 @@
+"""
+Benchmark for the claim archive (memory/claim_archive.py).
+
+Fills a scratch archive with synthetic statements (random word-like claim
+texts, benchmarks/synthetic.py modalities, blame targets and publish dates),
+then times archiving
+throughput and the latency of each query type over the filled archive:
+  - text:          full-text search for a claim's words
+  - text+exclude:  the same, leaving out the claim's own statement (as the Critic does)
+  - url, blame_target, date range, and text combined with a date range
+
+  python -m benchmarks.archive_bench --claims 1000000
+  python -m benchmarks.archive_bench --claims 200000 --queries 500 --json archive.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from agents.pattern_analyzer.schemas.pattern_analyzer_schema import (  # noqa: E402
+    ArticleAnalysis,
+    Claim,
+    PatternAnalysisResult,
+)
+from benchmarks.synthetic import MODALITY_SAMPLES  # noqa: E402
+from memory.claim_archive import ClaimArchive  # noqa: E402
+
+TARGETS = ["China", "Russia", "USA", "India", "Pakistan", "France", "Indonesia", "Iran", "Israel", "Ukraine"]
+DAY = 86400.0
+START_TS = 1_672_531_200.0  # 2023-01-01
+
+
+def make_vocabulary(rng: random.Random, size: int) -> List[str]:
+    """
+    Distinct word-like strings of 4-10 letters (so stemmed prefix queries
+    expand as they would on real text, unlike numbered tokens).
+    """
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 10))))
+    return sorted(words)
+
+
+def make_statement(
+    rng: random.Random,
+    index: int,
+    articles: int,
+    claims_per_article: int,
+    vocabulary: List[str],
+) -> PatternAnalysisResult:
+    modalities = [m for group in MODALITY_SAMPLES.values() for m in group]
+    base_ts = START_TS + rng.random() * 730 * DAY
+    analyzed = []
+    for a in range(articles):
+        ts = base_ts + rng.random() * 14 * DAY
+        claims = [
+            Claim(
+                text=" ".join(rng.choice(vocabulary) for _ in range(rng.randint(6, 14))).capitalize() + ".",
+                modality=rng.choice(modalities),
+                blame_target=rng.choice(TARGETS) if rng.random() < 0.6 else None,
+                publish_ts=ts,
+            )
+            for _ in range(claims_per_article)
+        ]
+        analyzed.append(
+            ArticleAnalysis(
+                url=f"https://outlet{rng.randrange(500)}.example/{index}/{a}",
+                publish_ts=ts,
+                source_country=rng.choice(TARGETS),
+                key_claims=claims,
+            )
+        )
+    return PatternAnalysisResult(statement=f"Synthetic statement {index}", analyzed_articles=analyzed)
+
+
+def latency(fn: Callable[[], object], runs: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": statistics.median(samples),
+        "p95_ms": samples[int(0.95 * (len(samples) - 1))],
+        "max_ms": samples[-1],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Claim archive benchmark.")
+    parser.add_argument("--claims", type=int, default=200_000, help="claims to archive")
+    parser.add_argument("--articles-per-statement", type=int, default=50)
+    parser.add_argument("--claims-per-article", type=int, default=5)
+    parser.add_argument("--vocabulary", type=int, default=20_000, help="distinct words in claim texts")
+    parser.add_argument("--queries", type=int, default=200, help="runs per query type")
+    parser.add_argument("--archive", help="archive path (default: a temporary file)")
+    parser.add_argument("--json", dest="json_out")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(rng, args.vocabulary)
+    path = args.archive or str(Path(tempfile.mkdtemp(prefix="truthlens-archive-")) / "claim_archive.db")
+    archive = ClaimArchive(path)
+
+    per_statement = args.articles_per_statement * args.claims_per_article
+    statements = max(1, args.claims // per_statement)
+    sample: List[PatternAnalysisResult] = []
+    start = time.perf_counter()
+    for i in range(statements):
+        pa = make_statement(rng, i, args.articles_per_statement, args.claims_per_article, vocabulary)
+        archive.add_pattern_analysis(pa)
+        if len(sample) < 50:
+            sample.append(pa)
+    write_s = time.perf_counter() - start
+    counts = archive.counts()
+
+    claims = [(pa, c, art) for pa in sample for art in pa.analyzed_articles for c in art.key_claims]
+
+    def pick():
+        return rng.choice(claims)
+
+    def text_query() -> object:
+        _, claim, _ = pick()
+        return archive.search_claims(claim.text, limit=20)
+
+    def text_exclude_query() -> object:
+        pa, claim, _ = pick()
+        return archive.search_claims(claim.text, exclude_statement=pa.statement, limit=20)
+
+    def url_query() -> object:
+        _, _, article = pick()
+        return archive.search_claims(url=article.url)
+
+    def blame_query() -> object:
+        return archive.search_claims(blame_target=rng.choice(TARGETS).lower(), limit=20)
+
+    def range_query() -> object:
+        since = START_TS + rng.random() * 700 * DAY
+        return archive.search_claims(since=since, until=since + 7 * DAY, limit=20)
+
+    def text_range_query() -> object:
+        _, claim, _ = pick()
+        since = (claim.publish_ts or START_TS) - 30 * DAY
+        return archive.search_claims(claim.text, since=since, until=since + 60 * DAY, limit=20)
+
+    queries = {
+        "text": text_query,
+        "text+exclude": text_exclude_query,
+        "url": url_query,
+        "blame_target": blame_query,
+        "date range": range_query,
+        "text+date range": text_range_query,
+    }
+    results = {name: latency(fn, args.queries) for name, fn in queries.items()}
+
+    size_mib = sum(p.stat().st_size for p in Path(path).parent.glob(Path(path).name + "*")) / 2**20
+    print(f"archive: {path} ({size_mib:.0f} MiB)")
+    print(f"{counts['claims']} claims in {counts['statements']} statements archived in {write_s:.1f} s "
+          f"({counts['claims'] / write_s:,.0f} claims/s)")
+    print(f"{'query':<18}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for name, r in results.items():
+        print(f"{name:<18}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['max_ms']:>10.2f}")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"counts": counts, "write_seconds": write_s, "queries": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Rebuild the offline benchmark fixtures from the recorded memory stores.
+
+  python -m benchmarks.build_fixtures
+
+- firecrawl_search.json: a /v2/search response rebuilt from the Fact-Finder store.
+- firecrawl_extract.json: per-URL ExtractArticle payloads rebuilt from the
+  Pattern Analysis store (the stub server assembles extract job results from it).
+- gemini_counterpoints.json: the Counterpoint LLM output recorded in
+  counterpoint_store.json.
+
+gemini_implication_candidates.json is hand-maintained and not touched here.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+SOURCE_JSON_FIELDS = [
+    "title",
+    "url",
+    "description",
+    "source_name",
+    "publish_date",
+    "source_class",
+    "source_country",
+    "historical_verdicts",
+]
+
+
+def _latest(store_path: Path) -> Dict[str, Any]:
+    with store_path.open("r", encoding="utf-8") as f:
+        store = json.load(f)
+    if not store:
+        raise ValueError(f"{store_path} is empty; nothing to build fixtures from.")
+    return store[next(reversed(store))]
+
+
+def build_search_fixture(fact_finder: Dict[str, Any]) -> Dict[str, Any]:
+    data: Dict[str, List[Dict[str, Any]]] = {"news": [], "web": []}
+    for src in fact_finder.get("sources", []):
+        structured = {k: src.get(k) for k in SOURCE_JSON_FIELDS if src.get(k) is not None}
+        data.setdefault(src.get("source_type") or "web", []).append(
+            {
+                "url": src["url"],
+                "title": src.get("title"),
+                "description": src.get("description"),
+                "json": structured,
+            }
+        )
+    return {"success": True, "statement": fact_finder["statement"], "data": data}
+
+
+def build_extract_fixture(pattern_analysis: Dict[str, Any]) -> Dict[str, Any]:
+    articles: Dict[str, Dict[str, Any]] = {}
+    for art in pattern_analysis.get("analyzed_articles", []):
+        claims = art.get("key_claims") or [{}]
+        claim = claims[0]
+        articles[art["url"]] = {
+            "title": art.get("title") or "",
+            "source_url": art["url"],
+            "statistics": art.get("statistics") or "",
+            "narrative_summary": art.get("narrative_summary") or "",
+            "key_claims": {
+                "text": claim.get("text", ""),
+                "blame_target": claim.get("blame_target"),
+                "modality": claim.get("modality"),
+                "evidence": claim.get("evidence"),
+            },
+            "stance": art.get("stance"),
+            "bias_indication": art.get("bias_indicators"),
+        }
+    return {"statement": pattern_analysis["statement"], "articles": articles}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fact-finder-store", default=str(REPO_ROOT / "memory/fact_finder_store.json"))
+    parser.add_argument(
+        "--pattern-store", default=str(REPO_ROOT / "memory/pattern_analysis_store.json")
+    )
+    parser.add_argument("--counterpoint-store", default=str(REPO_ROOT / "counterpoint_store.json"))
+    parser.add_argument("--out", default=str(FIXTURES_DIR))
+    args = parser.parse_args()
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+
+    with (out / "firecrawl_search.json").open("w", encoding="utf-8") as f:
+        json.dump(build_search_fixture(_latest(Path(args.fact_finder_store))), f, indent=2, ensure_ascii=False)
+
+    with (out / "firecrawl_extract.json").open("w", encoding="utf-8") as f:
+        json.dump(build_extract_fixture(_latest(Path(args.pattern_store))), f, indent=2, ensure_ascii=False)
+
+    with Path(args.counterpoint_store).open("r", encoding="utf-8") as f:
+        counterpoints = json.load(f).get("counterpoints", [])
+    with (out / "gemini_counterpoints.json").open("w", encoding="utf-8") as f:
+        json.dump(counterpoints, f, indent=2, ensure_ascii=False)
+
+    print(f"Fixtures written to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Memory and throughput benchmark for the columnar PatternAnalysisResult view
+(agents/pattern_analyzer/tools/columnar.py).
+
+Builds a synthetic result (benchmarks/synthetic.py), reloads it from JSON as
+the memory stores do (so repeated strings are separate objects, as in a real
+run) and reports per size:
+  - models KiB / view KiB: memory held by the loaded pydantic models, and by
+    a view built from them once the models are dropped (text fields included)
+  - build ms / round trip ms: building the view, and view -> models
+  - scan ms (models / view): one pass counting claims per (source_country,
+    modality class) and collecting distinct URLs, the access pattern of the
+    Critic and Counterpoint loops
+
+  python -m benchmarks.columnar_bench --sizes 100,1000,5000
+  python -m benchmarks.columnar_bench --sizes 2000 --claims-per-article 8 --json columnar.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple, TypeVar
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from agents.pattern_analyzer.schemas.pattern_analyzer_schema import PatternAnalysisResult  # noqa: E402
+from agents.pattern_analyzer.tools.columnar import ColumnarPatternAnalysis  # noqa: E402
+from agents.pattern_analyzer.tools.modality import claim_modality  # noqa: E402
+from benchmarks.synthetic import SyntheticConfig, generate_pattern_analysis  # noqa: E402
+
+R = TypeVar("R")
+
+
+@dataclass
+class ColumnarPoint:
+    articles: int
+    claims: int
+    models_kib: float
+    view_kib: float
+    build_ms: float
+    round_trip_ms: float
+    scan_models_ms: float
+    scan_view_ms: float
+
+
+def measure(fn: Callable[[], R]) -> Tuple[R, float, float]:
+    """
+    (result, seconds, KiB still allocated by the result afterwards).
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, current / 1024
+
+
+def scan_models(pa: PatternAnalysisResult) -> Tuple[Counter, int]:
+    counts: Counter = Counter()
+    urls = set()
+    for article in pa.analyzed_articles:
+        urls.add(article.url)
+        for claim in article.key_claims:
+            counts[(article.source_country, claim_modality(claim))] += 1
+    return counts, len(urls)
+
+
+def scan_view(view: ColumnarPatternAnalysis) -> Tuple[Counter, int]:
+    countries = view.articles["source_country"]
+    classes = view.claim_classes
+    pairs = Counter(zip((countries.codes[a] for a in view.claim_article), classes))
+    counts: Counter = Counter({(countries.values[code], cls): n for (code, cls), n in pairs.items()})
+    return counts, len(view.url_index)
+
+
+def best_of(fn: Callable[[], R], repeats: int) -> Tuple[R, float]:
+    start = time.perf_counter()
+    result = fn()
+    best = time.perf_counter() - start
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def build_view(pa: PatternAnalysisResult) -> ColumnarPatternAnalysis:
+    view = ColumnarPatternAnalysis.from_result(pa)
+    view.claim_classes  # built lazily; counted as part of the view
+    return view
+
+
+def run_point(base: SyntheticConfig, articles: int, repeats: int, seed: int) -> ColumnarPoint:
+    cfg = replace(base, articles=articles)
+    payload = generate_pattern_analysis(cfg, random.Random(seed)).model_dump_json()
+
+    pa, _, models_kib = measure(lambda: PatternAnalysisResult.model_validate_json(payload))
+    _, _, view_kib = measure(lambda: build_view(PatternAnalysisResult.model_validate_json(payload)))
+    view, build_s = best_of(lambda: build_view(pa), 1)
+
+    round_trip, round_trip_s = best_of(view.to_result, 1)
+    if round_trip != pa:
+        raise AssertionError("columnar round trip changed the result")
+
+    by_models, scan_models_s = best_of(lambda: scan_models(pa), repeats)
+    by_view, scan_view_s = best_of(lambda: scan_view(view), repeats)
+    if by_models != by_view:
+        raise AssertionError("columnar scan disagrees with the model scan")
+
+    return ColumnarPoint(
+        articles=len(view),
+        claims=view.claim_count,
+        models_kib=models_kib,
+        view_kib=view_kib,
+        build_ms=build_s * 1000,
+        round_trip_ms=round_trip_s * 1000,
+        scan_models_ms=scan_models_s * 1000,
+        scan_view_ms=scan_view_s * 1000,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Columnar PatternAnalysisResult benchmark.")
+    parser.add_argument("--sizes", default="100,1000,5000", help="comma-separated article counts")
+    parser.add_argument("--claims-per-article", type=int, default=4)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--json", dest="json_out")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    base = SyntheticConfig(claims_per_article=args.claims_per_article)
+    points = [run_point(base, int(s), args.repeats, args.seed) for s in args.sizes.split(",") if s.strip()]
+
+    header = ("articles", "claims", "models KiB", "view KiB", "build ms", "rt ms", "scan models", "scan view")
+    print("".join(f"{h:>13}" for h in header))
+    for p in points:
+        print(
+            f"{p.articles:>13}{p.claims:>13}{p.models_kib:>13.0f}{p.view_kib:>13.0f}"
+            f"{p.build_ms:>13.1f}{p.round_trip_ms:>13.1f}{p.scan_models_ms:>13.2f}{p.scan_view_ms:>13.2f}"
+        )
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump([asdict(p) for p in points], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Core-scaling benchmark for the Critic execution backend
+(agents/critic/tools/backend.py).
+
+Builds a synthetic workload (benchmarks/synthetic.py) and times the Critic's
+CPU-bound work on it (claim consensus, heuristic candidates and verification
+of the workload's candidates, submitted as run_critic submits them) for
+each backend mode and worker count. Worker start-up is excluded; the
+process hand-off (pickling the view into shared memory, decoding results)
+is included. Reports per configuration:
+  - ms: wall time of the job, best of --repeats
+  - speedup: against the inline backend
+  - handoff KiB: size of the pickled view sent to the workers
+
+Results are checked against the inline run.
+
+  python -m benchmarks.critic_backend_bench --articles 2000 --candidates 400 --workers 1,2,4,8
+  python -m benchmarks.critic_backend_bench --modes thread,process --workers 2,4 --json backend.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import pickle
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from agents.critic.tools.backend import CriticBackend  # noqa: E402
+from agents.pattern_analyzer.schemas.pattern_analyzer_schema import PatternAnalysisResult  # noqa: E402
+from agents.pattern_analyzer.tools.columnar import columnar_view  # noqa: E402
+from benchmarks.synthetic import SyntheticConfig, generate_workload  # noqa: E402
+
+
+@dataclass
+class BackendPoint:
+    mode: str
+    workers: int
+    articles: int
+    claims: int
+    candidates: int
+    ms: float
+    speedup: float
+    handoff_kib: float
+
+
+def run_job(backend: CriticBackend, pa: PatternAnalysisResult, candidates: List[dict]) -> Tuple[Any, ...]:
+    with backend.job(pa) as job:
+        consensus = job.submit_claim_consensus()
+        heuristic = job.submit_heuristic_candidates()
+        chains = job.verify(candidates)
+        return chains, consensus.result(), heuristic.result()
+
+
+def time_backend(
+    mode: str,
+    workers: int,
+    pa: PatternAnalysisResult,
+    candidates: List[dict],
+    repeats: int,
+) -> Tuple[Tuple[Any, ...], float]:
+    backend = CriticBackend(mode, workers=workers, min_process_claims=0)
+    try:
+        backend.warm_up()
+        best = float("inf")
+        result: Tuple[Any, ...] = ()
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = run_job(backend, pa, candidates)
+            best = min(best, time.perf_counter() - start)
+        return result, best
+    finally:
+        backend.shutdown()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Critic backend core-scaling benchmark.")
+    parser.add_argument("--articles", type=int, default=1000)
+    parser.add_argument("--claims-per-article", type=int, default=4)
+    parser.add_argument("--candidates", type=int, default=200)
+    parser.add_argument("--modes", default="thread,process", help="comma-separated backends besides inline")
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    parser.add_argument("--repeats", type=int, default=2)
+    parser.add_argument("--json", dest="json_out")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    workload = generate_workload(
+        SyntheticConfig(
+            articles=args.articles,
+            claims_per_article=args.claims_per_article,
+            candidates=args.candidates,
+            seed=args.seed,
+        )
+    )
+    pa, candidates = workload.pattern_analysis, workload.candidates
+    view = columnar_view(pa)
+    handoff_kib = len(pickle.dumps(view, protocol=pickle.HIGHEST_PROTOCOL)) / 1024
+
+    def _point(mode: str, workers: int, seconds: float, baseline: float) -> BackendPoint:
+        return BackendPoint(
+            mode=mode,
+            workers=workers,
+            articles=len(view),
+            claims=view.claim_count,
+            candidates=len(candidates),
+            ms=seconds * 1000,
+            speedup=baseline / seconds,
+            handoff_kib=handoff_kib if mode == "process" else 0.0,
+        )
+
+    expected, inline_s = time_backend("inline", 1, pa, candidates, args.repeats)
+    points = [_point("inline", 1, inline_s, inline_s)]
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip() and m.strip() != "inline"]:
+        for workers in [int(w) for w in args.workers.split(",") if w.strip()]:
+            result, seconds = time_backend(mode, workers, pa, candidates, args.repeats)
+            if result != expected:
+                raise AssertionError(f"{mode} backend with {workers} workers disagrees with inline")
+            points.append(_point(mode, workers, seconds, inline_s))
+
+    print(f"{len(view)} articles, {view.claim_count} claims, {len(candidates)} candidates, {os.cpu_count()} cores")
+    header = ("mode", "workers", "ms", "speedup", "handoff KiB")
+    print("".join(f"{h:>13}" for h in header))
+    for p in points:
+        print(f"{p.mode:>13}{p.workers:>13}{p.ms:>13.0f}{p.speedup:>13.2f}{p.handoff_kib:>13.0f}")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump([asdict(p) for p in points], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
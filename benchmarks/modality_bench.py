@@ -0,0 +1,127 @@
+"""
+Benchmark for the modality classifier (agents/pattern_analyzer/tools/modality.py).
+
+Generates a large corpus of free-text modalities (the synthetic samples, cue
+words from every language and filler phrases, with a configurable share of
+distinct strings) and times:
+  - legacy:   the former substring scan over three keyword lists
+  - compiled: the prioritized cue matcher, cold (cache cleared)
+  - cached:   the prioritized cue matcher, second pass over the same corpus
+
+It also counts the strings the two classifiers disagree on, with examples.
+
+  python -m benchmarks.modality_bench --size 200000 --distinct 0.05
+  python -m benchmarks.modality_bench --size 50000 --distinct 1.0 --json modality.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from agents.pattern_analyzer.tools import modality  # noqa: E402
+from benchmarks.synthetic import MODALITY_SAMPLES  # noqa: E402
+
+FILLER = [
+    "by officials", "according to the ministry", "in a statement", "without evidence", "on social media",
+    "citing sources", "the spokesperson", "in parliament", "last week", "the report",
+]
+
+
+def legacy_classify(modality_text: Optional[str]) -> Optional[str]:
+    """
+    The keyword scan the Critic's modality classification used before the compiled matcher.
+    """
+    if not modality_text:
+        return None
+    m = modality_text.lower()
+    if any(k in m for k in ["denies", "denied", "refutes", "refuted", "false"]):
+        return "denial"
+    if any(k in m for k in ["reports", "reported", "claims", "claimed", "alleges", "stated"]):
+        return "affirmation"
+    if any(k in m for k in ["alleged", "allegedly", "suggests", "may", "might", "possibly"]):
+        return "speculation"
+    return "speculation"
+
+
+def build_corpus(size: int, distinct: float, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    cues = [cue for language in modality.MODALITY_CUES.values() for words in language.values() for cue in words]
+    samples = [s for group in MODALITY_SAMPLES.values() for s in group]
+    pool_size = max(1, int(size * distinct))
+    pool = []
+    for i in range(pool_size):
+        parts = [rng.choice(samples if rng.random() < 0.5 else cues)]
+        for _ in range(rng.randint(0, 3)):
+            parts.append(rng.choice(FILLER if rng.random() < 0.7 else cues))
+        if rng.random() < 0.3:
+            parts.append(f"#{i}")  # keeps the string distinct
+        pool.append(" ".join(parts).capitalize())
+    return [rng.choice(pool) for _ in range(size)]
+
+
+def time_pass(fn: Callable[[str], Optional[str]], corpus: List[str]) -> float:
+    start = time.perf_counter()
+    for text in corpus:
+        fn(text)
+    return time.perf_counter() - start
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Modality classifier benchmark.")
+    parser.add_argument("--size", type=int, default=200_000, help="modality strings classified per pass")
+    parser.add_argument("--distinct", type=float, default=0.05, help="share of distinct strings 0..1")
+    parser.add_argument("--examples", type=int, default=10, help="disagreements to print")
+    parser.add_argument("--json", dest="json_out")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    corpus = build_corpus(args.size, args.distinct, args.seed)
+
+    modality._classify.cache_clear()
+    results: Dict[str, float] = {
+        "legacy": time_pass(legacy_classify, corpus),
+        "compiled": time_pass(modality.classify_modality, corpus),
+        "cached": time_pass(modality.classify_modality, corpus),
+    }
+
+    print(f"{len(corpus)} modality strings, {len(set(corpus))} distinct")
+    print(f"{'classifier':<12}{'ms':>10}{'strings/s':>14}")
+    for name, seconds in results.items():
+        print(f"{name:<12}{seconds * 1000:>10.1f}{len(corpus) / seconds:>14,.0f}")
+
+    disagreements = Counter(
+        (text, legacy_classify(text), modality.classify_modality(text))
+        for text in set(corpus)
+        if legacy_classify(text) != modality.classify_modality(text)
+    )
+    print(f"\n{len(disagreements)} distinct strings classified differently (legacy -> compiled):")
+    for text, old, new in list(disagreements)[: args.examples]:
+        print(f"  {text!r}: {old} -> {new}")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "size": len(corpus),
+                    "distinct": len(set(corpus)),
+                    "seconds": results,
+                    "disagreements": len(disagreements),
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+Offline end-to-end benchmark: Fact-Finder -> Pattern Analyzer -> Critic -> Counterpoint.
+
+Starts benchmarks/stub_server.py in a subprocess, points the pipeline at it via
+FIRECRAWL_API_URL / GEMINI_API_ENDPOINT, runs every stage in a scratch working
+directory (so the repo's memory/*.json files are untouched) and reports wall
+time, CPU time, peak Python memory and upstream call counts per stage.
+
+  python -m benchmarks.pipeline_bench --iterations 5 --latency 0.05 --failure-rate 0.05
+  python -m benchmarks.pipeline_bench --json bench_output.json
+  python -m benchmarks.pipeline_bench --latency 0.2 --speculative
+
+With --speculative the four stages run as one speculative_pipeline row
+(pipeline/speculative.py); compare its wall time with the sum of the stages.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+@dataclass
+class StageSample:
+    stage: str
+    iteration: int
+    wall_ms: float
+    cpu_ms: float
+    peak_kib: float
+    calls: Dict[str, int] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+def start_stub_server(args: argparse.Namespace) -> Tuple[subprocess.Popen, str]:
+    cmd = [
+        sys.executable,
+        "-m",
+        "benchmarks.stub_server",
+        "--port",
+        "0",
+        "--latency",
+        str(args.latency),
+        "--jitter",
+        str(args.jitter),
+        "--gemini-token-latency",
+        str(args.gemini_token_latency),
+        "--failure-rate",
+        str(args.failure_rate),
+        "--failure-status",
+        str(args.failure_status),
+        "--polls-until-complete",
+        str(args.polls_until_complete),
+        "--seed",
+        str(args.seed),
+    ]
+    proc = subprocess.Popen(cmd, cwd=REPO_ROOT, stdout=subprocess.PIPE, text=True)
+    assert proc.stdout is not None
+    base_url = proc.stdout.readline().strip()
+    if not base_url.startswith("http"):
+        proc.kill()
+        raise RuntimeError(f"Stub server did not start (got {base_url!r}).")
+    return proc, base_url
+
+
+def stub_calls(base_url: str) -> Dict[str, int]:
+    return requests.get(f"{base_url}/_stats", timeout=10).json()
+
+
+def _diff(after: Dict[str, int], before: Dict[str, int]) -> Dict[str, int]:
+    return {k: v - before.get(k, 0) for k, v in after.items() if v - before.get(k, 0)}
+
+
+def configure_environment(base_url: str, poll_interval: float) -> None:
+    """
+    Must run before the agent modules are imported: they read these at import time.
+    """
+    os.environ["FIRECRAWL_API_URL"] = base_url
+    os.environ["FIRECRAWL_API_KEY"] = "offline-benchmark"
+    os.environ["FIRECRAWL_POLL_INTERVAL_SECONDS"] = str(poll_interval)
+    os.environ["GEMINI_API_ENDPOINT"] = base_url
+    os.environ["GOOGLE_API_KEY"] = "offline-benchmark"
+    os.environ.setdefault("TRUTHLENS_LOG_LEVEL", "WARNING")
+    # Every iteration must reach the stub, not the response cache.
+    os.environ["TRUTHLENS_RESPONSE_CACHE"] = "0"
+    # Relative defaults ("./memory/...") resolve inside the scratch directory.
+    for var in (
+        "TRUTHLENS_MEMORY_PATH",
+        "TRUTHLENS_CRITIC_MEMORY_PATH",
+        "TRUTHLENS_COUNTERPOINT_MEMORY_PATH",
+    ):
+        os.environ.pop(var, None)
+
+
+def measure(
+    stage: str,
+    iteration: int,
+    fn: Callable[[], Any],
+    base_url: str,
+    trace_memory: bool,
+) -> StageSample:
+    before = stub_calls(base_url)
+    if trace_memory:
+        tracemalloc.start()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    error: Optional[str] = None
+    try:
+        fn()
+    except Exception as e:  # keep going so failure injection shows up in the report
+        error = f"{type(e).__name__}: {e}"[:200]
+    wall_ms = (time.perf_counter() - wall_start) * 1000.0
+    cpu_ms = (time.process_time() - cpu_start) * 1000.0
+    peak_kib = 0.0
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_kib = peak / 1024.0
+    calls = _diff(stub_calls(base_url), before)
+    return StageSample(stage, iteration, wall_ms, cpu_ms, peak_kib, calls, error)
+
+
+def summarize(samples: List[StageSample]) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    for stage in dict.fromkeys(s.stage for s in samples):
+        stage_samples = [s for s in samples if s.stage == stage]
+        calls: Dict[str, int] = {}
+        for s in stage_samples:
+            for k, v in s.calls.items():
+                calls[k] = calls.get(k, 0) + v
+        rows.append(
+            {
+                "stage": stage,
+                "runs": len(stage_samples),
+                "errors": sum(1 for s in stage_samples if s.error),
+                "wall_ms_median": statistics.median(s.wall_ms for s in stage_samples),
+                "wall_ms_max": max(s.wall_ms for s in stage_samples),
+                "cpu_ms_median": statistics.median(s.cpu_ms for s in stage_samples),
+                "peak_kib_max": max(s.peak_kib for s in stage_samples),
+                "calls_per_run": {k: v / len(stage_samples) for k, v in sorted(calls.items())},
+            }
+        )
+    return rows
+
+
+def print_report(rows: List[Dict[str, Any]]) -> None:
+    header = f"{'stage':<18}{'runs':>5}{'err':>5}{'wall p50 ms':>13}{'wall max ms':>13}{'cpu p50 ms':>12}{'peak KiB':>11}  calls/run"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        calls = ", ".join(f"{k}={v:g}" for k, v in r["calls_per_run"].items()) or "-"
+        print(
+            f"{r['stage']:<18}{r['runs']:>5}{r['errors']:>5}"
+            f"{r['wall_ms_median']:>13.1f}{r['wall_ms_max']:>13.1f}"
+            f"{r['cpu_ms_median']:>12.1f}{r['peak_kib_max']:>11.1f}  {calls}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmark over recorded fixtures.")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="stub latency per call (s)")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument(
+        "--gemini-token-latency",
+        type=float,
+        default=0.0,
+        help="stub Gemini seconds per 1000 prompt tokens",
+    )
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--failure-status", type=int, default=500)
+    parser.add_argument("--polls-until-complete", type=int, default=2)
+    parser.add_argument("--poll-interval", type=float, default=0.01, help="extract poll sleep (s)")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--limit", type=int, default=10, help="Fact-Finder search limit")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc (less overhead)")
+    parser.add_argument(
+        "--speculative",
+        action="store_true",
+        help="run pipeline/speculative.py instead of the stages one after another",
+    )
+    parser.add_argument("--json", dest="json_out", help="also write raw samples + summary here")
+    args = parser.parse_args(argv)
+
+    proc, base_url = start_stub_server(args)
+    original_cwd = os.getcwd()
+    try:
+        configure_environment(base_url, args.poll_interval)
+        sys.path.insert(0, str(REPO_ROOT))
+
+        from agents.counterpoint.tools.counterpoint_tool import run_counterpoint
+        from agents.critic.tools.critic_tool import run_critic
+        from agents.fact_finder.tools.firecrawl_fact_finder import run_fact_finder
+        from agents.pattern_analyzer.tools.firecrawl_pattern_analyzer import run_pattern_analyzer
+        from memory.write_behind import flush_stores
+        from pipeline.speculative import run_speculative_pipeline
+
+        with (REPO_ROOT / "benchmarks/fixtures/firecrawl_search.json").open(encoding="utf-8") as f:
+            statement = json.load(f)["statement"]
+
+        stages: List[Tuple[str, Callable[[], Any]]] = [
+            ("fact_finder", lambda: run_fact_finder(statement=statement, limit=args.limit)),
+            ("pattern_analyzer", run_pattern_analyzer),
+            ("critic", run_critic),
+            ("counterpoint", run_counterpoint),
+        ]
+        if args.speculative:
+            stages = [
+                ("speculative_pipeline", lambda: run_speculative_pipeline(statement, limit=args.limit)),
+            ]
+
+        samples: List[StageSample] = []
+        with tempfile.TemporaryDirectory(prefix="truthlens-bench-") as workdir:
+            os.chdir(workdir)
+            for iteration in range(1, args.iterations + 1):
+                for name, fn in stages:
+                    samples.append(measure(name, iteration, fn, base_url, not args.no_memory))
+                flush_stores()
+            os.chdir(original_cwd)
+
+        rows = summarize(samples)
+        print_report(rows)
+        for s in samples:
+            if s.error:
+                print(f"  [{s.stage} #{s.iteration}] {s.error}")
+
+        if args.json_out:
+            with open(args.json_out, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"summary": rows, "samples": [asdict(s) for s in samples], "args": vars(args)},
+                    f,
+                    indent=2,
+                )
+    finally:
+        os.chdir(original_cwd)
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Scaling benchmark for Critic verification and Counterpoint post-processing.
+
+Generates synthetic workloads (benchmarks/synthetic.py) at growing sizes and
+times:
+  - verify_implication_candidates  (PHASE 2 of build_implication_chains_tool)
+  - _clean_and_validate_counterpoints
+  - build_claim_consensus           (MinHash LSH clustering of all claims)
+
+For each target it reports runtime and peak memory per size, fits the log-log
+growth exponent, and flags super-linear growth (exponent above --threshold).
+
+  python -m benchmarks.scaling_bench --sizes 5,10,20,40,80,160
+  python -m benchmarks.scaling_bench --axis claims --articles 50 --sizes 1,2,4,8,16 --plot scaling.png
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from agents.counterpoint.tools.counterpoint_tool import _clean_and_validate_counterpoints  # noqa: E402
+from agents.critic.tools.claim_consensus import build_claim_consensus  # noqa: E402
+from agents.critic.tools.implication_chains import verify_implication_candidates  # noqa: E402
+from benchmarks.synthetic import SyntheticConfig, SyntheticWorkload, generate_workload  # noqa: E402
+
+
+@dataclass
+class ScalingPoint:
+    target: str
+    size: int
+    articles: int
+    claims: int
+    items: int  # candidates or raw counterpoints processed
+    seconds: float
+    peak_kib: float
+
+
+Target = Callable[[SyntheticWorkload], object]
+
+TARGETS: Dict[str, Tuple[Target, Callable[[SyntheticWorkload], int]]] = {
+    "verify_implication_candidates": (
+        lambda w: verify_implication_candidates(w.pattern_analysis, w.candidates),
+        lambda w: len(w.candidates),
+    ),
+    "clean_and_validate_counterpoints": (
+        lambda w: _clean_and_validate_counterpoints(w.raw_counterpoints, w.critic, w.allowed_urls),
+        lambda w: len(w.raw_counterpoints),
+    ),
+    "build_claim_consensus": (
+        lambda w: build_claim_consensus(w.pattern_analysis),
+        lambda w: sum(len(a.key_claims) for a in w.pattern_analysis.analyzed_articles),
+    ),
+}
+
+
+def config_for(base: SyntheticConfig, axis: str, size: int) -> SyntheticConfig:
+    if axis == "articles":
+        # Candidate and counterpoint volume grows with coverage, as with real LLM output.
+        return replace(base, articles=size, candidates=size, counterpoints=4 * size)
+    if axis == "claims":
+        return replace(base, claims_per_article=size)
+    if axis == "candidates":
+        return replace(base, candidates=size, counterpoints=2 * size)
+    raise ValueError(f"Unknown axis {axis!r}")
+
+
+def time_target(fn: Callable[[], object], repeats: int) -> Tuple[float, float]:
+    """
+    Median wall time over `repeats`, plus peak traced memory from one extra run.
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak / 1024.0
+
+
+def growth_exponent(points: List[ScalingPoint]) -> Optional[float]:
+    """
+    Least-squares slope of log(seconds) vs log(size): ~1 linear, ~2 quadratic.
+    """
+    xs = [math.log(p.size) for p in points if p.seconds > 0]
+    ys = [math.log(p.seconds) for p in points if p.seconds > 0]
+    if len(xs) < 2:
+        return None
+    mean_x, mean_y = statistics.fmean(xs), statistics.fmean(ys)
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+
+
+def plot(points: List[ScalingPoint], axis: str, path: str) -> bool:
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib is not installed; skipping plot.")
+        return False
+
+    fig, (ax_time, ax_mem) = plt.subplots(1, 2, figsize=(11, 4))
+    for target in dict.fromkeys(p.target for p in points):
+        series = [p for p in points if p.target == target]
+        sizes = [p.size for p in series]
+        ax_time.loglog(sizes, [p.seconds for p in series], marker="o", label=target)
+        ax_mem.loglog(sizes, [p.peak_kib for p in series], marker="o", label=target)
+    ax_time.set_xlabel(axis)
+    ax_time.set_ylabel("seconds (median)")
+    ax_mem.set_xlabel(axis)
+    ax_mem.set_ylabel("peak KiB")
+    ax_time.legend(fontsize="small")
+    fig.tight_layout()
+    fig.savefig(path)
+    print(f"Plot written to {path}")
+    return True
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Critic/Counterpoint scaling benchmark.")
+    parser.add_argument("--axis", choices=["articles", "claims", "candidates"], default="articles")
+    parser.add_argument("--sizes", default="5,10,20,40,80,160")
+    parser.add_argument("--articles", type=int, default=20, help="fixed article count for other axes")
+    parser.add_argument("--claims-per-article", type=int, default=1)
+    parser.add_argument("--overlap", type=float, default=0.6, help="vocabulary overlap 0..1")
+    parser.add_argument(
+        "--modality-mix",
+        default="affirmation=0.6,denial=0.15,speculation=0.25",
+        help="comma-separated kind=weight",
+    )
+    parser.add_argument("--targets", default=",".join(TARGETS))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=1.2, help="flag exponents above this")
+    parser.add_argument("--plot", help="write a runtime/memory plot (needs matplotlib)")
+    parser.add_argument("--json", dest="json_out")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    base = SyntheticConfig(
+        articles=args.articles,
+        claims_per_article=args.claims_per_article,
+        vocabulary_overlap=args.overlap,
+        modality_mix={
+            k: float(v) for k, v in (pair.split("=") for pair in args.modality_mix.split(","))
+        },
+        seed=args.seed,
+    )
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    targets = [t.strip() for t in args.targets.split(",") if t.strip()]
+
+    points: List[ScalingPoint] = []
+    for size in sizes:
+        workload = generate_workload(config_for(base, args.axis, size))
+        for target in targets:
+            fn, item_count = TARGETS[target]
+            seconds, peak_kib = time_target(lambda: fn(workload), args.repeats)
+            points.append(
+                ScalingPoint(
+                    target=target,
+                    size=size,
+                    articles=workload.config.articles,
+                    claims=workload.claim_count,
+                    items=item_count(workload),
+                    seconds=seconds,
+                    peak_kib=peak_kib,
+                )
+            )
+
+    print(f"{'target':<34}{'size':>7}{'articles':>10}{'claims':>9}{'items':>8}{'ms':>11}{'peak KiB':>11}")
+    for p in points:
+        print(
+            f"{p.target:<34}{p.size:>7}{p.articles:>10}{p.claims:>9}{p.items:>8}"
+            f"{p.seconds * 1000:>11.2f}{p.peak_kib:>11.1f}"
+        )
+
+    print()
+    exponents: Dict[str, Optional[float]] = {}
+    for target in targets:
+        exponent = growth_exponent([p for p in points if p.target == target])
+        exponents[target] = exponent
+        if exponent is None:
+            print(f"{target}: not enough points to fit growth")
+            continue
+        flag = "SUPER-LINEAR" if exponent > args.threshold else "ok"
+        print(f"{target}: runtime ~ {args.axis}^{exponent:.2f}  [{flag}]")
+
+    if args.plot:
+        plot(points, args.axis, args.plot)
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(
+                {"axis": args.axis, "points": [asdict(p) for p in points], "exponents": exponents},
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""
+Local HTTP stub that replays recorded Firecrawl and Gemini responses.
+
+Routes:
+  POST /v2/search                              -> fixtures/firecrawl_search.json
+  POST /v2/extract                             -> new job id
+  GET  /v2/extract/<id>                        -> "processing" for N polls, then the
+                                                  recorded articles for that job's URLs
+  DELETE /v2/extract/<id>                      -> cancel the job (later polls: "cancelled")
+  POST /v1beta/models/<model>:generateContent  -> recorded Gemini text (counterpoint
+                                                  prompts get the counterpoint fixture)
+  HEAD/GET /pages/<kind>/<anything>            -> article pages for the prefetch classifier:
+                                                  html, pdf, video, paywall (402), gone (404),
+                                                  nohead (405 on HEAD, html on GET)
+  GET  /_stats                                 -> per-route call counters
+  POST /_reset                                 -> reset counters and jobs
+
+Latency and failures are injected per request, reproducibly (seeded RNG):
+  python -m benchmarks.stub_server --port 8765 --latency 0.05 --jitter 0.02 --failure-rate 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+_GEMINI_ROUTE = re.compile(r"^/v1beta/models/(?P<model>[^:/]+):generateContent$")
+_EXTRACT_STATUS_ROUTE = re.compile(r"^/v2/extract/(?P<job_id>[^/]+)$")
+_PAGE_ROUTE = re.compile(r"^/pages/(?P<kind>[a-z]+)(?:/.*)?$")
+
+# kind -> (status, content type) for /pages/<kind>/...
+_PAGES: Dict[str, Tuple[int, str]] = {
+    "html": (200, "text/html; charset=utf-8"),
+    "pdf": (200, "application/pdf"),
+    "video": (200, "video/mp4"),
+    "paywall": (402, "text/html; charset=utf-8"),
+    "gone": (404, "text/html; charset=utf-8"),
+    "nohead": (200, "text/html; charset=utf-8"),
+}
+
+
+@dataclass
+class StubConfig:
+    latency: float = 0.0  # base seconds added to every API response
+    jitter: float = 0.0  # uniform +/- seconds on top of latency
+    gemini_token_latency: float = 0.0  # extra seconds per 1000 Gemini prompt tokens
+    failure_rate: float = 0.0  # probability of answering with `failure_status`
+    failure_status: int = 500
+    polls_until_complete: int = 2  # extract status polls answered with "processing"
+    seed: int = 1234
+    fixtures_dir: Path = FIXTURES_DIR
+
+
+@dataclass
+class StubState:
+    config: StubConfig
+    search: Dict[str, Any]
+    extract_articles: Dict[str, Dict[str, Any]]
+    gemini_candidates: List[Dict[str, Any]]
+    gemini_counterpoints: List[Dict[str, Any]]
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    calls: Dict[str, int] = field(default_factory=dict)
+    jobs: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    rng: random.Random = field(default_factory=random.Random)
+
+    @classmethod
+    def from_fixtures(cls, config: StubConfig) -> "StubState":
+        def _load(name: str) -> Any:
+            with (config.fixtures_dir / name).open("r", encoding="utf-8") as f:
+                return json.load(f)
+
+        state = cls(
+            config=config,
+            search=_load("firecrawl_search.json"),
+            extract_articles=_load("firecrawl_extract.json")["articles"],
+            gemini_candidates=_load("gemini_implication_candidates.json"),
+            gemini_counterpoints=_load("gemini_counterpoints.json"),
+        )
+        state.rng.seed(config.seed)
+        return state
+
+    def count(self, route: str) -> None:
+        with self.lock:
+            self.calls[route] = self.calls.get(route, 0) + 1
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            return self.rng.random() < self.config.failure_rate
+
+    def delay(self) -> float:
+        with self.lock:
+            jitter = self.rng.uniform(-self.config.jitter, self.config.jitter)
+        return max(0.0, self.config.latency + jitter)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server_version = "TruthLensStub/1.0"
+    state: StubState  # set on the handler subclass by make_server()
+
+    # --- plumbing ---------------------------------------------------------
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return  # keep benchmark output clean
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length).decode("utf-8"))
+        except json.JSONDecodeError:
+            return {}
+
+    def _send_json(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _api_preamble(self, route: str) -> bool:
+        """
+        Count the call, apply latency, and maybe inject a failure.
+        Returns False if a failure response was already sent.
+        """
+        self.state.count(route)
+        time.sleep(self.state.delay())
+        if self.state.should_fail():
+            self.state.count(f"{route}:injected_failure")
+            status = self.state.config.failure_status
+            if status == 429:
+                self.send_response(429)
+                self.send_header("Retry-After", "1")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+            elif route.startswith("gemini."):
+                # Google API error envelope, so the client raises a proper API error.
+                self._send_json(
+                    status,
+                    {"error": {"code": status, "message": "injected failure", "status": "INTERNAL"}},
+                )
+            else:
+                self._send_json(status, {"success": False, "error": "injected failure"})
+            return False
+        return True
+
+    def _page(self, kind: str, head: bool) -> None:
+        self.state.count(f"pages.{'head' if head else 'get'}")
+        if kind not in _PAGES:
+            self._send_json(404, {"error": f"unknown page kind {kind}"})
+            return
+        if head and kind == "nohead":
+            self.send_response(405)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        status, content_type = _PAGES[kind]
+        body = b"<html><body>stub article</body></html>"
+        if not head and status == 200 and self.headers.get("Range"):
+            status, body = 206, body[:1]
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    # --- routes -----------------------------------------------------------
+
+    def do_HEAD(self) -> None:  # noqa: N802
+        match = _PAGE_ROUTE.match(urlparse(self.path).path)
+        if match:
+            self._page(match.group("kind"), head=True)
+            return
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self) -> None:  # noqa: N802
+        path = urlparse(self.path).path
+        match = _PAGE_ROUTE.match(path)
+        if match:
+            self._page(match.group("kind"), head=False)
+            return
+        if path == "/_stats":
+            with self.state.lock:
+                self._send_json(200, dict(self.state.calls))
+            return
+        match = _EXTRACT_STATUS_ROUTE.match(path)
+        if match:
+            if self._api_preamble("firecrawl.extract_poll"):
+                self._extract_status(match.group("job_id"))
+            return
+
+        self._send_json(404, {"error": f"no stub route for GET {path}"})
+
+    def do_POST(self) -> None:  # noqa: N802
+        path = urlparse(self.path).path
+        if path == "/_reset":
+            with self.state.lock:
+                self.state.calls.clear()
+                self.state.jobs.clear()
+                self.state.rng.seed(self.state.config.seed)
+            self._send_json(200, {"ok": True})
+            return
+
+        payload = self._read_json()
+
+        if path == "/v2/search":
+            if self._api_preamble("firecrawl.search"):
+                self._send_json(200, self.state.search)
+            return
+
+        if path == "/v2/extract":
+            if self._api_preamble("firecrawl.extract_start"):
+                job_id = uuid.uuid4().hex
+                with self.state.lock:
+                    self.state.jobs[job_id] = {"urls": list(payload.get("urls", [])), "polls": 0}
+                self._send_json(200, {"success": True, "id": job_id})
+            return
+
+        match = _GEMINI_ROUTE.match(path)
+        if match:
+            if self._api_preamble("gemini.generate_content"):
+                self._gemini(payload)
+            return
+
+        self._send_json(404, {"error": f"no stub route for POST {path}"})
+
+    def do_DELETE(self) -> None:  # noqa: N802
+        path = urlparse(self.path).path
+        match = _EXTRACT_STATUS_ROUTE.match(path)
+        if match:
+            if self._api_preamble("firecrawl.extract_cancel"):
+                with self.state.lock:
+                    job = self.state.jobs.get(match.group("job_id"))
+                    if job is not None:
+                        job["cancelled"] = True
+                if job is None:
+                    self._send_json(404, {"success": False, "error": "unknown job"})
+                else:
+                    self._send_json(200, {"success": True, "status": "cancelled"})
+            return
+
+        self._send_json(404, {"error": f"no stub route for DELETE {path}"})
+
+    def _extract_status(self, job_id: str) -> None:
+        with self.state.lock:
+            job = self.state.jobs.get(job_id)
+            if job is not None:
+                job["polls"] += 1
+        if job is None:
+            self._send_json(404, {"success": False, "error": f"unknown job {job_id}"})
+            return
+        if job.get("cancelled"):
+            self._send_json(200, {"success": True, "status": "cancelled"})
+            return
+        if job["polls"] <= self.state.config.polls_until_complete:
+            self._send_json(200, {"success": True, "status": "processing"})
+            return
+
+        articles = [
+            self.state.extract_articles[url]
+            for url in job["urls"]
+            if url in self.state.extract_articles
+        ]
+        self._send_json(
+            200,
+            {"success": True, "status": "completed", "data": {"result": articles}},
+        )
+
+    def _gemini(self, payload: Dict[str, Any]) -> None:
+        prompt = " ".join(
+            part.get("text", "")
+            for content in payload.get("contents", [])
+            for part in content.get("parts", [])
+        )
+        if "Counterpoint agent" in prompt:
+            text = json.dumps(self.state.gemini_counterpoints, ensure_ascii=False)
+        else:
+            text = json.dumps(self.state.gemini_candidates, ensure_ascii=False)
+
+        # Rough token estimate so token metrics have realistic magnitudes.
+        prompt_tokens = max(1, len(prompt) // 4)
+        output_tokens = max(1, len(text) // 4)
+        time.sleep(self.state.config.gemini_token_latency * prompt_tokens / 1000)
+        self._send_json(
+            200,
+            {
+                "candidates": [
+                    {
+                        "content": {"role": "model", "parts": [{"text": text}]},
+                        "finishReason": "STOP",
+                        "index": 0,
+                    }
+                ],
+                "usageMetadata": {
+                    "promptTokenCount": prompt_tokens,
+                    "candidatesTokenCount": output_tokens,
+                    "totalTokenCount": prompt_tokens + output_tokens,
+                },
+            },
+        )
+
+
+def make_server(config: StubConfig, host: str = "127.0.0.1", port: int = 0) -> Tuple[ThreadingHTTPServer, StubState]:
+    state = StubState.from_fixtures(config)
+    handler = type("BoundStubHandler", (StubHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server, state
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded Firecrawl/Gemini responses.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument(
+        "--gemini-token-latency",
+        type=float,
+        default=0.0,
+        help="extra seconds per 1000 Gemini prompt tokens (larger prompts answer later)",
+    )
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--failure-status", type=int, default=500)
+    parser.add_argument("--polls-until-complete", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--fixtures", default=str(FIXTURES_DIR))
+    args = parser.parse_args(argv)
+
+    config = StubConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        gemini_token_latency=args.gemini_token_latency,
+        failure_rate=args.failure_rate,
+        failure_status=args.failure_status,
+        polls_until_complete=args.polls_until_complete,
+        seed=args.seed,
+        fixtures_dir=Path(args.fixtures),
+    )
+    server, _ = make_server(config, host=args.host, port=args.port)
+    host, port = server.server_address[:2]
+    # First stdout line is machine-readable so a parent process can find the port.
+    print(f"http://{host}:{port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
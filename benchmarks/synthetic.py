@@ -0,0 +1,268 @@
+"""
+Synthetic, schema-valid workloads for scaling tests of the Critic and Counterpoint.
+
+Everything is deterministic for a given SyntheticConfig (seeded RNG), so two
+runs at the same size produce identical inputs.
+
+  from benchmarks.synthetic import SyntheticConfig, generate_workload
+  w = generate_workload(SyntheticConfig(articles=200, claims_per_article=4))
+  w.pattern_analysis, w.candidates, w.critic, w.raw_counterpoints
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from agents.critic.schemas.critic_schema import (
+    CriticResult,
+    ImplicationChain,
+    ImplicationStep,
+)
+from agents.pattern_analyzer.schemas.pattern_analyzer_schema import (
+    ArticleAnalysis,
+    Claim,
+    PatternAnalysisResult,
+)
+
+# Free-text modalities as Firecrawl returns them, grouped by the class
+# classify_modality is expected to map them to.
+MODALITY_SAMPLES: Dict[str, List[str]] = {
+    "affirmation": ["reports", "Factual reporting", "stated", "claims", "reported by officials"],
+    "denial": ["denies", "refuted", "officially denied", "false according to ministry"],
+    "speculation": ["may have", "allegedly", "suggests", "might", "possibly linked"],
+}
+
+SOURCE_CLASSES = ["mainstream", "state_media", "partisan", "unknown"]
+COUNTRIES = ["India", "USA", "UK", "China", "France", "Hong Kong", "Australia"]
+COUNTERPOINT_TYPES = [
+    "subject_denial",
+    "alternative_explanation",
+    "scope_limitation",
+    "methodological_caveat",
+    "value_judgment",
+]
+
+
+@dataclass
+class SyntheticConfig:
+    articles: int = 5
+    claims_per_article: int = 1
+    # Distinct "topic" words shared across articles vs. words private to one article.
+    shared_vocabulary: int = 200
+    private_vocabulary: int = 50
+    # Probability that a claim word comes from the shared pool (drives match rate).
+    vocabulary_overlap: float = 0.6
+    words_per_claim: int = 14
+    # Relative weights of affirmation / denial / speculation modalities.
+    modality_mix: Dict[str, float] = field(
+        default_factory=lambda: {"affirmation": 0.6, "denial": 0.15, "speculation": 0.25}
+    )
+    # Defaults scale with articles when left at 0.
+    candidates: int = 0
+    counterpoints: int = 0
+    steps_per_chain: int = 1
+    # Share of raw counterpoints that _clean_and_validate_counterpoints should reject.
+    invalid_counterpoint_ratio: float = 0.2
+    seed: int = 7
+
+
+@dataclass
+class SyntheticWorkload:
+    config: SyntheticConfig
+    pattern_analysis: PatternAnalysisResult
+    candidates: List[Dict[str, str]]
+    critic: CriticResult
+    allowed_urls: List[str]
+    raw_counterpoints: List[Dict[str, Any]]
+
+    @property
+    def claim_count(self) -> int:
+        return sum(len(a.key_claims) for a in self.pattern_analysis.analyzed_articles)
+
+
+def _words(prefix: str, n: int) -> List[str]:
+    return [f"{prefix}{i}" for i in range(n)]
+
+
+def _pick_modality(rng: random.Random, mix: Dict[str, float]) -> str:
+    kinds = list(mix)
+    kind = rng.choices(kinds, weights=[mix[k] for k in kinds])[0]
+    return rng.choice(MODALITY_SAMPLES.get(kind, MODALITY_SAMPLES["speculation"]))
+
+
+def _sentence(
+    rng: random.Random,
+    shared: List[str],
+    private: List[str],
+    cfg: SyntheticConfig,
+) -> str:
+    words = [
+        rng.choice(shared) if rng.random() < cfg.vocabulary_overlap else rng.choice(private)
+        for _ in range(cfg.words_per_claim)
+    ]
+    return " ".join(words).capitalize() + "."
+
+
+def generate_pattern_analysis(cfg: SyntheticConfig, rng: random.Random) -> PatternAnalysisResult:
+    shared = _words("topic", cfg.shared_vocabulary)
+    articles: List[ArticleAnalysis] = []
+    for a in range(cfg.articles):
+        private = _words(f"a{a}w", cfg.private_vocabulary)
+        claims = [
+            Claim(
+                text=_sentence(rng, shared, private, cfg),
+                modality=_pick_modality(rng, cfg.modality_mix),
+                blame_target=" ".join(rng.sample(shared, 2)),
+                evidence=_sentence(rng, shared, private, cfg),
+            )
+            for _ in range(cfg.claims_per_article)
+        ]
+        articles.append(
+            ArticleAnalysis(
+                url=f"https://outlet{a % 97}.example/{a}/story",
+                source_name=f"Outlet {a % 97}",
+                publish_date=f"{1 + a % 28:02d}-{1 + a % 12:02d}-2025",
+                source_type=rng.choice(["news", "web"]),
+                title=_sentence(rng, shared, private, cfg),
+                source_country=rng.choice(COUNTRIES),
+                source_class=rng.choice(SOURCE_CLASSES),
+                key_claims=claims,
+                narrative_summary=" ".join(_sentence(rng, shared, private, cfg) for _ in range(3)),
+                statistics=f"{rng.randint(1, 999)} units reported.",
+                stance=rng.choice(["Neutral", "Critical", "Supportive"]),
+                bias_indicators="Synthetic article.",
+            )
+        )
+    return PatternAnalysisResult(statement="Synthetic scaling statement", analyzed_articles=articles)
+
+
+def generate_candidates(
+    pa: PatternAnalysisResult,
+    n: int,
+    rng: random.Random,
+) -> List[Dict[str, str]]:
+    """
+    Premise/consequence pairs drawn from real claim texts (with a little word
+    dropout) so verification finds a realistic mix of matches and misses.
+    """
+    texts = [c.text for a in pa.analyzed_articles for c in a.key_claims]
+    if not texts:
+        return []
+
+    def _perturb(text: str) -> str:
+        words = text.rstrip(".").split()
+        kept = [w for w in words if rng.random() > 0.2] or words
+        return " ".join(kept)
+
+    return [
+        {
+            "premise": _perturb(rng.choice(texts)),
+            "consequence": _perturb(rng.choice(texts)),
+            "reasoning": "synthetic candidate",
+        }
+        for _ in range(n)
+    ]
+
+
+def generate_critic_result(
+    pa: PatternAnalysisResult,
+    candidates: List[Dict[str, str]],
+    steps_per_chain: int,
+    rng: random.Random,
+) -> CriticResult:
+    urls = [a.url for a in pa.analyzed_articles]
+    chains: List[ImplicationChain] = []
+    for i in range(0, len(candidates), max(1, steps_per_chain)):
+        group = candidates[i : i + steps_per_chain]
+        steps = [
+            ImplicationStep(
+                premise=c["premise"],
+                conclusion=c["consequence"],
+                supporting_sources=rng.sample(urls, min(len(urls), rng.randint(0, 3))),
+                refuting_sources=rng.sample(urls, min(len(urls), rng.randint(0, 1))),
+                assessment="synthetic",
+            )
+            for c in group
+        ]
+        chains.append(
+            ImplicationChain(
+                description=f"Synthetic chain {len(chains) + 1}",
+                steps=steps,
+                overall_assessment=rng.choice(
+                    ["consistent", "partially supported", "contradicted", "speculative"]
+                ),
+            )
+        )
+    return CriticResult(
+        statement=pa.statement,
+        high_level_summary="Synthetic Critic result.",
+        implication_chains=chains,
+    )
+
+
+def generate_raw_counterpoints(
+    critic: CriticResult,
+    allowed_urls: List[str],
+    n: int,
+    invalid_ratio: float,
+    rng: random.Random,
+) -> List[Dict[str, Any]]:
+    """
+    LLM-shaped counterpoint dicts; roughly `invalid_ratio` of them carry one
+    defect (bad index, unknown type, foreign URL, empty text, bad strength).
+    """
+    chains = critic.implication_chains
+    raw: List[Dict[str, Any]] = []
+    for i in range(n):
+        chain_idx = rng.randrange(len(chains)) if chains else 0
+        step_count = len(chains[chain_idx].steps) if chains else 1
+        item: Dict[str, Any] = {
+            "id": f"cp_{i + 1}",
+            "target_chain_index": chain_idx,
+            "target_step_index": rng.randrange(max(1, step_count)),
+            "type": rng.choice(COUNTERPOINT_TYPES),
+            "text": f"Synthetic counterpoint {i + 1}.",
+            "based_on_sources": rng.sample(allowed_urls, min(len(allowed_urls), rng.randint(0, 4))),
+            "uses_general_knowledge": rng.random() < 0.3,
+            "strength": rng.choice(["minor", "moderate", "strong"]),
+            "notes": "",
+        }
+        if rng.random() < invalid_ratio:
+            defect = rng.randrange(5)
+            if defect == 0:
+                item["target_chain_index"] = len(chains) + 5
+            elif defect == 1:
+                item["type"] = "not_a_type"
+            elif defect == 2:
+                item["based_on_sources"] = ["https://not-allowed.example/x"]
+            elif defect == 3:
+                item["text"] = ""
+            else:
+                item["strength"] = "overwhelming"
+        raw.append(item)
+    return raw
+
+
+def generate_workload(cfg: SyntheticConfig) -> SyntheticWorkload:
+    rng = random.Random(cfg.seed)
+    pa = generate_pattern_analysis(cfg, rng)
+    candidates = generate_candidates(pa, cfg.candidates or cfg.articles, rng)
+    critic = generate_critic_result(pa, candidates, cfg.steps_per_chain, rng)
+    allowed_urls = list(dict.fromkeys(a.url for a in pa.analyzed_articles))
+    raw_counterpoints = generate_raw_counterpoints(
+        critic,
+        allowed_urls,
+        cfg.counterpoints or 2 * max(1, len(critic.implication_chains)),
+        cfg.invalid_counterpoint_ratio,
+        rng,
+    )
+    return SyntheticWorkload(
+        config=cfg,
+        pattern_analysis=pa,
+        candidates=candidates,
+        critic=critic,
+        allowed_urls=allowed_urls,
+        raw_counterpoints=raw_counterpoints,
+    )
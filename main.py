@@ -1,6 +1,25 @@
+import sys
+
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from pipeline.batch import main as batch_main
+
+        sys.exit(batch_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "incremental":
+        from pipeline.incremental import main as incremental_main
+
+        sys.exit(incremental_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "speculative":
+        from pipeline.speculative import main as speculative_main
+
+        sys.exit(speculative_main(sys.argv[2:]))
+
     raise RuntimeError(
-        "Local execution now uses ADK CLI: run `adk run` or `adk web` instead of python main.py."
+        "Local execution now uses ADK CLI: run `adk run` or `adk web` instead of python main.py "
+        "(or `python main.py batch <statements.jsonl>` for bulk runs, "
+        "`python main.py incremental \"<statement>\"` to update a previous run, "
+        "`python main.py speculative \"<statement>\"` to start downstream stages early)."
     )
 
 
@@ -0,0 +1,581 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Tuple
+
+from agents.critic.schemas.critic_schema import CriticResult
+from agents.pattern_analyzer.schemas.pattern_analyzer_schema import ArticleAnalysis, PatternAnalysisResult
+from agents.pattern_analyzer.tools.dates import format_timestamp, parse_publish_date
+from agents.pattern_analyzer.tools.modality import claim_modality
+from agents.tokenization import STOPWORDS, normalize, stem
+from telemetry import get_logger, incr, observe, timed
+
+logger = get_logger("memory.claim_archive")
+
+DEFAULT_ARCHIVE_PATH = os.getenv("TRUTHLENS_CLAIM_ARCHIVE_PATH", "./memory/claim_archive.db")
+
+# Query terms used per full-text search; the longest (most specific) are kept.
+MAX_QUERY_TERMS = 8
+# Stems this long are matched as prefixes ("sanction*"); shorter ones exactly.
+MIN_PREFIX_TERM = 4
+# Version of the stems indexed for search; bump it when stem() changes, so
+# existing archives are re-indexed on open.
+STEMS_VERSION = 1
+# Terms combined pairwise by the fallback query (15 pairs for 6 terms).
+MAX_PAIR_TERMS = 6
+
+_WORD_RE = re.compile(r"\w+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS statements (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    text TEXT NOT NULL,
+    first_archived REAL NOT NULL,
+    last_archived REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    statement_id INTEGER NOT NULL,
+    digest BLOB NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    publish_ts REAL,
+    archived_at REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_url ON articles (url);
+CREATE TABLE IF NOT EXISTS claims (
+    id INTEGER PRIMARY KEY,
+    statement_id INTEGER NOT NULL,
+    article_id INTEGER NOT NULL,
+    digest BLOB NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    text TEXT NOT NULL,
+    modality TEXT,
+    modality_class TEXT,
+    blame_target TEXT,
+    evidence TEXT,
+    publish_ts REAL,
+    archived_at REAL NOT NULL,
+    stems TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS claims_url ON claims (url);
+CREATE INDEX IF NOT EXISTS claims_blame_target ON claims (blame_target COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS claims_publish_ts ON claims (publish_ts);
+CREATE TABLE IF NOT EXISTS chains (
+    id INTEGER PRIMARY KEY,
+    statement_id INTEGER NOT NULL,
+    digest BLOB NOT NULL UNIQUE,
+    description TEXT NOT NULL,
+    overall_assessment TEXT NOT NULL,
+    text TEXT NOT NULL,
+    archived_at REAL NOT NULL,
+    payload TEXT NOT NULL,
+    stems TEXT NOT NULL DEFAULT ''
+);
+"""
+# Full-text indexes; queries match the `stems` column (see fts_query).
+_FTS = {
+    "claims_fts": "CREATE VIRTUAL TABLE IF NOT EXISTS claims_fts USING fts5 ("
+    "text, blame_target, stems, content='claims', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "chains_fts": "CREATE VIRTUAL TABLE IF NOT EXISTS chains_fts USING fts5 ("
+    "text, stems, content='chains', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+}
+
+
+def archive_enabled() -> bool:
+    return os.getenv("TRUTHLENS_CLAIM_ARCHIVE", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def statement_key(statement: str) -> str:
+    # Same key as PatternAnalysisMemory.
+    return hashlib.sha256(statement.strip().encode("utf-8")).hexdigest()
+
+
+def _digest(*parts: Any) -> bytes:
+    return hashlib.blake2b(json.dumps(parts, ensure_ascii=False).encode("utf-8"), digest_size=16).digest()
+
+
+def stems(text: str) -> str:
+    """
+    The words of `text` as stems, as indexed in the `stems` FTS column.
+    """
+    return " ".join(stem(w) for w in _WORD_RE.findall(normalize(text)))
+
+
+def fts_query(text: str, match_all: bool = True) -> Optional[str]:
+    """
+    An FTS5 query for `text` against the indexed stems: its informative
+    words' stems as terms ("sanctions" -> sanction*, "died" -> die), all of
+    them (or, with match_all=False, any two of the MAX_PAIR_TERMS longest).
+    None if nothing is left after stopword removal, or if match_all=False
+    and fewer than two terms are.
+    """
+    words = {w for w in _WORD_RE.findall(normalize(text)) if w not in STOPWORDS}
+    terms = [
+        f'"{t}"*' if len(t) >= MIN_PREFIX_TERM else f'"{t}"'
+        for t in sorted({stem(w) for w in words}, key=lambda t: (-len(t), t))[:MAX_QUERY_TERMS]
+    ]
+    if match_all:
+        return f"stems : ({' AND '.join(terms)})" if terms else None
+    # Two shared terms rather than one: an any-word query ranks every claim
+    # containing one common word, which costs ~4x more on a million claims.
+    pairs = [f"({a} AND {b})" for a, b in itertools.combinations(terms[:MAX_PAIR_TERMS], 2)]
+    return f"stems : ({' OR '.join(pairs)})" if pairs else None
+
+
+@dataclass
+class ArchivedClaim:
+    statement: str
+    url: str
+    text: str
+    modality_class: Optional[str]
+    blame_target: Optional[str]
+    publish_ts: Optional[float]
+    archived_at: float
+    rank: float = 0.0               # bm25 score of a text query; lower is better
+
+
+@dataclass
+class ArchivedChain:
+    statement: str
+    description: str
+    overall_assessment: str
+    archived_at: float
+    rank: float = 0.0
+
+
+class ClaimArchive:
+    """
+    Every Claim, ArticleAnalysis and ImplicationChain produced, across all
+    statements, in one SQLite file (TRUTHLENS_CLAIM_ARCHIVE_PATH).
+
+    Unlike the memory/*_store.json files, nothing is ever replaced: each
+    run's articles, claims and chains are appended, de-duplicated per
+    statement by content digest. Claim texts and blame targets, and chain
+    steps, are indexed with FTS5 (with their stems, which searches match);
+    URL, blame_target and publish time have
+    B-tree indexes. Writes run in BEGIN IMMEDIATE transactions and the file
+    is in WAL mode, so several processes can archive and search at once.
+    """
+
+    def __init__(self, path: Path | str | None = None) -> None:
+        self.path = Path(path or DEFAULT_ARCHIVE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._index_stems()
+
+    def _index_stems(self) -> None:
+        """
+        Create the full-text indexes, first (re)computing the stems of
+        archives indexed before STEMS_VERSION.
+        """
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] >= STEMS_VERSION:
+            for ddl in _FTS.values():
+                self._conn.execute(ddl)
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._conn.execute("PRAGMA user_version").fetchone()[0] < STEMS_VERSION:
+                    reindexed = 0
+                    with timed("claim_archive.reindex_ms"):
+                        for table in ("claims", "chains"):
+                            columns = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+                            if "stems" not in columns:
+                                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN stems TEXT NOT NULL DEFAULT ''")
+                            rows = [(stems(text), rid) for rid, text in self._conn.execute(f"SELECT id, text FROM {table}")]
+                            self._conn.executemany(f"UPDATE {table} SET stems = ? WHERE id = ?", rows)
+                            reindexed += len(rows)
+                        for name, ddl in _FTS.items():
+                            self._conn.execute(f"DROP TABLE IF EXISTS {name}")
+                            self._conn.execute(ddl)
+                            self._conn.execute(f"INSERT INTO {name} ({name}) VALUES ('rebuild')")
+                        self._conn.execute(f"PRAGMA user_version = {STEMS_VERSION}")
+                    if reindexed:
+                        logger.info("Re-indexed %d archived claims and chains (stems version %d).", reindexed, STEMS_VERSION)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # --- writes ------------------------------------------------------------
+
+    def _statement_id(self, statement: str, now: float) -> int:
+        key = statement_key(statement)
+        self._conn.execute(
+            "INSERT INTO statements (key, text, first_archived, last_archived) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET last_archived = excluded.last_archived",
+            (key, statement.strip(), now, now),
+        )
+        return self._conn.execute("SELECT id FROM statements WHERE key = ?", (key,)).fetchone()[0]
+
+    def _max_id(self, table: str) -> int:
+        return self._conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+
+    def _write(self, fn, *args: Any) -> int:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                added = fn(*args)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return added
+
+    def _add_articles(self, statement: str, articles: Sequence[ArticleAnalysis]) -> int:
+        now = time.time()
+        sid = self._statement_id(statement, now)
+        first_claim = self._max_id("claims")
+        added = 0
+        for article in articles:
+            payload = article.model_dump(exclude={"key_claims"})
+            publish_ts = article.publish_ts
+            if publish_ts is None and article.publish_date:
+                publish_ts = parse_publish_date(article.publish_date)
+            digest = _digest(sid, payload)
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO articles (statement_id, digest, url, publish_ts, archived_at, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (sid, digest, article.url, publish_ts, now, json.dumps(payload, ensure_ascii=False)),
+            )
+            if cur.rowcount:
+                article_id = cur.lastrowid
+            else:
+                article_id = self._conn.execute("SELECT id FROM articles WHERE digest = ?", (digest,)).fetchone()[0]
+            claims = [
+                (
+                    sid,
+                    article_id,
+                    _digest(sid, article.url, claim.model_dump()),
+                    article.url,
+                    claim.text,
+                    claim.modality,
+                    claim_modality(claim),
+                    claim.blame_target,
+                    claim.evidence,
+                    claim.publish_ts if claim.publish_ts is not None else publish_ts,
+                    now,
+                    stems(claim.text),
+                )
+                for claim in article.key_claims
+                if claim.text
+            ]
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO claims (statement_id, article_id, digest, url, text, modality, "
+                "modality_class, blame_target, evidence, publish_ts, archived_at, stems) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                claims,
+            )
+            added += self._conn.total_changes - before
+        # Rows are only ever appended, so the new claims are those above the old maximum id.
+        self._conn.execute(
+            "INSERT INTO claims_fts (rowid, text, blame_target, stems) "
+            "SELECT id, text, COALESCE(blame_target, ''), stems FROM claims WHERE id > ?",
+            (first_claim,),
+        )
+        return added
+
+    def add_pattern_analysis(self, pa: PatternAnalysisResult) -> int:
+        """
+        Archive the articles and claims of `pa`; returns the number of claims
+        not archived before for this statement.
+        """
+        with timed("claim_archive.write_ms", kind="pattern_analysis"):
+            added = self._write(self._add_articles, pa.statement, pa.analyzed_articles)
+        incr("claim_archive.claims_added", float(added))
+        return added
+
+    def _add_chains(self, result: CriticResult) -> int:
+        now = time.time()
+        sid = self._statement_id(result.statement, now)
+        first_chain = self._max_id("chains")
+        rows = []
+        for chain in result.implication_chains:
+            payload = chain.model_dump()
+            text = " ".join(f"{s.premise} {s.conclusion}" for s in chain.steps) or chain.description
+            rows.append(
+                (
+                    sid,
+                    _digest(sid, payload),
+                    chain.description,
+                    chain.overall_assessment,
+                    text,
+                    now,
+                    json.dumps(payload, ensure_ascii=False),
+                    stems(text),
+                )
+            )
+        before = self._conn.total_changes
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO chains (statement_id, digest, description, overall_assessment, text, "
+            "archived_at, payload, stems) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        added = self._conn.total_changes - before
+        self._conn.execute(
+            "INSERT INTO chains_fts (rowid, text, stems) SELECT id, text, stems FROM chains WHERE id > ?",
+            (first_chain,),
+        )
+        return added
+
+    def add_critic_result(self, result: CriticResult) -> int:
+        """
+        Archive the implication chains of `result`; returns the number not
+        archived before for this statement.
+        """
+        with timed("claim_archive.write_ms", kind="critic"):
+            added = self._write(self._add_chains, result)
+        incr("claim_archive.chains_added", float(added))
+        return added
+
+    # --- queries -----------------------------------------------------------
+
+    def _existing_statement_id(self, statement: Optional[str]) -> Optional[int]:
+        if not statement:
+            return None
+        row = self._conn.execute("SELECT id FROM statements WHERE key = ?", (statement_key(statement),)).fetchone()
+        return row[0] if row else None
+
+    def _query_claims(
+        self,
+        match: Optional[str],
+        url: Optional[str],
+        blame_target: Optional[str],
+        since: Optional[float],
+        until: Optional[float],
+        exclude_id: Optional[int],
+        limit: int,
+    ) -> List[ArchivedClaim]:
+        where: List[str] = []
+        params: List[Any] = []
+        if match:
+            source = "claims_fts JOIN claims c ON c.id = claims_fts.rowid"
+            rank, order = "bm25(claims_fts)", "bm25(claims_fts)"
+            where.append("claims_fts MATCH ?")
+            params.append(match)
+        else:
+            source = "claims c"
+            # With a date filter the publish_ts index yields rows in order, so LIMIT stops early.
+            rank, order = "0.0", "c.publish_ts DESC" if since is not None or until is not None else "c.id DESC"
+        if url:
+            where.append("c.url = ?")
+            params.append(url)
+        if blame_target:
+            where.append("c.blame_target = ? COLLATE NOCASE")
+            params.append(blame_target)
+        if since is not None:
+            where.append("c.publish_ts >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("c.publish_ts < ?")
+            params.append(until)
+        if exclude_id is not None:
+            where.append("c.statement_id != ?")
+            params.append(exclude_id)
+        sql = (
+            f"SELECT s.text, c.url, c.text, c.modality_class, c.blame_target, c.publish_ts, c.archived_at, {rank} "
+            f"FROM {source} JOIN statements s ON s.id = c.statement_id"
+            + (f" WHERE {' AND '.join(where)}" if where else "")
+            + f" ORDER BY {order} LIMIT ?"
+        )
+        params.append(limit)
+        return [ArchivedClaim(*row) for row in self._conn.execute(sql, params)]
+
+    def search_claims(
+        self,
+        text: Optional[str] = None,
+        url: Optional[str] = None,
+        blame_target: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        exclude_statement: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[ArchivedClaim]:
+        """
+        Archived claims matching every given filter: full-text `text` (best
+        matches first; claims containing all of its informative words or,
+        if there are none, two of them), exact source `url`, `blame_target`
+        (case-insensitive) and publish time in [since, until) as UTC epoch
+        seconds. Claims archived for `exclude_statement` are left out. Without
+        `text`, the most recently published (with a date filter) or archived
+        matches come first.
+        """
+        start = time.perf_counter()
+        with self._lock:
+            exclude_id = self._existing_statement_id(exclude_statement)
+            hits: List[ArchivedClaim] = []
+            if text is None:
+                hits = self._query_claims(None, url, blame_target, since, until, exclude_id, limit)
+            else:
+                # Two-word matches are only worth their (much larger) scan when no claim has every word.
+                for match_all in (True, False):
+                    match = fts_query(text, match_all)
+                    if match is None:
+                        break
+                    hits = self._query_claims(match, url, blame_target, since, until, exclude_id, limit)
+                    if hits:
+                        break
+        observe("claim_archive.search_ms", (time.perf_counter() - start) * 1000, kind="claims")
+        return hits
+
+    def search_chains(self, text: str, exclude_statement: Optional[str] = None, limit: int = 20) -> List[ArchivedChain]:
+        """
+        Archived implication chains whose steps mention the informative words of `text`.
+        """
+        match = fts_query(text, match_all=True)
+        if match is None:
+            return []
+        with self._lock:
+            exclude_id = self._existing_statement_id(exclude_statement)
+            rows = self._conn.execute(
+                "SELECT s.text, c.description, c.overall_assessment, c.archived_at, bm25(chains_fts) "
+                "FROM chains_fts JOIN chains c ON c.id = chains_fts.rowid JOIN statements s ON s.id = c.statement_id "
+                "WHERE chains_fts MATCH ? AND c.statement_id != ? ORDER BY bm25(chains_fts) LIMIT ?",
+                (match, exclude_id if exclude_id is not None else -1, limit),
+            ).fetchall()
+        return [ArchivedChain(*row) for row in rows]
+
+    def article_history(self, url: str) -> List[Tuple[str, float, ArticleAnalysis]]:
+        """
+        (statement, archived_at, article) for every archived analysis of `url`, oldest first.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT s.text, a.archived_at, a.payload, a.id FROM articles a "
+                "JOIN statements s ON s.id = a.statement_id WHERE a.url = ? ORDER BY a.id",
+                (url,),
+            ).fetchall()
+            history = []
+            for statement, archived_at, payload, article_id in rows:
+                claims = self._conn.execute(
+                    "SELECT text, modality, modality_class, blame_target, evidence, publish_ts "
+                    "FROM claims WHERE article_id = ? ORDER BY id",
+                    (article_id,),
+                ).fetchall()
+                fields = json.loads(payload)
+                fields["key_claims"] = [
+                    dict(zip(("text", "modality", "modality_class", "blame_target", "evidence", "publish_ts"), c))
+                    for c in claims
+                ]
+                history.append((statement, archived_at, ArticleAnalysis(**fields)))
+        return history
+
+    def counts(self) -> dict:
+        with self._lock:
+            return {
+                table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("statements", "articles", "claims", "chains")
+            }
+
+
+# Global singleton for this process
+_ARCHIVE: Optional[ClaimArchive] = None
+_ARCHIVE_LOCK = threading.Lock()
+
+
+def get_claim_archive() -> Optional[ClaimArchive]:
+    """
+    The shared archive, or None when TRUTHLENS_CLAIM_ARCHIVE=0.
+    """
+    global _ARCHIVE
+    if not archive_enabled():
+        return None
+    with _ARCHIVE_LOCK:
+        if _ARCHIVE is None:
+            _ARCHIVE = ClaimArchive()
+    return _ARCHIVE
+
+
+def archive_pattern_analysis(pa: PatternAnalysisResult) -> None:
+    """
+    Add `pa` to the shared archive, if enabled. Archive errors are logged,
+    never raised: the archive must not fail a run.
+    """
+    archive = get_claim_archive()
+    if archive is None:
+        return
+    try:
+        archive.add_pattern_analysis(pa)
+    except sqlite3.Error as e:
+        logger.warning("Could not archive pattern analysis: %s", e)
+
+
+def archive_critic_result(result: CriticResult) -> None:
+    """
+    Add the implication chains of `result` to the shared archive, if enabled.
+    """
+    archive = get_claim_archive()
+    if archive is None:
+        return
+    try:
+        archive.add_critic_result(result)
+    except sqlite3.Error as e:
+        logger.warning("Could not archive critic result: %s", e)
+
+
+def _parse_day(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    ts = parse_publish_date(value)
+    if ts is None:
+        raise SystemExit(f"Unreadable date: {value!r}")
+    return ts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Search the TruthLens claim archive.")
+    parser.add_argument("text", nargs="?", help="claim text to search for")
+    parser.add_argument("--url")
+    parser.add_argument("--blame-target")
+    parser.add_argument("--since", help="earliest publish date, e.g. 2025-05-01")
+    parser.add_argument("--until", help="publish date to stop before")
+    parser.add_argument("--chains", action="store_true", help="search implication chains instead of claims")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--archive", help="archive path (default TRUTHLENS_CLAIM_ARCHIVE_PATH)")
+    args = parser.parse_args(argv)
+
+    archive = ClaimArchive(args.archive)
+    if args.chains:
+        if not args.text:
+            parser.error("--chains needs a search text")
+        for chain in archive.search_chains(args.text, limit=args.limit):
+            print(json.dumps(asdict(chain), ensure_ascii=False))
+        return 0
+    hits = archive.search_claims(
+        text=args.text,
+        url=args.url,
+        blame_target=args.blame_target,
+        since=_parse_day(args.since),
+        until=_parse_day(args.until),
+        limit=args.limit,
+    )
+    for hit in hits:
+        row = asdict(hit)
+        row["publish_date"] = format_timestamp(hit.publish_ts) if hit.publish_ts is not None else None
+        print(json.dumps(row, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,6 +3,8 @@ import os
 from typing import Any, Dict
 
 from agents.critic.schemas.critic_schema import CriticResult
+from memory.write_behind import persist_store, read_pending_store
+from telemetry import timed
 
 
 class CriticMemory:
@@ -22,17 +24,20 @@ class CriticMemory:
         os.makedirs(os.path.dirname(self.path), exist_ok=True)
 
     def _read_store(self) -> Dict[str, Any]:
+        pending = read_pending_store(self.path)
+        if pending is not None:
+            return pending
         if not os.path.exists(self.path):
             return {}
         try:
             with open(self.path, "r", encoding="utf-8") as f:
-                return json.load(f)
+                with timed("store.read_ms", store="critic"):
+                    return json.load(f)
         except json.JSONDecodeError:
             return {}
 
     def _write_store(self, store: Dict[str, Any]) -> None:
-        with open(self.path, "w", encoding="utf-8") as f:
-            json.dump(store, f, indent=2, ensure_ascii=False)
+        persist_store(self.path, store)
 
     def save_result(self, result: CriticResult) -> None:
         """
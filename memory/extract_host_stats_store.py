@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from memory.write_behind import persist_store, read_pending_store, store_lock
+from telemetry import timed
+
+DEFAULT_HOST_STATS_PATH = os.getenv(
+    "TRUTHLENS_HOST_STATS_PATH",
+    "./memory/extract_host_stats_store.json",
+)
+
+# Weight of the newest observation in the latency moving average.
+LATENCY_EWMA_ALPHA = 0.3
+# Weight of the newest job in the failure-rate moving average, so a host that
+# recovers stops being treated as flaky after a few good jobs.
+FAILURE_EWMA_ALPHA = 0.3
+
+
+def _ewma(alpha: float, value: float, previous: Optional[float]) -> float:
+    return value if previous is None else alpha * value + (1 - alpha) * previous
+
+
+class ExtractHostStatsMemory:
+    """
+    JSON-backed per-host extraction history used by the adaptive batcher.
+
+    One entry per host:
+      {"attempts": int, "failures": int, "failure_rate_ewma": float,
+       "latency_ewma_ms": float, "probe_ok": int, "probe_blocked": int,
+       "last_probe_reason": str, "updated_at": float}
+
+    Latency is the duration of the completed extract jobs the host's URLs
+    were in, so a host that keeps landing in slow jobs drifts upwards; failed
+    or timed-out jobs count as failures only. failure_rate_ewma is the share
+    of the host's URLs each job failed on, averaged the same way; attempts
+    and failures are lifetime totals. The probe counters
+    come from the prefetch classifier and drive its learned allow/blocklist.
+    """
+
+    def __init__(self, path: Path | str | None = None) -> None:
+        self.path = Path(path or DEFAULT_HOST_STATS_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _read_store(self) -> Dict[str, Any]:
+        pending = read_pending_store(self.path)
+        if pending is not None:
+            return pending
+        if not self.path.exists():
+            return {}
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                with timed("store.read_ms", store="extract_host_stats"):
+                    return json.load(f)
+        except json.JSONDecodeError:
+            return {}
+
+    def _write_store(self, data: Dict[str, Any]) -> None:
+        persist_store(self.path, data)
+
+    def all_stats(self) -> Dict[str, Dict[str, Any]]:
+        return self._read_store()
+
+    def get(self, host: str) -> Optional[Dict[str, Any]]:
+        return self._read_store().get(host)
+
+    @staticmethod
+    def _entry(store: Dict[str, Any], host: str, now: float) -> Dict[str, Any]:
+        entry = store.setdefault(host, {"updated_at": now})
+        for key, default in (
+            ("attempts", 0),
+            ("failures", 0),
+            ("latency_ewma_ms", None),
+            ("probe_ok", 0),
+            ("probe_blocked", 0),
+        ):
+            entry.setdefault(key, default)
+        return entry
+
+    def record(self, outcomes: Dict[str, Dict[str, int]], latency_ms: Optional[float]) -> None:
+        """
+        Fold one extract job into the history.
+
+        `outcomes` maps host -> {"ok": n, "failed": m} for the URLs of that
+        host in the job; `latency_ms` is the job duration (None if the job
+        failed or timed out, which says nothing about the host's speed).
+        """
+        if not outcomes:
+            return
+        now = time.time()
+        with store_lock(self.path):
+            store = self._read_store()
+            for host, counts in outcomes.items():
+                entry = self._entry(store, host, now)
+                total = counts.get("ok", 0) + counts.get("failed", 0)
+                if total:
+                    # Entries from before the moving average start from their lifetime rate.
+                    previous = entry.get("failure_rate_ewma")
+                    if previous is None and entry["attempts"]:
+                        previous = entry["failures"] / entry["attempts"]
+                    entry["failure_rate_ewma"] = _ewma(FAILURE_EWMA_ALPHA, counts.get("failed", 0) / total, previous)
+                entry["attempts"] += total
+                entry["failures"] += counts.get("failed", 0)
+                if latency_ms is not None:
+                    entry["latency_ewma_ms"] = _ewma(LATENCY_EWMA_ALPHA, latency_ms, entry.get("latency_ewma_ms"))
+                entry["updated_at"] = now
+            self._write_store(store)
+
+    def record_probe(self, host: str, blocked: bool, reason: Optional[str] = None) -> None:
+        """
+        Count one prefetch probe of `host`: `blocked` when the host itself
+        refused the request (paywall, bot wall), not when a single URL was
+        dead or had the wrong content type.
+        """
+        now = time.time()
+        with store_lock(self.path):
+            store = self._read_store()
+            entry = self._entry(store, host, now)
+            entry["probe_blocked" if blocked else "probe_ok"] += 1
+            if reason:
+                entry["last_probe_reason"] = reason
+            entry["updated_at"] = now
+            self._write_store(store)
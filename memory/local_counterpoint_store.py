@@ -3,6 +3,8 @@ import os
 from typing import Any, Dict, Optional
 
 from agents.counterpoint.schemas.counterpoint_schema import CounterpointResult
+from memory.write_behind import persist_store, read_pending_store
+from telemetry import timed
 
 DEFAULT_COUNTERPOINT_MEMORY_PATH = os.getenv(
     "TRUTHLENS_COUNTERPOINT_MEMORY_PATH",
@@ -21,21 +23,22 @@ class CounterpointMemory:
     def __init__(self, path: str | None = None) -> None:
         self.path = path or DEFAULT_COUNTERPOINT_MEMORY_PATH
         os.makedirs(os.path.dirname(self.path), exist_ok=True)
-        if not os.path.exists(self.path):
-            self._write_store({})
 
     def _read_store(self) -> Dict[str, Any]:
+        pending = read_pending_store(self.path)
+        if pending is not None:
+            return pending
         if not os.path.exists(self.path):
             return {}
         try:
             with open(self.path, "r", encoding="utf-8") as f:
-                return json.load(f)
+                with timed("store.read_ms", store="counterpoint"):
+                    return json.load(f)
         except json.JSONDecodeError:
             return {}
 
     def _write_store(self, store: Dict[str, Any]) -> None:
-        with open(self.path, "w", encoding="utf-8") as f:
-            json.dump(store, f, indent=2, ensure_ascii=False)
+        persist_store(self.path, store)
 
     def save_result(self, result: CounterpointResult) -> None:
         """
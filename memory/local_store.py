@@ -7,6 +7,8 @@ from hashlib import sha256
 from dotenv import load_dotenv
 
 from agents.fact_finder.schemas.fact_finder_schema import FactFinderResult
+from memory.write_behind import persist_store, read_pending_store, store_lock
+from telemetry import timed
 
 load_dotenv()
 
@@ -24,21 +26,22 @@ class LocalFactFinderMemory:
     def __init__(self, path: str | Path | None = None) -> None:
         self.path = Path(path or _DEFAULT_MEMORY_PATH)
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        if not self.path.exists():
-            self._write_store({})
 
     def _read_store(self) -> Dict[str, Any]:
+        pending = read_pending_store(self.path)
+        if pending is not None:
+            return pending
         if not self.path.exists():
             return {}
         with self.path.open("r", encoding="utf-8") as f:
             try:
-                return json.load(f)
+                with timed("store.read_ms", store="fact_finder"):
+                    return json.load(f)
             except json.JSONDecodeError:
                 return {}
 
     def _write_store(self, data: Dict[str, Any]) -> None:
-        with self.path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        persist_store(self.path, data)
 
     @staticmethod
     def _key_for_statement(statement: str) -> str:
@@ -47,10 +50,11 @@ class LocalFactFinderMemory:
 
     def save_result(self, result: FactFinderResult) -> str:
         """Save a FactFinderResult, return the generated key."""
-        store = self._read_store()
-        key = self._key_for_statement(result.statement)
-        store[key] = result.model_dump()
-        self._write_store(store)
+        with store_lock(self.path):
+            store = self._read_store()
+            key = self._key_for_statement(result.statement)
+            store[key] = result.model_dump()
+            self._write_store(store)
         return key
 
     def get_result_by_statement(self, statement: str) -> Optional[FactFinderResult]:
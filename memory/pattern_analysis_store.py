@@ -8,6 +8,8 @@ from typing import Optional
 from pydantic import ValidationError
 
 from agents.pattern_analyzer.schemas.pattern_analyzer_schema import PatternAnalysisResult
+from memory.write_behind import persist_store, read_pending_store, store_lock
+from telemetry import timed
 
 
 DEFAULT_PATTERN_ANALYSIS_MEMORY_PATH = Path("memory/pattern_analysis_store.json")
@@ -24,32 +26,34 @@ class PatternAnalysisMemory:
     def __init__(self, path: Path | str = DEFAULT_PATTERN_ANALYSIS_MEMORY_PATH) -> None:
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        if not self.path.exists():
-            self._write_store({})
 
     def _read_store(self) -> dict:
+        pending = read_pending_store(self.path)
+        if pending is not None:
+            return pending
         if not self.path.exists():
             return {}
         try:
             with self.path.open("r", encoding="utf-8") as f:
-                return json.load(f)
+                with timed("store.read_ms", store="pattern_analysis"):
+                    return json.load(f)
         except json.JSONDecodeError:
             # Corrupted file; reset
             return {}
 
     def _write_store(self, data: dict) -> None:
-        with self.path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        persist_store(self.path, data)
 
     @staticmethod
     def _statement_key(statement: str) -> str:
         return hashlib.sha256(statement.strip().encode("utf-8")).hexdigest()
 
     def save_result(self, result: PatternAnalysisResult) -> None:
-        store = self._read_store()
-        key = self._statement_key(result.statement)
-        store[key] = result.model_dump()
-        self._write_store(store)
+        with store_lock(self.path):
+            store = self._read_store()
+            key = self._statement_key(result.statement)
+            store[key] = result.model_dump()
+            self._write_store(store)
 
     def get_result_by_statement(self, statement: str) -> Optional[PatternAnalysisResult]:
         store = self._read_store()
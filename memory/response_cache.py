@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from telemetry import incr
+
+DEFAULT_TTL_SECONDS = float(os.getenv("TRUTHLENS_RESPONSE_CACHE_TTL_SECONDS", "3600"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("TRUTHLENS_RESPONSE_CACHE_MAX_ENTRIES", "512"))
+
+
+def response_cache_enabled() -> bool:
+    # Off unless asked for: interactive runs should see fresh search results
+    # and completions. The batch runner turns it on (pipeline/batch.py).
+    return os.getenv("TRUTHLENS_RESPONSE_CACHE", "0").strip().lower() not in {
+        "0",
+        "false",
+        "no",
+        "off",
+    }
+
+
+def cache_key(kind: str, payload: Any) -> str:
+    """
+    Stable key for a request payload (dicts are serialized with sorted keys).
+    """
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return f"{kind}:{hashlib.sha256(blob.encode('utf-8')).hexdigest()}"
+
+
+class ResponseCache:
+    """
+    In-process LRU + TTL cache for upstream responses (Firecrawl search and
+    extract results, Gemini completions).
+
+    It is shared by every statement analysed in this process, so a batch run
+    pays for identical requests once. Values are stored as-is; callers must
+    treat them as read-only.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        kind = key.split(":", 1)[0]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        incr("cache.hits" if entry is not None else "cache.misses", cache="response", kind=kind)
+        return entry[1] if entry is not None else None
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Global singleton for this process
+_CACHE = ResponseCache()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    The shared cache, or None unless TRUTHLENS_RESPONSE_CACHE=1.
+    """
+    return _CACHE if response_cache_enabled() else None
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Deque, Dict, Iterable, Optional
+
+from telemetry import get_logger, incr, timed
+
+logger = get_logger("memory.source_registry")
+
+DEFAULT_REGISTRY_PATH = os.getenv("TRUTHLENS_SOURCE_REGISTRY_PATH", "./memory/source_registry.jsonl")
+
+# Outlet fields the registry votes on.
+REGISTRY_FIELDS = ("source_name", "source_class", "source_country")
+
+# A field value is trusted once it has this many votes and this share of them.
+MIN_VOTES = 2
+MIN_CONFIDENCE = 0.6
+
+# Lookups remembered for the coverage estimate, and the minimum before it counts.
+COVERAGE_WINDOW = 50
+MIN_COVERAGE_SAMPLES = 10
+
+
+def registry_enabled() -> bool:
+    return os.getenv("TRUTHLENS_SOURCE_REGISTRY", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+@dataclass
+class OutletRecord:
+    domain: str
+    fields: Dict[str, str]          # majority value per field
+    confidence: Dict[str, float]    # share of votes for that value
+    votes: int                      # observations of this outlet
+
+
+class SourceRegistry:
+    """
+    Outlet metadata voted on across runs, keyed by registrable domain.
+
+    Every Fact-Finder observation of an outlet (the source_name, source_class
+    and source_country Firecrawl reported for one of its articles) is
+    appended to a JSONL file, one line per observation; each article URL
+    votes once. An in-memory index of
+    per-field vote counts answers lookups in O(1); refresh() reads only the
+    lines appended since the last read, so other processes' observations are
+    picked up without reloading the file.
+    """
+
+    def __init__(self, path: Path | str | None = None) -> None:
+        self.path = Path(path or DEFAULT_REGISTRY_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._votes: Dict[str, Dict[str, Counter]] = {}
+        self._observations: Dict[str, int] = {}
+        self._seen_urls: set = set()
+        self._offset = 0
+        self._recent: Deque[bool] = deque(maxlen=COVERAGE_WINDOW)
+
+    # --- index maintenance -------------------------------------------------
+
+    def _apply(self, entry: Dict) -> None:
+        domain = entry.get("domain")
+        if not domain:
+            return
+        if entry.get("url"):
+            self._seen_urls.add(entry["url"])
+        self._observations[domain] = self._observations.get(domain, 0) + 1
+        per_field = self._votes.setdefault(domain, {})
+        for field in REGISTRY_FIELDS:
+            value = entry.get(field)
+            if value:
+                per_field.setdefault(field, Counter())[value] += 1
+
+    def refresh(self) -> None:
+        """
+        Fold lines appended since the last refresh into the index. A file that
+        shrank (replaced or truncated) is re-read from the start.
+        """
+        with self._lock:
+            if not self.path.exists():
+                return
+            size = self.path.stat().st_size
+            if size < self._offset:
+                self._votes.clear()
+                self._observations.clear()
+                self._seen_urls.clear()
+                self._offset = 0
+            if size == self._offset:
+                return
+            with self.path.open("rb") as f, timed("store.read_ms", store="source_registry"):
+                f.seek(self._offset)
+                chunk = f.read()
+            # Only complete lines; a concurrent writer may be mid-line.
+            end = chunk.rfind(b"\n") + 1
+            for line in chunk[:end].splitlines():
+                try:
+                    self._apply(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+            self._offset += end
+
+    def record(self, domain: str, fields: Dict[str, Optional[str]], url: Optional[str] = None) -> None:
+        """
+        Append one observation of `domain` made on article `url`; empty values
+        are dropped, and a URL that already voted is ignored. The observation
+        is visible to lookup() after the next refresh().
+        """
+        values = {k: v for k, v in fields.items() if k in REGISTRY_FIELDS and v}
+        if not domain or not values:
+            return
+        entry = {"domain": domain, **values, "url": url, "ts": time.time()}
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            if url and url in self._seen_urls:
+                return
+            if url:
+                self._seen_urls.add(url)
+            # One write per line on an O_APPEND descriptor keeps concurrent writers' lines whole.
+            with self.path.open("ab") as f:
+                f.write(line)
+        incr("source_registry.observations")
+
+    # --- lookups -----------------------------------------------------------
+
+    def lookup(self, domain: str) -> Optional[OutletRecord]:
+        """
+        Trusted field values for `domain`, or None if no field has enough
+        agreeing votes. Call refresh() first to see other processes' writes.
+        """
+        with self._lock:
+            per_field = self._votes.get(domain)
+            record: Optional[OutletRecord] = None
+            if per_field:
+                fields: Dict[str, str] = {}
+                confidence: Dict[str, float] = {}
+                for field, counter in per_field.items():
+                    value, count = counter.most_common(1)[0]
+                    share = count / sum(counter.values())
+                    if count >= MIN_VOTES and share >= MIN_CONFIDENCE:
+                        fields[field] = value
+                        confidence[field] = round(share, 3)
+                if fields:
+                    record = OutletRecord(domain, fields, confidence, self._observations.get(domain, 0))
+            self._recent.append(record is not None and "source_class" in record.fields)
+        incr("source_registry.lookups", outcome="hit" if record else "miss")
+        return record
+
+    def coverage(self) -> float:
+        """
+        Share of recent lookups that found a trusted source_class; 0.0 until
+        MIN_COVERAGE_SAMPLES lookups have been made.
+        """
+        with self._lock:
+            if len(self._recent) < MIN_COVERAGE_SAMPLES:
+                return 0.0
+            return sum(self._recent) / len(self._recent)
+
+    def domains(self) -> Iterable[str]:
+        with self._lock:
+            return list(self._votes)
+
+
+# Global singleton for this process
+_REGISTRY: Optional[SourceRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_source_registry() -> Optional[SourceRegistry]:
+    """
+    The shared registry (refreshed), or None when TRUTHLENS_SOURCE_REGISTRY=0.
+    """
+    global _REGISTRY
+    if not registry_enabled():
+        return None
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = SourceRegistry()
+    _REGISTRY.refresh()
+    return _REGISTRY
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from telemetry import get_logger, incr, timed
+
+logger = get_logger("memory.write_behind")
+
+
+def write_behind_enabled() -> bool:
+    """
+    Write-behind is on by default. Set TRUTHLENS_WRITE_BEHIND=0 to make every
+    store write synchronous again (useful when debugging the JSON files live).
+    """
+    return os.getenv("TRUTHLENS_WRITE_BEHIND", "1").strip().lower() not in {
+        "0",
+        "false",
+        "no",
+        "off",
+    }
+
+
+def _normalize_path(path: str | Path) -> str:
+    return os.path.abspath(os.fspath(path))
+
+
+def write_json_atomic(path: str | Path, data: Dict[str, Any]) -> None:
+    """
+    Write a JSON store via a temp file + rename so readers never observe a
+    half-written file, and fsync so a crash right after a save loses nothing.
+    """
+    target = _normalize_path(path)
+    tmp_path = f"{target}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, target)
+
+
+class WriteBehindPersister:
+    """
+    Background writer for the JSON-backed memory stores.
+
+    Stores hand over a full snapshot of their file (path -> dict) and return
+    immediately; a single daemon thread writes snapshots to disk in order.
+
+    - Coalescing: the key is the store path. If a path already has a pending
+      snapshot, the newer snapshot replaces it and only the latest is written,
+      so the queue never holds more than one snapshot per store.
+    - Consistency: `read()` returns the pending or in-flight snapshot for a path,
+      so a store always reads back what it last wrote, even before it hits disk.
+    - Shutdown: `close()` drains the queue; it is registered with atexit for
+      the process-wide instance.
+
+    Callers hand over ownership of the snapshot dict: they must not mutate it
+    after `submit()`. `read()` returns a deep copy for the same reason.
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._in_flight: Dict[str, Dict[str, Any]] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run,
+            name="truthlens-write-behind",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def submit(self, path: str | Path, data: Dict[str, Any]) -> None:
+        key = _normalize_path(path)
+        with self._cond:
+            if not self._closed:
+                # Coalesce: a newer snapshot for the same path replaces the older one.
+                if key in self._pending:
+                    incr("store.coalesced_writes")
+                self._pending[key] = data
+                self._cond.notify_all()
+                return
+
+        # After shutdown there is no writer thread left; fall back to a direct write.
+        write_json_atomic(key, data)
+
+    def read(self, path: str | Path) -> Optional[Dict[str, Any]]:
+        """
+        Return the newest not-yet-durable snapshot for `path`, or None if the
+        file on disk is already up to date.
+        """
+        key = _normalize_path(path)
+        with self._cond:
+            data = self._pending.get(key)
+            if data is None:
+                data = self._in_flight.get(key)
+        if data is None:
+            return None
+        return copy.deepcopy(data)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every submitted snapshot is on disk. Returns False on timeout.
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._in_flight,
+                timeout=timeout,
+            )
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                key = next(iter(self._pending))
+                data = self._pending.pop(key)
+                self._in_flight[key] = data
+
+            try:
+                with timed("store.flush_ms"):
+                    write_json_atomic(key, data)
+            except (OSError, TypeError, ValueError) as e:
+                # The snapshot is lost; the next write of this store replaces it.
+                incr("store.write_errors")
+                logger.error("Failed to write %s: %s", key, e)
+            finally:
+                with self._cond:
+                    if self._in_flight.get(key) is data:
+                        del self._in_flight[key]
+                    self._cond.notify_all()
+
+
+# Global singleton for this process
+_PERSISTER: Optional[WriteBehindPersister] = None
+_PERSISTER_LOCK = threading.Lock()
+
+
+def get_persister() -> WriteBehindPersister:
+    global _PERSISTER
+    with _PERSISTER_LOCK:
+        if _PERSISTER is None:
+            _PERSISTER = WriteBehindPersister()
+            atexit.register(_PERSISTER.close)
+        return _PERSISTER
+
+
+_STORE_LOCKS: Dict[str, threading.RLock] = {}
+_STORE_LOCKS_GUARD = threading.Lock()
+
+
+def store_lock(path: str | Path) -> threading.RLock:
+    """
+    Per-path lock for read-modify-write cycles on a JSON store, so concurrent
+    saves from batch workers in this process do not drop each other's entries.
+    """
+    key = _normalize_path(path)
+    with _STORE_LOCKS_GUARD:
+        lock = _STORE_LOCKS.get(key)
+        if lock is None:
+            lock = _STORE_LOCKS[key] = threading.RLock()
+        return lock
+
+
+def read_pending_store(path: str | Path) -> Optional[Dict[str, Any]]:
+    """
+    Snapshot for `path` that has been saved but not yet written to disk, if any.
+    Stores call this before falling back to reading the file.
+    """
+    if _PERSISTER is None:
+        return None
+    data = _PERSISTER.read(path)
+    if data is not None:
+        incr("store.pending_reads")
+    return data
+
+
+def persist_store(path: str | Path, data: Dict[str, Any]) -> None:
+    """
+    Persist a full store snapshot, off the request path when write-behind is enabled.
+    """
+    if write_behind_enabled():
+        with timed("store.write_ms", mode="write_behind"):
+            get_persister().submit(path, data)
+    else:
+        with timed("store.write_ms", mode="sync"):
+            write_json_atomic(path, data)
+
+
+def flush_stores(timeout: Optional[float] = None) -> bool:
+    """
+    Wait for all pending store writes. Safe to call when nothing was ever queued.
+    """
+    if _PERSISTER is None:
+        return True
+    return _PERSISTER.flush(timeout=timeout)
@@ -0,0 +1,513 @@
+"""
+Batch runner: analyse many statements from a JSONL file without the ADK agents.
+
+  python main.py batch statements.jsonl --out results.jsonl
+  python -m pipeline.batch statements.jsonl --out results.parquet --workers 8 \
+      --firecrawl-rpm 100 --gemini-rpm 60
+
+Input lines are either {"id": "...", "statement": "..."} objects (id optional)
+or bare JSON strings. Every statement runs Fact-Finder -> Pattern Analyzer ->
+Critic -> Counterpoint, with a per-stage concurrency cap on top of the worker
+pool and the shared Firecrawl/Gemini rate limits (agents/rate_limit.py), at
+batch priority so interactive requests in the same process go first.
+Upstream responses are cached across statements (memory/response_cache.py;
+on unless TRUTHLENS_RESPONSE_CACHE=0).
+
+With --stream, extraction starts while the search is still running; with
+--speculative, Critic candidate generation also starts on the first
+extracted batches (pipeline/speculative.py).
+
+Each finished stage is checkpointed to <checkpoint-dir>/<id>/<stage>.json, so
+re-running the same command after a crash skips finished statements and
+resumes unfinished ones at the first missing stage.
+
+With --deadline, each statement gets that many seconds (agents/run_context.py):
+stages still running when it passes stop polling and calling upstream, and the
+statement's record carries whatever they had, with "truncated": true.
+Ctrl-C cancels every running statement the same way. Truncated stages are not
+checkpointed, so a re-run completes them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from agents.counterpoint.schemas.counterpoint_schema import CounterpointResult
+from agents.counterpoint.tools.counterpoint_tool import run_counterpoint
+from agents.critic.schemas.critic_schema import CriticResult
+from agents.critic.tools.critic_tool import run_critic
+from agents.fact_finder.schemas.fact_finder_schema import FactFinderResult
+from agents.fact_finder.tools.firecrawl_fact_finder import run_fact_finder
+from agents.pattern_analyzer.schemas.pattern_analyzer_schema import PatternAnalysisResult
+from agents.pattern_analyzer.tools.firecrawl_pattern_analyzer import run_pattern_analyzer
+from agents.rate_limit import configure_rate_limit, priority_scope
+from agents.run_context import (
+    RunContext,
+    check_cancelled,
+    current_run_context,
+    run_context_scope,
+)
+from memory.write_behind import flush_stores, write_json_atomic
+from pipeline.speculative import run_speculative_pipeline
+from pipeline.streaming import run_streaming_analysis
+from telemetry import get_logger, run_scope
+
+logger = get_logger("batch")
+
+STAGES = ("fact_finder", "pattern_analyzer", "critic", "counterpoint")
+DONE_MARKER = "_record"
+# How often a statement waiting for a stage slot checks for cancellation.
+SLOT_POLL_SECONDS = 0.25
+
+
+@dataclass
+class BatchItem:
+    id: str
+    statement: str
+
+
+@dataclass
+class BatchConfig:
+    workers: int = 4
+    # Max statements inside each stage at once; defaults to `workers`.
+    stage_concurrency: Dict[str, int] = field(default_factory=dict)
+    search_limit: int = 5
+    checkpoint_dir: Path = Path("batch_checkpoints")
+    # Overlap Fact-Finder and Pattern Analyzer (pipeline/streaming.py).
+    stream: bool = False
+    # Also start the Critic and Counterpoint early (pipeline/speculative.py).
+    speculative: bool = False
+    # Seconds each statement may take before its stages are cut short.
+    deadline_seconds: Optional[float] = None
+
+
+def statement_id(statement: str) -> str:
+    return hashlib.sha256(statement.strip().encode("utf-8")).hexdigest()[:16]
+
+
+def load_statements(path: str | Path) -> List[BatchItem]:
+    """
+    Read statements from JSONL. Blank lines are skipped; repeated ids keep the
+    first occurrence.
+    """
+    items: List[BatchItem] = []
+    seen = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_no}: invalid JSON ({e})") from e
+
+            if isinstance(entry, str):
+                statement, item_id = entry, None
+            elif isinstance(entry, dict) and isinstance(entry.get("statement"), str):
+                statement, item_id = entry["statement"], entry.get("id")
+            else:
+                raise ValueError(f"{path}:{line_no}: expected a string or an object with 'statement'")
+
+            statement = statement.strip()
+            if not statement:
+                continue
+            item_id = str(item_id) if item_id else statement_id(statement)
+            if item_id in seen:
+                logger.warning("%s:%d: duplicate id %s skipped.", path, line_no, item_id)
+                continue
+            seen.add(item_id)
+            items.append(BatchItem(id=item_id, statement=statement))
+    return items
+
+
+class CheckpointStore:
+    """
+    One directory per statement with one JSON file per finished stage, plus a
+    `_record.json` once the whole statement is done.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, item_id: str, name: str) -> Path:
+        safe_id = "".join(c if c.isalnum() or c in "-_." else "_" for c in item_id)
+        return self.root / safe_id / f"{name}.json"
+
+    def load(self, item_id: str, name: str) -> Optional[Dict[str, Any]]:
+        path = self._path(item_id, name)
+        if not path.exists():
+            return None
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            logger.warning("Ignoring corrupt checkpoint %s.", path)
+            return None
+
+    def save(self, item_id: str, name: str, data: Dict[str, Any]) -> None:
+        path = self._path(item_id, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(path, data)
+
+    def record(self, item_id: str) -> Optional[Dict[str, Any]]:
+        return self.load(item_id, DONE_MARKER)
+
+
+class BatchRunner:
+    """
+    Runs BatchItems through all stages on a thread pool, checkpointing each stage.
+    """
+
+    def __init__(self, config: BatchConfig) -> None:
+        self.config = config
+        self.checkpoints = CheckpointStore(config.checkpoint_dir)
+        self._semaphores = {
+            stage: threading.BoundedSemaphore(max(1, config.stage_concurrency.get(stage, config.workers)))
+            for stage in STAGES
+        }
+        # Parent of every statement's run context; cancel() cancels them all.
+        self._root = RunContext()
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        """
+        Cut every running statement short (from any thread).
+        """
+        self._root.cancel(reason)
+
+    @contextlib.contextmanager
+    def _slot(self, stage: str) -> Iterator[None]:
+        """
+        Hold one of the stage's concurrency slots; waiting for it gives up with
+        RunCancelled once the statement is cancelled.
+        """
+        semaphore = self._semaphores[stage]
+        if current_run_context() is None:
+            semaphore.acquire()
+        else:
+            while not semaphore.acquire(timeout=SLOT_POLL_SECONDS):
+                check_cancelled()
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    def _checkpoint(self, item: BatchItem, stage: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        if data.get("truncated"):
+            logger.warning("[%s] %s was cut short; not checkpointed.", item.id, stage)
+        else:
+            self.checkpoints.save(item.id, stage, data)
+        return data
+
+    def _stage(
+        self,
+        item: BatchItem,
+        stage: str,
+        fn: Callable[[], Any],
+        done: Dict[str, Dict[str, Any]],
+    ) -> Any:
+        if stage in done:
+            return done[stage]
+        cached = self.checkpoints.load(item.id, stage)
+        if cached is not None:
+            logger.info("[%s] %s restored from checkpoint.", item.id, stage)
+            return cached
+        with self._slot(stage):
+            logger.info("[%s] Running %s...", item.id, stage)
+            data = fn().model_dump()
+        return self._checkpoint(item, stage, data)
+
+    def _stream_first_stages(self, item: BatchItem) -> Dict[str, Dict[str, Any]]:
+        """
+        Run Fact-Finder and Pattern Analyzer together as a stream and
+        checkpoint both. Semaphores are taken in stage order, as in run_item.
+        """
+        with self._slot("fact_finder"), self._slot("pattern_analyzer"):
+            logger.info("[%s] Running fact_finder + pattern_analyzer (streaming)...", item.id)
+            fact, pa = run_streaming_analysis(item.statement, limit=self.config.search_limit)
+        return {
+            "fact_finder": self._checkpoint(item, "fact_finder", fact.model_dump()),
+            "pattern_analyzer": self._checkpoint(item, "pattern_analyzer", pa.model_dump()),
+        }
+
+    def _speculative_stages(self, item: BatchItem) -> Dict[str, Dict[str, Any]]:
+        """
+        Run all stages with speculative candidate generation and checkpoint
+        each. Semaphores are taken in stage order, as in run_item.
+        """
+        with contextlib.ExitStack() as stack:
+            for stage in STAGES:
+                stack.enter_context(self._slot(stage))
+            logger.info("[%s] Running all stages (speculative)...", item.id)
+            run = run_speculative_pipeline(item.statement, limit=self.config.search_limit)
+        results = {
+            "fact_finder": run.fact_finder,
+            "pattern_analyzer": run.pattern_analysis,
+            "critic": run.critic,
+            "counterpoint": run.counterpoint,
+        }
+        return {stage: self._checkpoint(item, stage, r.model_dump()) for stage, r in results.items()}
+
+    def run_item(self, item: BatchItem) -> Dict[str, Any]:
+        """
+        Run (or resume) one statement and return its output record.
+        """
+        existing = self.checkpoints.record(item.id)
+        if existing is not None:
+            return existing
+
+        start = time.perf_counter()
+        ctx = self._root.child(self.config.deadline_seconds)
+        done: Dict[str, Dict[str, Any]] = {}
+        try:
+            with run_scope(run_id=f"batch-{item.id}"), priority_scope("batch"), run_context_scope(ctx):
+                if self.config.speculative and all(
+                    self.checkpoints.load(item.id, stage) is None for stage in STAGES
+                ):
+                    done.update(self._speculative_stages(item))
+                elif self.config.stream and all(
+                    self.checkpoints.load(item.id, stage) is None
+                    for stage in ("fact_finder", "pattern_analyzer")
+                ):
+                    done.update(self._stream_first_stages(item))
+                fact = FactFinderResult.model_validate(
+                    self._stage(
+                        item,
+                        "fact_finder",
+                        lambda: run_fact_finder(item.statement, limit=self.config.search_limit),
+                        done,
+                    )
+                )
+                pa = PatternAnalysisResult.model_validate(
+                    self._stage(item, "pattern_analyzer", lambda: run_pattern_analyzer(fact), done)
+                )
+                critic = CriticResult.model_validate(
+                    self._stage(item, "critic", lambda: run_critic(pa), done)
+                )
+                counterpoint = CounterpointResult.model_validate(
+                    self._stage(item, "counterpoint", lambda: run_counterpoint(critic, pa), done)
+                )
+        finally:
+            ctx.close()
+
+        truncated = any(r.truncated for r in (fact, pa, critic, counterpoint))
+        record = {
+            "id": item.id,
+            "statement": item.statement,
+            "fact_finder": fact.model_dump(),
+            "pattern_analysis": pa.model_dump(),
+            "critic": critic.model_dump(),
+            "counterpoint": counterpoint.model_dump(),
+            "duration_ms": (time.perf_counter() - start) * 1000.0,
+            "truncated": truncated,
+        }
+        if not truncated:
+            self.checkpoints.save(item.id, DONE_MARKER, record)
+        return record
+
+    def run(
+        self,
+        items: List[BatchItem],
+        on_record: Callable[[Dict[str, Any]], None],
+    ) -> Dict[str, str]:
+        """
+        Run all items; `on_record` is called (from the calling thread) as each
+        statement finishes. Returns {id: error message} for failed statements.
+        """
+        failures: Dict[str, str] = {}
+        executor = ThreadPoolExecutor(max_workers=max(1, self.config.workers))
+        try:
+            futures = {executor.submit(self.run_item, item): item for item in items}
+            for future in as_completed(futures):
+                item = futures[future]
+                try:
+                    record = future.result()
+                except Exception as e:
+                    logger.error("[%s] Failed: %s", item.id, e)
+                    failures[item.id] = f"{type(e).__name__}: {e}"
+                    continue
+                on_record(record)
+        except KeyboardInterrupt:
+            logger.warning("Interrupted; finished stages are checkpointed. Re-run to resume.")
+            # Running statements stop at their next cancellation point, which
+            # frees their stage slots and upstream jobs before we exit.
+            self.cancel("interrupted")
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+        executor.shutdown(wait=True)
+        flush_stores()
+        return failures
+
+
+# --- Output writers ---------------------------------------------------------
+
+
+class JsonlWriter:
+    """
+    Appends one line per finished statement. On resume, statements already in
+    the file are not written again, unless their line was truncated (a later,
+    complete line then supersedes it).
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._written = set()
+        if self.path.exists():
+            with self.path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        if not entry.get("truncated"):
+                            self._written.add(entry["id"])
+                    except (json.JSONDecodeError, KeyError, TypeError, AttributeError):
+                        continue
+        self._file = self.path.open("a", encoding="utf-8")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        if record["id"] in self._written:
+            return
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        if not record.get("truncated"):
+            self._written.add(record["id"])
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetWriter:
+    """
+    Collects records and writes a single Parquet file on close (requires
+    pyarrow). Stage results are stored as JSON strings, one column per stage.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise RuntimeError("Parquet output requires pyarrow: pip install pyarrow") from e
+        self.path = Path(path)
+        self._records: Dict[str, Dict[str, Any]] = {}
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._records[record["id"]] = record
+
+    def close(self) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        rows = list(self._records.values())
+        columns: Dict[str, List[Any]] = {
+            "id": [r["id"] for r in rows],
+            "statement": [r["statement"] for r in rows],
+            "duration_ms": [r.get("duration_ms") for r in rows],
+            "truncated": [bool(r.get("truncated")) for r in rows],
+        }
+        for name in ("fact_finder", "pattern_analysis", "critic", "counterpoint"):
+            columns[name] = [json.dumps(r[name], ensure_ascii=False) for r in rows]
+        pq.write_table(pa.table(columns), self.path)
+
+
+def open_writer(path: str | Path, fmt: Optional[str] = None):
+    fmt = fmt or ("parquet" if str(path).endswith(".parquet") else "jsonl")
+    if fmt == "parquet":
+        return ParquetWriter(path)
+    return JsonlWriter(path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Analyse statements from a JSONL file in bulk.")
+    parser.add_argument("input", help="JSONL file of statements")
+    parser.add_argument("--out", default="batch_results.jsonl", help=".jsonl or .parquet")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], help="override --out extension")
+    parser.add_argument("--checkpoint-dir", default="batch_checkpoints")
+    parser.add_argument("--workers", type=int, default=4, help="statements processed at once")
+    for stage in STAGES:
+        parser.add_argument(
+            f"--{stage.replace('_', '-')}-concurrency",
+            type=int,
+            help=f"max statements in {stage} at once (default: --workers)",
+        )
+    parser.add_argument("--limit", type=int, default=5, help="Firecrawl search results per statement")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="start extraction while the search is still running",
+    )
+    parser.add_argument(
+        "--speculative",
+        action="store_true",
+        help="also generate Critic candidates during extraction (implies --stream)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        help="seconds per statement; stages still running then return partial, truncated results",
+    )
+    parser.add_argument(
+        "--firecrawl-rpm",
+        type=float,
+        default=float(os.getenv("TRUTHLENS_FIRECRAWL_RPM", "0")) or None,
+        help="global Firecrawl requests per minute",
+    )
+    parser.add_argument(
+        "--gemini-rpm",
+        type=float,
+        default=float(os.getenv("TRUTHLENS_GEMINI_RPM", "0")) or None,
+        help="global Gemini requests per minute",
+    )
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("TRUTHLENS_RESPONSE_CACHE", "1")
+    configure_rate_limit("firecrawl", args.firecrawl_rpm)
+    configure_rate_limit("gemini", args.gemini_rpm)
+
+    config = BatchConfig(
+        workers=args.workers,
+        stage_concurrency={
+            stage: getattr(args, f"{stage}_concurrency")
+            for stage in STAGES
+            if getattr(args, f"{stage}_concurrency")
+        },
+        search_limit=args.limit,
+        checkpoint_dir=Path(args.checkpoint_dir),
+        stream=args.stream or args.speculative,
+        speculative=args.speculative,
+        deadline_seconds=args.deadline,
+    )
+
+    items = load_statements(args.input)
+    runner = BatchRunner(config)
+    writer = open_writer(args.out, args.format)
+    logger.info("Running %d statements with %d workers.", len(items), config.workers)
+
+    start = time.perf_counter()
+    try:
+        failures = runner.run(items, on_record=writer.write)
+    finally:
+        writer.close()
+
+    done = len(items) - len(failures)
+    print(
+        f"{done}/{len(items)} statements done in {time.perf_counter() - start:.1f}s; "
+        f"results in {args.out}"
+    )
+    for item_id, error in failures.items():
+        print(f"  FAILED {item_id}: {error}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
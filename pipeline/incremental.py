@@ -0,0 +1,378 @@
+"""
+Incremental re-analysis: update a statement's stored run instead of redoing it.
+
+  python main.py incremental "Gold prices hit record high"
+  python -m pipeline.incremental "Gold prices hit record high" --limit 5 --out delta.json
+
+The first run of a statement is a full run whose results (sources, pattern
+analysis, implication candidates, critic and counterpoints) are kept as a
+snapshot in <snapshot-dir>/<id>.json. Later runs search again, then:
+
+  - diff the sources against the snapshot by canonical URL (new, changed,
+    no longer returned) and extract only the new and changed ones,
+  - merge the new articles into the stored PatternAnalysisResult,
+  - re-verify only the implication candidates whose premise or consequence
+    matches a claim in the new or replaced articles, and propose candidates
+    from the new articles' summaries only,
+  - regenerate counterpoints only for chains whose verdict changed or that
+    are new.
+
+Each run returns a delta report with what changed and what was skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from agents.counterpoint.schemas.counterpoint_schema import CounterpointResult
+from agents.counterpoint.tools.counterpoint_tool import (
+    regenerate_counterpoints,
+    run_counterpoint,
+)
+from agents.critic.schemas.critic_schema import CriticResult, ImplicationChain
+from agents.critic.tools.critic_tool import run_critic
+from agents.critic.tools.implication_chains import (
+    candidate_touches_articles,
+    generate_implication_candidates,
+    verify_implication_candidate,
+)
+from agents.fact_finder.schemas.fact_finder_schema import FactFinderResult, SourceInfo
+from agents.fact_finder.tools.canonicalize import canonical_url
+from agents.fact_finder.tools.firecrawl_fact_finder import run_fact_finder
+from agents.pattern_analyzer.schemas.pattern_analyzer_schema import (
+    ArticleAnalysis,
+    ExtractionFailure,
+    PatternAnalysisResult,
+)
+from agents.pattern_analyzer.tools.adaptive_batching import AdaptiveBatcher
+from agents.pattern_analyzer.tools.columnar import ColumnarPatternAnalysis, columnar_view
+from agents.pattern_analyzer.tools.firecrawl_pattern_analyzer import (
+    analyze_source_batches,
+    finalize_pattern_analysis,
+    is_textual_url,
+    run_pattern_analyzer,
+)
+from agents.pattern_analyzer.tools.prefetch import PrefetchClassifier, prefetch_enabled
+from memory.write_behind import flush_stores, write_json_atomic
+from pipeline.batch import statement_id
+from telemetry import get_logger, incr, traced
+
+logger = get_logger("incremental")
+
+DEFAULT_SNAPSHOT_DIR = os.getenv("TRUTHLENS_SNAPSHOT_DIR", "./memory/snapshots")
+
+
+@dataclass
+class DeltaReport:
+    statement: str
+    mode: str  # "full" (no snapshot yet) or "incremental"
+    new_urls: List[str] = field(default_factory=list)
+    changed_urls: List[str] = field(default_factory=list)
+    dropped_urls: List[str] = field(default_factory=list)  # no longer returned by search; kept
+    articles_added: int = 0
+    articles_replaced: int = 0
+    reverified_chains: List[int] = field(default_factory=list)
+    new_chains: List[int] = field(default_factory=list)
+    verdict_changes: List[Dict[str, Any]] = field(default_factory=list)
+    counterpoints_regenerated_for: List[int] = field(default_factory=list)
+    savings: Dict[str, int] = field(default_factory=dict)
+    duration_ms: float = 0.0
+
+
+@dataclass
+class IncrementalRun:
+    fact_finder: FactFinderResult
+    pattern_analysis: PatternAnalysisResult
+    critic: CriticResult
+    counterpoint: CounterpointResult
+    delta: DeltaReport
+
+
+class SnapshotStore:
+    """
+    One JSON file per statement with everything an incremental run reuses.
+    """
+
+    def __init__(self, root: str | Path = DEFAULT_SNAPSHOT_DIR) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, statement: str) -> Path:
+        return self.root / f"{statement_id(statement)}.json"
+
+    def load(self, statement: str) -> Optional[Dict[str, Any]]:
+        path = self._path(statement)
+        if not path.exists():
+            return None
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            logger.warning("Ignoring corrupt snapshot %s.", path)
+            return None
+
+    def save(self, run: IncrementalRun, candidates: List[Dict[str, str]]) -> None:
+        write_json_atomic(
+            self._path(run.fact_finder.statement),
+            {
+                "statement": run.fact_finder.statement,
+                "updated_at": time.time(),
+                "fact_finder": run.fact_finder.model_dump(),
+                "pattern_analysis": run.pattern_analysis.model_dump(),
+                "candidates": candidates,
+                "critic": run.critic.model_dump(),
+                "counterpoint": run.counterpoint.model_dump(),
+                "last_delta": asdict(run.delta),
+            },
+        )
+
+
+def _source_keys(source: SourceInfo) -> List[str]:
+    return [canonical_url(u) for u in [source.url, *source.aliases] if u]
+
+
+def _fingerprint(source: SourceInfo) -> tuple:
+    return (source.title or "", source.description or "", source.publish_date or "")
+
+
+def _diff_sources(old: List[SourceInfo], new: List[SourceInfo]) -> Dict[str, List[SourceInfo]]:
+    """
+    Classify `new` against `old` by canonical URL (aliases included): added,
+    changed (same page, different title/description/date) and unchanged;
+    plus the old sources the search no longer returned.
+    """
+    old_by_key: Dict[str, SourceInfo] = {}
+    for src in old:
+        for key in _source_keys(src):
+            old_by_key.setdefault(key, src)
+
+    added: List[SourceInfo] = []
+    changed: List[SourceInfo] = []
+    unchanged: List[SourceInfo] = []
+    matched: Set[int] = set()
+    for src in new:
+        previous = next((old_by_key[k] for k in _source_keys(src) if k in old_by_key), None)
+        if previous is None:
+            added.append(src)
+            continue
+        matched.add(id(previous))
+        (unchanged if _fingerprint(previous) == _fingerprint(src) else changed).append(src)
+
+    dropped = [src for src in old if id(src) not in matched]
+    return {"added": added, "changed": changed, "unchanged": unchanged, "dropped": dropped}
+
+
+def _extract(statement: str, sources: List[SourceInfo]) -> tuple:
+    """
+    Articles and failures for `sources`, through the regular prefetch,
+    adaptive batching and retry path.
+    """
+    textual = [src for src in sources if src.url and is_textual_url(src.url)]
+    skipped: List[ExtractionFailure] = []
+    if textual and prefetch_enabled():
+        textual, skipped = PrefetchClassifier().filter(textual)
+    if not textual:
+        return [], skipped
+
+    api_key = os.environ.get("FIRECRAWL_API_KEY")
+    if not api_key:
+        raise RuntimeError("FIRECRAWL_API_KEY is not set in the environment.")
+    batcher = AdaptiveBatcher()
+    articles, failures = analyze_source_batches(statement, batcher.plan(textual), api_key, batcher=batcher)
+    return articles, skipped + failures
+
+
+def _candidate_key(cand: Dict[str, str]) -> tuple:
+    return (cand["premise"].strip().lower(), cand["consequence"].strip().lower())
+
+
+def _merge_candidate_sources(*paths: Optional[str]) -> Optional[str]:
+    """
+    Candidate paths combined, e.g. "heuristic" and "llm" -> "heuristic+llm".
+    """
+    parts = {part for path in paths if path for part in path.split("+")}
+    return "+".join(part for part in ("heuristic", "llm") if part in parts) or None
+
+
+def _full_run(statement: str, limit: int) -> tuple:
+    fact = run_fact_finder(statement, limit=limit)
+    pa = run_pattern_analyzer(fact)
+    candidates, path = generate_implication_candidates(pa)
+    critic = run_critic(pa, candidates=candidates, candidate_source=path)
+    chains = critic.implication_chains
+    counterpoint = run_counterpoint(critic=critic, pa=pa)
+    delta = DeltaReport(
+        statement=fact.statement,
+        mode="full",
+        new_urls=[s.url for s in fact.sources],
+        articles_added=len(pa.analyzed_articles),
+        new_chains=list(range(len(chains))),
+        counterpoints_regenerated_for=list(range(len(chains))),
+    )
+    return IncrementalRun(fact, pa, critic, counterpoint, delta), candidates
+
+
+@traced("stage.incremental")
+def run_incremental(
+    statement: str,
+    limit: int = 5,
+    store: Optional[SnapshotStore] = None,
+) -> IncrementalRun:
+    """
+    Re-analyse `statement` against its stored snapshot (full run if none) and
+    save the updated snapshot.
+    """
+    start = time.perf_counter()
+    store = store or SnapshotStore()
+    snapshot = store.load(statement)
+
+    if snapshot is None:
+        logger.info("No snapshot for %r; running the full pipeline.", statement)
+        run, candidates = _full_run(statement, limit)
+        run.delta.duration_ms = (time.perf_counter() - start) * 1000.0
+        store.save(run, candidates)
+        return run
+
+    old_fact = FactFinderResult.model_validate(snapshot["fact_finder"])
+    old_pa = PatternAnalysisResult.model_validate(snapshot["pattern_analysis"])
+    old_critic = CriticResult.model_validate(snapshot["critic"])
+    old_cp = CounterpointResult.model_validate(snapshot["counterpoint"])
+    candidates: List[Dict[str, str]] = list(snapshot.get("candidates", []))
+
+    fact = run_fact_finder(statement, limit=limit)
+    diff = _diff_sources(old_fact.sources, fact.sources)
+    to_extract = diff["added"] + diff["changed"]
+    logger.info(
+        "Sources: %d new, %d changed, %d unchanged, %d no longer returned.",
+        len(diff["added"]),
+        len(diff["changed"]),
+        len(diff["unchanged"]),
+        len(diff["dropped"]),
+    )
+
+    # --- merge the new extractions into the stored analysis ------------------
+    new_articles, new_failures = _extract(fact.statement, to_extract)
+    extracted_keys = {canonical_url(a.url) for a in new_articles}
+    replaced_keys: Set[str] = set()
+    for src in diff["changed"]:
+        keys = set(_source_keys(src))
+        if keys & extracted_keys:
+            replaced_keys |= keys
+    replaced = [a for a in old_pa.analyzed_articles if canonical_url(a.url) in replaced_keys]
+    kept = [a for a in old_pa.analyzed_articles if canonical_url(a.url) not in replaced_keys]
+
+    merged_articles: List[ArticleAnalysis] = kept + new_articles
+    failure_by_url = {canonical_url(f.url): f for f in old_pa.extraction_failures}
+    for key in extracted_keys:
+        failure_by_url.pop(key, None)
+    for failure in new_failures:
+        failure_by_url[canonical_url(failure.url)] = failure
+    pa = finalize_pattern_analysis(fact.statement, merged_articles, list(failure_by_url.values()))
+
+    # --- re-verify only the candidates the new claims can affect --------------
+    touched = new_articles + replaced
+    chains: List[ImplicationChain] = list(old_critic.implication_chains)
+    reverified: List[int] = []
+    if touched:
+        touched_view = ColumnarPatternAnalysis(fact.statement, touched)
+        reverified = [i for i, cand in enumerate(candidates) if candidate_touches_articles(cand, touched_view)]
+
+    new_candidate_indices: List[int] = []
+    candidate_source = old_critic.candidate_source
+    if new_articles:
+        known = {_candidate_key(c) for c in candidates}
+        new_candidates, path = generate_implication_candidates(
+            PatternAnalysisResult(statement=fact.statement, analyzed_articles=new_articles)
+        )
+        for cand in new_candidates:
+            if _candidate_key(cand) not in known:
+                known.add(_candidate_key(cand))
+                candidates.append(cand)
+                new_candidate_indices.append(len(candidates) - 1)
+        if new_candidate_indices:
+            candidate_source = _merge_candidate_sources(candidate_source, path)
+
+    verdict_changes: List[Dict[str, Any]] = []
+    view = columnar_view(pa)
+    for i in reverified + new_candidate_indices:
+        chain = verify_implication_candidate(view, candidates[i], i + 1)
+        if i < len(chains):
+            before = chains[i].overall_assessment
+            if before != chain.overall_assessment:
+                verdict_changes.append({"chain": i, "before": before, "after": chain.overall_assessment})
+            chains[i] = chain
+        else:
+            chains.append(chain)
+
+    critic = run_critic(pa, chains=chains, candidate_source=candidate_source)
+    regenerate = sorted({c["chain"] for c in verdict_changes} | set(new_candidate_indices))
+    counterpoint = regenerate_counterpoints(critic, pa, regenerate, old_cp)
+
+    summaries_total = sum(1 for a in pa.analyzed_articles if a.narrative_summary)
+    summaries_sent = sum(1 for a in new_articles if a.narrative_summary)
+    savings = {
+        "urls_extracted": len(to_extract),
+        "urls_reused": len(diff["unchanged"]),
+        "candidates_reverified": len(reverified),
+        "candidates_skipped": len(candidates) - len(new_candidate_indices) - len(reverified),
+        "summaries_sent_for_candidates": summaries_sent if new_articles else 0,
+        "summaries_not_resent": summaries_total - (summaries_sent if new_articles else 0),
+        "counterpoint_chains_regenerated": len(regenerate),
+        "counterpoint_chains_reused": len(chains) - len(regenerate),
+    }
+    for name, value in savings.items():
+        incr(f"incremental.{name}", float(value))
+
+    delta = DeltaReport(
+        statement=fact.statement,
+        mode="incremental",
+        new_urls=[s.url for s in diff["added"]],
+        changed_urls=[s.url for s in diff["changed"]],
+        dropped_urls=[s.url for s in diff["dropped"]],
+        articles_added=len(new_articles) - len(replaced),
+        articles_replaced=len(replaced),
+        reverified_chains=reverified,
+        new_chains=new_candidate_indices,
+        verdict_changes=verdict_changes,
+        counterpoints_regenerated_for=regenerate,
+        savings=savings,
+        duration_ms=(time.perf_counter() - start) * 1000.0,
+    )
+    run = IncrementalRun(fact, pa, critic, counterpoint, delta)
+    store.save(run, candidates)
+    logger.info(
+        "Incremental run: %d URLs extracted (%d reused), %d chains re-verified, %d verdicts changed.",
+        len(to_extract),
+        len(diff["unchanged"]),
+        len(reverified) + len(new_candidate_indices),
+        len(verdict_changes),
+    )
+    return run
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-analyse a statement incrementally.")
+    parser.add_argument("statement")
+    parser.add_argument("--limit", type=int, default=5, help="Fact-Finder search limit")
+    parser.add_argument("--snapshot-dir", default=DEFAULT_SNAPSHOT_DIR)
+    parser.add_argument("--out", help="Also write the delta report to this JSON file")
+    args = parser.parse_args(argv)
+
+    run = run_incremental(args.statement, limit=args.limit, store=SnapshotStore(args.snapshot_dir))
+    flush_stores()
+    report = asdict(run.delta)
+    if args.out:
+        write_json_atomic(args.out, report)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,362 @@
+"""
+Speculative execution of the stages after extraction.
+
+The Critic's Gemini candidate generation only needs the articles'
+narrative_summary fields, yet a sequential run waits for every extract batch
+before it starts. run_speculative_pipeline() streams the Fact-Finder into the
+Pattern Analyzer (pipeline/streaming.py) and hands each extracted batch to
+SpeculativeCandidates, which asks Gemini for candidates from the summaries
+that arrived since its previous call while extraction is still running.
+When extraction ends:
+
+  - the usual heuristic-first decision (generate_implication_candidates) runs
+    on the final PatternAnalysisResult; if Gemini is needed, the speculative
+    candidates are reused and only summaries not sent yet are sent; if not,
+    the speculative candidates are dropped,
+  - speculative candidates whose summaries are not in the final result (the
+    upstream inputs changed) are dropped and those articles sent again,
+  - the Counterpoint prompt (mostly the PatternAnalysisResult JSON) is
+    prepared on a worker thread while the candidates are verified.
+
+As in incremental re-analysis, Gemini sees the summaries in several groups
+rather than all at once.
+
+  python -m pipeline.speculative "Gold prices hit record high" --limit 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from agents.counterpoint.schemas.counterpoint_schema import CounterpointResult
+from agents.counterpoint.tools.counterpoint_tool import (
+    prepare_counterpoint_prompt,
+    run_counterpoint,
+)
+from agents.critic.schemas.critic_schema import CriticResult
+from agents.critic.tools.critic_tool import run_critic
+from agents.critic.tools.heuristic_candidates import (
+    MIN_HEURISTIC_COVERAGE,
+    generate_heuristic_candidates,
+)
+from agents.critic.tools.implication_chains import (
+    CANDIDATE_MODE,
+    generate_implication_candidates,
+    generate_llm_candidates,
+)
+from agents.fact_finder.schemas.fact_finder_schema import FactFinderResult
+from agents.pattern_analyzer.schemas.pattern_analyzer_schema import (
+    ArticleAnalysis,
+    PatternAnalysisResult,
+)
+from agents.run_context import run_cancelled, with_run_context
+from memory.write_behind import flush_stores, write_json_atomic
+from pipeline.streaming import run_streaming_analysis
+from telemetry import bind_context, get_logger, incr, observe, traced
+
+logger = get_logger("speculative")
+
+# Consecutive checks (one per extracted batch) whose heuristic coverage must
+# stay below MIN_HEURISTIC_COVERAGE, without rising, before Gemini is asked
+# early. Coverage over the first few articles says little about the final one.
+SPECULATION_MIN_CHECKS = int(os.getenv("TRUTHLENS_SPECULATION_MIN_CHECKS", "2"))
+
+SummaryKey = Tuple[str, str]
+
+
+def _summary_key(article: ArticleAnalysis) -> SummaryKey:
+    return (article.url, article.narrative_summary or "")
+
+
+def _candidate_key(cand: Dict[str, str]) -> tuple:
+    return (cand["premise"].strip().lower(), cand["consequence"].strip().lower())
+
+
+@dataclass
+class _Chunk:
+    keys: FrozenSet[SummaryKey]  # summaries sent in one Gemini call
+    candidates: List[Dict[str, str]]
+    started: float  # time.perf_counter() around the call
+    finished: float
+
+
+@dataclass
+class SpeculationReport:
+    statement: str
+    candidate_source: str = ""
+    llm_calls_early: int = 0  # Gemini calls made while extraction was running
+    llm_calls_wasted: int = 0  # early calls the final decision did not need
+    llm_calls_late: int = 0  # calls for summaries that arrived after the last early one
+    summaries_sent_early: int = 0
+    summaries_sent_late: int = 0
+    candidates_reused: int = 0
+    candidates_discarded: int = 0  # not needed, or from summaries no longer in the result
+    overlap_ms: float = 0.0  # Gemini time that overlapped extraction (taken off the critical path)
+    duration_ms: float = 0.0
+
+
+@dataclass
+class SpeculativeRun:
+    fact_finder: FactFinderResult
+    pattern_analysis: PatternAnalysisResult
+    critic: CriticResult
+    counterpoint: CounterpointResult
+    report: SpeculationReport
+
+
+class SpeculativeCandidates:
+    """
+    Implication candidates generated from partial extraction results.
+
+    add_articles() may be called from any thread (it is the on_batch hook of
+    analyze_source_batches). Gemini calls run one at a time on a worker
+    thread, each covering every summary that arrived since the previous one,
+    and only once the heuristic candidates have covered too few of the
+    articles so far for SPECULATION_MIN_CHECKS batches in a row, with no
+    upward trend (or always, with TRUTHLENS_IMPLICATION_CANDIDATES=llm).
+    Early calls the final decision turns out not to need are reported as
+    wasted.
+    candidates() settles the speculation against the final
+    PatternAnalysisResult; cancel() drops it, including a call in flight.
+    """
+
+    def __init__(self, statement: str) -> None:
+        self.statement = statement
+        self._lock = threading.Lock()
+        self._seen: List[ArticleAnalysis] = []
+        self._unsent: List[ArticleAnalysis] = []
+        self._chunks: List[_Chunk] = []
+        self._coverage: List[float] = []
+        self._generation = 0
+        self._scheduled = False
+        self._closed = False
+        self._future: Optional[Future] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speculative")
+        self.report = SpeculationReport(statement=statement)
+
+    def add_articles(self, articles: List[ArticleAnalysis]) -> None:
+        """
+        Record newly extracted articles and schedule a refresh.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._seen.extend(articles)
+            self._unsent.extend(a for a in articles if a.narrative_summary)
+            if not self._scheduled:
+                self._scheduled = True
+                self._future = self._executor.submit(bind_context(self._refresh))
+
+    def _wants_llm(self, articles: List[ArticleAnalysis]) -> bool:
+        if CANDIDATE_MODE == "heuristic" or not os.getenv("GOOGLE_API_KEY"):
+            return False
+        if CANDIDATE_MODE == "llm":
+            return True
+        candidates, coverage = generate_heuristic_candidates(
+            PatternAnalysisResult(statement=self.statement, analyzed_articles=articles)
+        )
+        self._coverage.append(coverage if candidates else 0.0)
+        recent = self._coverage[-SPECULATION_MIN_CHECKS:]
+        return (
+            len(recent) >= SPECULATION_MIN_CHECKS
+            and max(recent) < MIN_HEURISTIC_COVERAGE
+            and recent[-1] <= recent[0]
+        )
+
+    def _refresh(self) -> None:
+        decided_at = -1
+        while True:
+            with self._lock:
+                if self._closed or len(self._seen) == decided_at:
+                    self._scheduled = False
+                    return
+                decided_at = len(self._seen)
+                seen = list(self._seen)
+                generation = self._generation
+            if not self._wants_llm(seen):
+                continue
+            with self._lock:
+                if generation != self._generation or not self._unsent:
+                    continue
+                batch, self._unsent = self._unsent, []
+
+            started = time.perf_counter()
+            found = generate_llm_candidates(
+                PatternAnalysisResult(statement=self.statement, analyzed_articles=batch)
+            )
+            finished = time.perf_counter()
+            incr("speculative.llm_calls")
+            with self._lock:
+                # A call abandoned because the run was cancelled returns nothing.
+                if generation != self._generation or run_cancelled():
+                    incr("speculative.discarded", float(len(found)), reason="cancelled")
+                    continue
+                self._chunks.append(_Chunk(frozenset(_summary_key(a) for a in batch), found, started, finished))
+                self.report.llm_calls_early += 1
+                self.report.summaries_sent_early += len(batch)
+            logger.info("Speculative candidates: %d from %d early summaries.", len(found), len(batch))
+
+    def cancel(self) -> None:
+        """
+        Drop all speculative work, e.g. when the upstream inputs changed or the
+        extraction failed. A Gemini call in flight finishes and is ignored.
+        """
+        with self._lock:
+            self._generation += 1
+            self._closed = True
+            self._future = None
+            dropped = sum(len(c.candidates) for c in self._chunks)
+            self._chunks.clear()
+            self._seen.clear()
+            self._unsent.clear()
+        self._executor.shutdown(wait=False)
+        self.report.candidates_discarded += dropped
+        incr("speculative.cancelled")
+        if dropped:
+            incr("speculative.discarded", float(dropped), reason="cancelled")
+
+    def _settle(self, pa: PatternAnalysisResult, extracted_at: float) -> List[Dict[str, str]]:
+        """
+        LLM candidates for `pa`: the speculative ones whose summaries are all
+        still in `pa`, plus one call for the summaries no early call covered.
+        """
+        present = {_summary_key(a) for a in pa.analyzed_articles if a.narrative_summary}
+        with self._lock:
+            chunks = list(self._chunks)
+
+        reused: List[Dict[str, str]] = []
+        covered = set()
+        for chunk in chunks:
+            if chunk.keys <= present:
+                reused.extend(chunk.candidates)
+                covered |= chunk.keys
+                self.report.overlap_ms += max(0.0, min(chunk.finished, extracted_at) - chunk.started) * 1000.0
+            else:
+                self.report.candidates_discarded += len(chunk.candidates)
+                incr("speculative.discarded", float(len(chunk.candidates)), reason="stale")
+        self.report.candidates_reused = len(reused)
+
+        late = [a for a in pa.analyzed_articles if a.narrative_summary and _summary_key(a) not in covered]
+        if late:
+            self.report.llm_calls_late += 1
+            self.report.summaries_sent_late += len(late)
+            reused.extend(
+                generate_llm_candidates(
+                    PatternAnalysisResult(statement=pa.statement, analyzed_articles=late)
+                )
+            )
+
+        seen = set()
+        unique: List[Dict[str, str]] = []
+        for cand in reused:
+            if _candidate_key(cand) not in seen:
+                seen.add(_candidate_key(cand))
+                unique.append(cand)
+        return unique
+
+    def candidates(self, pa: PatternAnalysisResult) -> Tuple[List[Dict[str, str]], str]:
+        """
+        Same contract as generate_implication_candidates(pa), reusing the
+        speculative Gemini candidates where the final decision needs Gemini.
+        Waits for a call still in flight; later add_articles() calls are ignored.
+        """
+        extracted_at = time.perf_counter()
+        with self._lock:
+            self._closed = True
+            future = self._future
+        if future is not None:
+            future.result()
+        self._executor.shutdown(wait=False)
+
+        settled: List[bool] = []
+
+        def _llm(target: PatternAnalysisResult) -> List[Dict[str, str]]:
+            settled.append(True)
+            return self._settle(target, extracted_at)
+
+        candidates, path = generate_implication_candidates(pa, llm=_llm)
+        if not settled:
+            unused = sum(len(c.candidates) for c in self._chunks)
+            self.report.candidates_discarded += unused
+            self.report.llm_calls_wasted = self.report.llm_calls_early
+            if unused:
+                incr("speculative.discarded", float(unused), reason="not_needed")
+            if self.report.llm_calls_wasted:
+                incr("speculative.wasted_calls", float(self.report.llm_calls_wasted))
+        self.report.candidate_source = path
+        incr("speculative.candidates_reused", float(self.report.candidates_reused))
+        observe("speculative.overlap_ms", self.report.overlap_ms)
+        return candidates, path
+
+
+@traced("stage.speculative_pipeline")
+@with_run_context
+def run_speculative_pipeline(
+    statement: str,
+    limit: int = 5,
+    fan_out: Optional[bool] = None,
+) -> SpeculativeRun:
+    """
+    Fact-Finder, Pattern Analyzer, Critic and Counterpoint for `statement`,
+    with candidate generation overlapping extraction and the Counterpoint
+    prompt prepared during verification. Results are persisted as the
+    sequential stages persist them. After a cancelled `run_context` the
+    remaining stages run on what was extracted, without Gemini, and mark
+    their results `truncated`.
+    """
+    start = time.perf_counter()
+    speculative = SpeculativeCandidates(statement.strip())
+    try:
+        fact, pa = run_streaming_analysis(
+            statement, limit=limit, fan_out=fan_out, on_batch=speculative.add_articles
+        )
+    except BaseException:
+        speculative.cancel()
+        raise
+
+    candidates, path = speculative.candidates(pa)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="counterpoint-prompt") as pool:
+        prompt_future = pool.submit(bind_context(prepare_counterpoint_prompt), pa.statement, pa)
+        critic = run_critic(pa, candidates=candidates, candidate_source=path)
+        prompt = prompt_future.result()
+    counterpoint = run_counterpoint(critic=critic, pa=pa, prompt=prompt)
+
+    report = speculative.report
+    report.duration_ms = (time.perf_counter() - start) * 1000.0
+    logger.info(
+        "Speculative run: %d early (%d wasted) and %d late candidate calls, %d candidates reused, %.0f ms overlapped.",
+        report.llm_calls_early,
+        report.llm_calls_wasted,
+        report.llm_calls_late,
+        report.candidates_reused,
+        report.overlap_ms,
+    )
+    return SpeculativeRun(fact, pa, critic, counterpoint, report)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Analyse a statement with speculative downstream stages.")
+    parser.add_argument("statement")
+    parser.add_argument("--limit", type=int, default=5, help="Fact-Finder search limit")
+    parser.add_argument("--out", help="Also write the speculation report to this JSON file")
+    args = parser.parse_args(argv)
+
+    run = run_speculative_pipeline(args.statement, limit=args.limit)
+    flush_stores()
+    report = asdict(run.report)
+    if args.out:
+        write_json_atomic(args.out, report)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
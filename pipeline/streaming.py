@@ -0,0 +1,208 @@
+"""
+Streaming hand-off from the Fact-Finder to the Pattern Analyzer.
+
+Instead of waiting for run_fact_finder() to finish and reloading its result,
+run_streaming_analysis() runs the search in a producer thread that pushes each
+distinct, validated SourceInfo onto a queue. The extractor drains the queue
+into batches, closing a batch when it reaches `batch_size` sources or when
+`max_wait_seconds` have passed since its first source, and submits an extract
+job for it while the search is still running. With fan-out search, early
+variants are being extracted before the slow ones return.
+
+  from pipeline.streaming import run_streaming_analysis
+  fact_result, pattern_result = run_streaming_analysis("Gold prices hit record high", limit=5)
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from agents.fact_finder.schemas.fact_finder_schema import FactFinderResult, SourceInfo
+from agents.fact_finder.tools.firecrawl_fact_finder import run_fact_finder
+from agents.pattern_analyzer.schemas.pattern_analyzer_schema import (
+    ArticleAnalysis,
+    ExtractionFailure,
+    PatternAnalysisResult,
+)
+from agents.pattern_analyzer.tools.adaptive_batching import AdaptiveBatcher
+from agents.pattern_analyzer.tools.firecrawl_pattern_analyzer import (
+    analyze_source_batches,
+    finalize_pattern_analysis,
+    is_textual_url,
+)
+from agents.pattern_analyzer.tools.prefetch import PrefetchClassifier, prefetch_enabled
+from agents.run_context import check_cancelled, with_run_context
+from telemetry import bind_context, get_logger, incr, observe, traced
+
+logger = get_logger("streaming")
+
+STREAM_BATCH_SIZE = int(os.getenv("TRUTHLENS_STREAM_BATCH_SIZE", "5"))
+STREAM_BATCH_WAIT_SECONDS = float(os.getenv("TRUTHLENS_STREAM_BATCH_WAIT_SECONDS", "2"))
+
+_CLOSED = object()
+
+
+class SourceStream:
+    """
+    Thread-safe queue of sources with end-of-stream and error propagation.
+    """
+
+    def __init__(self) -> None:
+        self._queue: "queue.Queue[object]" = queue.Queue()
+        self._error: Optional[BaseException] = None
+        self._closed = threading.Event()
+
+    def put(self, source: SourceInfo) -> None:
+        if self._closed.is_set():
+            raise RuntimeError("SourceStream is closed.")
+        incr("stream.sources")
+        self._queue.put(source)
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        """
+        End the stream; consumers finish the current batch, then re-raise
+        `error` if the producer failed.
+        """
+        if self._closed.is_set():
+            return
+        self._error = error
+        self._closed.set()
+        self._queue.put(_CLOSED)
+
+    def batches(
+        self,
+        batch_size: int = STREAM_BATCH_SIZE,
+        max_wait_seconds: float = STREAM_BATCH_WAIT_SECONDS,
+    ) -> Iterator[List[SourceInfo]]:
+        """
+        Yield batches of up to `batch_size` sources; a partial batch is
+        released `max_wait_seconds` after its first source arrived, or when the
+        stream closes.
+        """
+        batch: List[SourceInfo] = []
+        deadline = 0.0
+        while True:
+            timeout = None if not batch else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                incr("stream.batches", trigger="deadline")
+                observe("stream.batch_size", float(len(batch)))
+                yield batch
+                batch = []
+                continue
+
+            if item is _CLOSED:
+                if batch:
+                    incr("stream.batches", trigger="close")
+                    observe("stream.batch_size", float(len(batch)))
+                    yield batch
+                if self._error is not None:
+                    raise self._error
+                return
+
+            if not batch:
+                deadline = time.monotonic() + max_wait_seconds
+            batch.append(item)  # type: ignore[arg-type]
+            if len(batch) >= batch_size:
+                incr("stream.batches", trigger="size")
+                observe("stream.batch_size", float(len(batch)))
+                yield batch
+                batch = []
+
+
+@traced("stage.streaming_analysis")
+@with_run_context
+def run_streaming_analysis(
+    statement: str,
+    limit: int = 5,
+    fan_out: Optional[bool] = None,
+    batch_size: int = STREAM_BATCH_SIZE,
+    max_wait_seconds: float = STREAM_BATCH_WAIT_SECONDS,
+    on_batch: Optional[Callable[[List[ArticleAnalysis]], None]] = None,
+) -> Tuple[FactFinderResult, PatternAnalysisResult]:
+    """
+    Fact-Finder and Pattern Analyzer with extraction overlapping the search.
+
+    Both results are persisted exactly as run_fact_finder() and
+    run_pattern_analyzer() would persist them. `on_batch` receives each
+    extracted batch's articles as it completes (see analyze_source_batches).
+    A cancelled `run_context` ends both the search and the extraction; what
+    they had produced is returned, marked `truncated`.
+    """
+    api_key = os.environ.get("FIRECRAWL_API_KEY")
+    if not api_key:
+        raise RuntimeError("FIRECRAWL_API_KEY is not set in the environment.")
+
+    stream = SourceStream()
+    start = time.perf_counter()
+    first_source: List[float] = []
+
+    def _on_source(source: SourceInfo) -> None:
+        if not source.url or not is_textual_url(source.url):
+            return
+        if not first_source:
+            first_source.append(time.perf_counter())
+            observe("stream.first_source_ms", (first_source[0] - start) * 1000.0)
+        stream.put(source)
+
+    def _produce() -> FactFinderResult:
+        try:
+            result = run_fact_finder(statement, limit=limit, fan_out=fan_out, on_source=_on_source)
+        except BaseException as e:
+            stream.close(error=e)
+            raise
+        stream.close()
+        return result
+
+    skipped: List[ExtractionFailure] = []
+
+    def _prefetched(batches: Iterable[List[SourceInfo]]) -> Iterator[List[SourceInfo]]:
+        if not prefetch_enabled():
+            yield from batches
+            return
+        classifier = PrefetchClassifier()
+        for batch in batches:
+            keep, dropped = classifier.filter(batch)
+            skipped.extend(dropped)
+            if keep:
+                yield keep
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="fact-finder") as producer:
+        fact_future = producer.submit(bind_context(_produce))
+        try:
+            batcher = AdaptiveBatcher()
+            articles, failures = analyze_source_batches(
+                statement.strip(),
+                batcher.plan_stream(
+                    _prefetched(
+                        stream.batches(batch_size=batch_size, max_wait_seconds=max_wait_seconds)
+                    )
+                ),
+                api_key,
+                batcher=batcher,
+                on_batch=on_batch,
+            )
+        finally:
+            # Unblock the producer if the consumer failed first.
+            stream.close()
+        fact_result = fact_future.result()
+
+    if not fact_result.sources or not first_source:
+        check_cancelled()
+    if not fact_result.sources:
+        raise ValueError("Fact-Finder returned no sources to analyze.")
+    if not first_source:
+        raise ValueError("No textual sources available (non-video) to analyze for this statement.")
+
+    logger.info(
+        "Streamed %d sources into extraction in %.0f ms.",
+        len(fact_result.sources),
+        (time.perf_counter() - start) * 1000.0,
+    )
+    return fact_result, finalize_pattern_analysis(fact_result.statement, articles, skipped + failures)
@@ -0,0 +1,30 @@
+"""Logging, metrics and tracing for TruthLens pipeline runs."""
+
+from telemetry.log import get_logger
+from telemetry.metrics import METRICS, incr, observe, timed
+from telemetry.tracing import (
+    bind_context,
+    current_run_id,
+    dump_timeline,
+    format_timeline,
+    get_spans,
+    run_scope,
+    span,
+    traced,
+)
+
+__all__ = [
+    "METRICS",
+    "bind_context",
+    "current_run_id",
+    "dump_timeline",
+    "format_timeline",
+    "get_logger",
+    "get_spans",
+    "incr",
+    "observe",
+    "run_scope",
+    "span",
+    "timed",
+    "traced",
+]
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, Tuple
+
+_ROOT_LOGGER_NAME = "truthlens"
+_CONFIGURED = False
+_CONFIGURE_LOCK = threading.Lock()
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Drop repeats of the same log call site once it gets noisy.
+
+    Records are keyed by logger name + level + unformatted message template, so
+    "Job %s attempt %d status: %r" from a polling loop counts as one key no
+    matter which job or attempt. Each key may emit `burst` records, then at most
+    one record every `interval` seconds. The next record that gets through
+    carries a "(suppressed N similar messages)" suffix.
+
+    WARNING and above are never suppressed.
+    """
+
+    def __init__(self, burst: int = 5, interval: float = 10.0) -> None:
+        super().__init__()
+        self.burst = max(1, burst)
+        self.interval = max(0.0, interval)
+        self._lock = threading.Lock()
+        # key -> (records allowed in current window, window start, suppressed count)
+        self._state: Dict[Tuple[str, int, str], Tuple[int, float, int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            allowed, window_start, suppressed = self._state.get(key, (0, now, 0))
+            if now - window_start >= self.interval:
+                allowed, window_start = 0, now
+            if allowed >= self.burst:
+                self._state[key] = (allowed, window_start, suppressed + 1)
+                return False
+            self._state[key] = (allowed + 1, window_start, 0)
+
+        if suppressed:
+            record.msg = f"{record.msg} (suppressed {suppressed} similar messages)"
+        return True
+
+
+class _RunIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Imported lazily: tracing imports this module for its own logger.
+        from telemetry.tracing import current_run_id
+
+        record.run_id = current_run_id() or "-"
+        return True
+
+
+def configure_logging() -> None:
+    """
+    Configure the "truthlens" logger tree once per process.
+
+    Level comes from TRUTHLENS_LOG_LEVEL (default INFO). Rate limiting can be
+    tuned with TRUTHLENS_LOG_BURST and TRUTHLENS_LOG_INTERVAL_SECONDS.
+    """
+    global _CONFIGURED
+    with _CONFIGURE_LOCK:
+        if _CONFIGURED:
+            return
+
+        root = logging.getLogger(_ROOT_LOGGER_NAME)
+        level_name = os.getenv("TRUTHLENS_LOG_LEVEL", "INFO").upper()
+        root.setLevel(getattr(logging, level_name, logging.INFO))
+
+        handler = logging.StreamHandler()
+        handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s [%(name)s] run=%(run_id)s %(message)s")
+        )
+        handler.addFilter(_RunIdFilter())
+        handler.addFilter(
+            RateLimitFilter(
+                burst=int(os.getenv("TRUTHLENS_LOG_BURST", "5")),
+                interval=float(os.getenv("TRUTHLENS_LOG_INTERVAL_SECONDS", "10")),
+            )
+        )
+        root.addHandler(handler)
+        root.propagate = False
+        _CONFIGURED = True
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Return a logger under the "truthlens" namespace, e.g. get_logger("pattern_analyzer").
+    """
+    configure_logging()
+    return logging.getLogger(f"{_ROOT_LOGGER_NAME}.{name}")
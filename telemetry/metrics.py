@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# (run_id, metric name, sorted label items)
+MetricKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+# (metric name, sorted label items), within one run
+SeriesKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+# Keep metrics (and spans, telemetry/tracing.py) for the most recent runs
+# only, so long-lived processes stay bounded. Metrics recorded outside any
+# run are always kept.
+MAX_RUNS = int(os.getenv("TRUTHLENS_TRACE_MAX_RUNS", "64"))
+NO_RUN = "-"
+
+
+@dataclass
+class HistogramSummary:
+    """
+    Running summary of observed values (latencies in ms, token counts, ...).
+    Keeps only aggregates so long runs do not grow memory.
+    """
+
+    count: int = 0
+    total: float = 0.0
+    min: float = float("inf")
+    max: float = float("-inf")
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def as_dict(self) -> Dict[str, float]:
+        if not self.count:
+            return {"count": 0, "sum": 0.0, "min": 0.0, "max": 0.0, "avg": 0.0}
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "min": round(self.min, 3),
+            "max": round(self.max, 3),
+            "avg": round(self.total / self.count, 3),
+        }
+
+
+class _RunMetrics:
+    __slots__ = ("counters", "histograms")
+
+    def __init__(self) -> None:
+        self.counters: Dict[SeriesKey, float] = {}
+        self.histograms: Dict[SeriesKey, HistogramSummary] = {}
+
+
+class MetricsRegistry:
+    """
+    In-process counters and histograms, tagged with the current run ID.
+
+    Labels are free-form strings (endpoint="search", store="critic", ...).
+    Series are kept for the `max_runs` most recently active runs; older runs
+    are dropped whole, like their spans.
+    """
+
+    def __init__(self, max_runs: int = MAX_RUNS) -> None:
+        self.max_runs = max(1, max_runs)
+        self._lock = threading.Lock()
+        self._runs: "OrderedDict[str, _RunMetrics]" = OrderedDict()
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, Any], run_id: Optional[str]) -> MetricKey:
+        if run_id is None:
+            from telemetry.tracing import current_run_id
+
+            run_id = current_run_id()
+        items = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        return (run_id or NO_RUN, name, items)
+
+    def _run(self, run_id: str) -> _RunMetrics:
+        # Caller holds the lock.
+        run = self._runs.get(run_id)
+        if run is None:
+            run = self._runs[run_id] = _RunMetrics()
+            evictable = len(self._runs) - (NO_RUN in self._runs)
+            while evictable > self.max_runs:
+                oldest = next(r for r in self._runs if r != NO_RUN)
+                del self._runs[oldest]
+                evictable -= 1
+        else:
+            self._runs.move_to_end(run_id)
+        return run
+
+    def incr(self, name: str, value: float = 1, run_id: Optional[str] = None, **labels: Any) -> None:
+        rid, *series = self._key(name, labels, run_id)
+        key: SeriesKey = tuple(series)
+        with self._lock:
+            counters = self._run(rid).counters
+            counters[key] = counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, run_id: Optional[str] = None, **labels: Any) -> None:
+        rid, *series = self._key(name, labels, run_id)
+        key: SeriesKey = tuple(series)
+        with self._lock:
+            histograms = self._run(rid).histograms
+            hist = histograms.get(key)
+            if hist is None:
+                hist = histograms[key] = HistogramSummary()
+            hist.observe(value)
+
+    def snapshot(self, run_id: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        JSON-friendly dump of all metrics, optionally restricted to one run.
+        """
+        with self._lock:
+            runs = [(rid, run) for rid, run in self._runs.items() if run_id is None or rid == run_id]
+            counters = [((rid, *k), v) for rid, run in runs for k, v in run.counters.items()]
+            histograms = [((rid, *k), h.as_dict()) for rid, run in runs for k, h in run.histograms.items()]
+
+        def _row(key: MetricKey) -> Dict[str, Any]:
+            rid, name, items = key
+            return {"run_id": rid, "name": name, "labels": dict(items)}
+
+        return {
+            "counters": [{**_row(k), "value": v} for k, v in counters],
+            "histograms": [{**_row(k), **summary} for k, summary in histograms],
+        }
+
+    def counter_total(self, name: str, run_id: Optional[str] = None) -> float:
+        """
+        Sum of a counter across all label combinations.
+        """
+        with self._lock:
+            return sum(
+                v
+                for rid, run in self._runs.items()
+                if run_id is None or rid == run_id
+                for (n, _), v in run.counters.items()
+                if n == name
+            )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._runs.clear()
+
+
+# Global singleton for this process
+METRICS = MetricsRegistry()
+
+
+def incr(name: str, value: float = 1, **labels: Any) -> None:
+    METRICS.incr(name, value, **labels)
+
+
+def observe(name: str, value: float, **labels: Any) -> None:
+    METRICS.observe(name, value, **labels)
+
+
+@contextmanager
+def timed(name: str, **labels: Any) -> Iterator[None]:
+    """
+    Record the wall time of a block, in milliseconds, as histogram `name`.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        METRICS.observe(name, (time.perf_counter() - start) * 1000.0, **labels)
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from telemetry.metrics import MAX_RUNS, METRICS
+
+try:  # Optional: mirror spans into OpenTelemetry when it is installed.
+    from opentelemetry import trace as _otel_trace
+except ImportError:  # pragma: no cover - depends on environment
+    _otel_trace = None
+
+T = TypeVar("T")
+
+# Keep spans for the most recent runs only, so long-lived processes stay
+# bounded; the same bound as the metrics (telemetry/metrics.py).
+MAX_TRACED_RUNS = MAX_RUNS
+MAX_SPANS_PER_RUN = int(os.getenv("TRUTHLENS_TRACE_MAX_SPANS", "10000"))
+
+_RUN_ID: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "truthlens_run_id", default=None
+)
+_CURRENT_SPAN: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "truthlens_current_span", default=None
+)
+
+
+@dataclass
+class Span:
+    """
+    One timed operation inside a run (a stage, an HTTP call, an LLM call, ...).
+    Times are perf_counter() seconds; only differences are meaningful.
+    """
+
+    name: str
+    run_id: str
+    span_id: str
+    parent_id: Optional[str]
+    depth: int
+    start: float
+    end: Optional[float] = None
+    thread_id: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        if self.end is None:
+            return 0.0
+        return (self.end - self.start) * 1000.0
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+
+class _TraceBuffer:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._runs: "OrderedDict[str, List[Span]]" = OrderedDict()
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            spans = self._runs.get(span.run_id)
+            if spans is None:
+                spans = self._runs[span.run_id] = []
+                while len(self._runs) > MAX_TRACED_RUNS:
+                    self._runs.popitem(last=False)
+            if len(spans) < MAX_SPANS_PER_RUN:
+                spans.append(span)
+
+    def spans(self, run_id: str) -> List[Span]:
+        with self._lock:
+            return list(self._runs.get(run_id, []))
+
+    def run_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._runs)
+
+
+_TRACES = _TraceBuffer()
+
+
+def current_run_id() -> Optional[str]:
+    return _RUN_ID.get()
+
+
+def new_run_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+@contextmanager
+def run_scope(run_id: Optional[str] = None) -> Iterator[str]:
+    """
+    Tag everything inside the block with a run ID.
+
+    Nested scopes without an explicit run_id join the enclosing run, so a stage
+    called on its own gets a fresh ID while a full pipeline shares one. When the
+    scope that opened the run exits and TRUTHLENS_TRACE_DIR is set, the run's
+    timeline is written there.
+    """
+    existing = _RUN_ID.get()
+    if run_id is None and existing is not None:
+        yield existing
+        return
+
+    rid = run_id or new_run_id()
+    token = _RUN_ID.set(rid)
+    try:
+        yield rid
+    finally:
+        _RUN_ID.reset(token)
+        trace_dir = os.getenv("TRUTHLENS_TRACE_DIR")
+        if trace_dir and existing is None:
+            try:
+                dump_timeline(rid, os.path.join(trace_dir, f"trace_{rid}.json"))
+            except OSError:
+                pass
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """
+    Time a block as a span of the current run and record its latency as the
+    `span.duration_ms` histogram (labelled span=<name>).
+    """
+    parent = _CURRENT_SPAN.get()
+    run_id = _RUN_ID.get() or "-"
+    current = Span(
+        name=name,
+        run_id=run_id,
+        span_id=uuid.uuid4().hex[:16],
+        parent_id=parent.span_id if parent else None,
+        depth=(parent.depth + 1) if parent else 0,
+        start=time.perf_counter(),
+        thread_id=threading.get_ident(),
+        attributes=dict(attributes),
+    )
+    token = _CURRENT_SPAN.set(current)
+
+    otel_cm = None
+    otel_span = None
+    if _otel_trace is not None:
+        otel_cm = _otel_trace.get_tracer("truthlens").start_as_current_span(name)
+        otel_span = otel_cm.__enter__()
+
+    error: Optional[BaseException] = None
+    try:
+        yield current
+    except BaseException as e:
+        error = e
+        current.set_attribute("error", type(e).__name__)
+        raise
+    finally:
+        current.end = time.perf_counter()
+        _CURRENT_SPAN.reset(token)
+        _TRACES.add(current)
+        METRICS.observe("span.duration_ms", current.duration_ms, run_id=run_id, span=name)
+        if otel_cm is not None:
+            otel_span.set_attribute("truthlens.run_id", run_id)
+            for key, value in current.attributes.items():
+                if isinstance(value, (str, bool, int, float)):
+                    otel_span.set_attribute(f"truthlens.{key}", value)
+            if error is not None:
+                otel_cm.__exit__(type(error), error, error.__traceback__)
+            else:
+                otel_cm.__exit__(None, None, None)
+
+
+def traced(name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Decorator for stage entrypoints: run the function inside a run scope (joining
+    the caller's run if there is one) and a span called `name`.
+    """
+
+    def _decorator(fn: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(fn)
+        def _wrapper(*args: Any, **kwargs: Any) -> T:
+            with run_scope(), span(name):
+                return fn(*args, **kwargs)
+
+        return _wrapper
+
+    return _decorator
+
+
+def bind_context(fn: Callable[..., T]) -> Callable[..., T]:
+    """
+    Wrap `fn` so it runs with the caller's run ID and parent span, e.g. when
+    submitting work to a thread pool (threads do not inherit contextvars).
+    """
+    ctx = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def _wrapper(*args: Any, **kwargs: Any) -> T:
+        return ctx.copy().run(fn, *args, **kwargs)
+
+    return _wrapper
+
+
+def get_spans(run_id: str) -> List[Span]:
+    return _TRACES.spans(run_id)
+
+
+def traced_run_ids() -> List[str]:
+    return _TRACES.run_ids()
+
+
+def timeline_events(run_id: str) -> List[Dict[str, Any]]:
+    """
+    Spans of a run as Chrome trace "complete" events (microseconds from run start).
+    """
+    spans = [s for s in _TRACES.spans(run_id) if s.end is not None]
+    if not spans:
+        return []
+    origin = min(s.start for s in spans)
+    pid = os.getpid()
+    return [
+        {
+            "name": s.name,
+            "ph": "X",
+            "ts": round((s.start - origin) * 1e6, 1),
+            "dur": round((s.end - s.start) * 1e6, 1),  # type: ignore[operator]
+            "pid": pid,
+            "tid": s.thread_id,
+            "args": {k: v for k, v in s.attributes.items()},
+        }
+        for s in sorted(spans, key=lambda s: s.start)
+    ]
+
+
+def dump_timeline(run_id: str, path: str) -> str:
+    """
+    Write a run's timeline as Chrome trace JSON. Open it in chrome://tracing,
+    Perfetto or speedscope to get a flame-style view of the run.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    payload = {
+        "traceEvents": timeline_events(run_id),
+        "displayTimeUnit": "ms",
+        "metadata": {"run_id": run_id, "metrics": METRICS.snapshot(run_id=run_id)},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, default=str)
+    return path
+
+
+def format_timeline(run_id: str, width: int = 40) -> str:
+    """
+    Plain-text flame view: one line per span, indented by nesting depth, with a
+    bar showing where in the run it started and how long it took.
+    """
+    spans = sorted(
+        (s for s in _TRACES.spans(run_id) if s.end is not None),
+        key=lambda s: s.start,
+    )
+    if not spans:
+        return f"(no spans recorded for run {run_id})"
+
+    origin = min(s.start for s in spans)
+    total = max(s.end for s in spans) - origin or 1e-9  # type: ignore[type-var,operator]
+    lines = [f"run {run_id}: {total * 1000.0:.1f} ms"]
+    for s in spans:
+        offset = int((s.start - origin) / total * width)
+        length = max(1, int((s.end - s.start) / total * width))  # type: ignore[operator]
+        bar = " " * offset + "#" * min(length, width - offset)
+        lines.append(f"{bar:<{width}} | {'  ' * s.depth}{s.name} {s.duration_ms:.1f} ms")
+    return "\n".join(lines)
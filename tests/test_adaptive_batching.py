@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from agents.pattern_analyzer.tools.adaptive_batching import AdaptiveBatcher
+from memory.extract_host_stats_store import ExtractHostStatsMemory
+
+
+def test_failed_job_is_not_timed(tmp_path):
+    memory = ExtractHostStatsMemory(tmp_path / "stats.json")
+    memory.record({"example.com": {"ok": 0, "failed": 2}}, None)
+    assert memory.get("example.com")["latency_ewma_ms"] is None
+
+
+def test_flaky_host_recovers(tmp_path):
+    memory = ExtractHostStatsMemory(tmp_path / "stats.json")
+    batcher = AdaptiveBatcher(memory)
+    memory.record({"example.com": {"ok": 0, "failed": 4}}, None)
+    assert batcher.classify("example.com", memory.all_stats()) == "flaky"
+
+    for _ in range(3):
+        memory.record({"example.com": {"ok": 2, "failed": 0}}, 1000.0)
+    assert batcher.classify("example.com", memory.all_stats()) == "fast"
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from agents.pattern_analyzer.schemas.pattern_analyzer_schema import ArticleAnalysis, Claim, PatternAnalysisResult
+from memory.claim_archive import ClaimArchive
+
+CLAIMS = [
+    "Several countries imposed sanctions on the regime",
+    "Three people died in the flooding",
+    "The central bank raised interest rates",
+]
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = ClaimArchive(tmp_path / "archive.db")
+    archive.add_pattern_analysis(
+        PatternAnalysisResult(
+            statement="archived statement",
+            analyzed_articles=[
+                ArticleAnalysis(url=f"https://example.com/{i}", key_claims=[Claim(text=text)])
+                for i, text in enumerate(CLAIMS)
+            ],
+        )
+    )
+    yield archive
+    archive.close()
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("sanctions by countries", CLAIMS[0]),
+        ("country sanctioned", CLAIMS[0]),
+        ("people dies", CLAIMS[1]),
+        ("bank raises rate", CLAIMS[2]),
+    ],
+)
+def test_search_matches_other_word_forms(archive, query, expected):
+    assert [hit.text for hit in archive.search_claims(query)] == [expected]
+
+
+def test_archive_without_stems_is_reindexed(tmp_path):
+    path = tmp_path / "archive.db"
+    ClaimArchive(path).close()
+    # An archive written before the stems column existed.
+    conn = sqlite3.connect(str(path))
+    conn.executescript(
+        "DROP TABLE claims_fts; DROP TABLE claims; PRAGMA user_version = 0;"
+        "CREATE TABLE claims (id INTEGER PRIMARY KEY, statement_id INTEGER NOT NULL, article_id INTEGER NOT NULL, "
+        "digest BLOB NOT NULL UNIQUE, url TEXT NOT NULL, text TEXT NOT NULL, modality TEXT, modality_class TEXT, "
+        "blame_target TEXT, evidence TEXT, publish_ts REAL, archived_at REAL NOT NULL);"
+        "INSERT INTO statements (key, text, first_archived, last_archived) VALUES ('k', 'old statement', 0, 0);"
+        "INSERT INTO claims (statement_id, article_id, digest, url, text, archived_at) "
+        "VALUES (1, 1, x'00', 'https://example.com/old', 'Three people died in the flooding', 0);"
+    )
+    conn.close()
+
+    archive = ClaimArchive(path)
+    assert [hit.text for hit in archive.search_claims("people dies")] == [CLAIMS[1]]
+    archive.close()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from agents.pattern_analyzer.schemas.pattern_analyzer_schema import (
+    ArticleAnalysis,
+    Claim,
+    ExtractionFailure,
+    PatternAnalysisResult,
+)
+from agents.pattern_analyzer.tools.columnar import (
+    ARTICLE_CATEGORIES,
+    ARTICLE_TEXTS,
+    CLAIM_CATEGORIES,
+    CLAIM_TEXTS,
+    ColumnarPatternAnalysis,
+    columnar_view,
+    invalidate_columnar_view,
+)
+
+
+def _result() -> PatternAnalysisResult:
+    return PatternAnalysisResult(
+        statement="statement",
+        analyzed_articles=[
+            ArticleAnalysis(
+                url="https://example.com/a",
+                source_name="Example",
+                publish_date="2025-05-01",
+                publish_ts=1746057600.0,
+                key_claims=[Claim(text="Prices fell", modality="reported", blame_target="bank")],
+            ),
+            ArticleAnalysis(url="https://example.com/b"),
+        ],
+        extraction_failures=[ExtractionFailure(url="https://example.com/c", reason="timeout", attempts=2)],
+        truncated=True,
+    )
+
+
+def test_every_model_field_has_a_column():
+    assert {"url", "publish_ts", "key_claims", *ARTICLE_CATEGORIES, *ARTICLE_TEXTS} == set(
+        ArticleAnalysis.model_fields
+    )
+    assert {"publish_ts", *CLAIM_CATEGORIES, *CLAIM_TEXTS} == set(Claim.model_fields)
+    assert {"statement", "analyzed_articles", "extraction_failures", "truncated"} == set(
+        PatternAnalysisResult.model_fields
+    )
+
+
+def test_round_trip():
+    pa = _result()
+    assert ColumnarPatternAnalysis.from_result(pa).to_result() == pa
+
+
+def test_view_is_cached_until_invalidated():
+    pa = _result()
+    view = columnar_view(pa)
+    assert columnar_view(pa) is view
+
+    pa.analyzed_articles.append(ArticleAnalysis(url="https://example.com/d"))
+    invalidate_columnar_view(pa)
+    assert len(columnar_view(pa)) == 3
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+import threading
+
+import pytest
+
+import memory.write_behind as write_behind
+from agents.pattern_analyzer.schemas.pattern_analyzer_schema import PatternAnalysisResult
+from memory.local_counterpoint_store import CounterpointMemory
+from memory.local_store import LocalFactFinderMemory
+from memory.pattern_analysis_store import PatternAnalysisMemory
+
+
+@pytest.fixture
+def held_writer(monkeypatch):
+    """
+    Keep the write-behind thread from writing until the event is set.
+    """
+    monkeypatch.setenv("TRUTHLENS_WRITE_BEHIND", "1")
+    release = threading.Event()
+    write = write_behind.write_json_atomic
+
+    def held_write(path, data):
+        release.wait(timeout=10)
+        write(path, data)
+
+    monkeypatch.setattr(write_behind, "write_json_atomic", held_write)
+    yield release
+    release.set()
+    write_behind.flush_stores(timeout=10)
+
+
+def test_new_instance_keeps_unflushed_save(tmp_path, held_writer):
+    path = tmp_path / "pattern_analysis_store.json"
+    PatternAnalysisMemory(path).save_result(PatternAnalysisResult(statement="s", analyzed_articles=[]))
+
+    second = PatternAnalysisMemory(path)
+    held_writer.set()
+    assert write_behind.flush_stores(timeout=10)
+
+    assert second.get_result_by_statement("s") is not None
+    assert json.loads(path.read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("store", [LocalFactFinderMemory, PatternAnalysisMemory, CounterpointMemory])
+def test_constructor_does_not_write(tmp_path, store):
+    path = tmp_path / "store.json"
+    store(str(path))
+    assert write_behind.flush_stores(timeout=10)
+    assert not path.exists()
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from telemetry.metrics import MetricsRegistry
+
+
+def test_oldest_runs_are_dropped():
+    metrics = MetricsRegistry(max_runs=2)
+    metrics.incr("requests")  # outside any run
+    for run_id in ("a", "b", "c"):
+        metrics.incr("requests", run_id=run_id)
+        metrics.observe("latency_ms", 5.0, run_id=run_id)
+
+    snapshot = metrics.snapshot()
+    assert {row["run_id"] for row in snapshot["counters"]} == {"-", "b", "c"}
+    assert {row["run_id"] for row in snapshot["histograms"]} == {"b", "c"}
+    assert metrics.counter_total("requests") == 3
+
+
+def test_active_run_is_kept():
+    metrics = MetricsRegistry(max_runs=2)
+    metrics.incr("requests", run_id="a")
+    metrics.incr("requests", run_id="b")
+    metrics.incr("requests", run_id="a")
+    metrics.incr("requests", run_id="c")
+    assert metrics.counter_total("requests", run_id="a") == 2
+    assert metrics.counter_total("requests", run_id="b") == 0
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import pytest
+
+from agents.pattern_analyzer.tools.modality import classify_modality
+
+
+@pytest.mark.parametrize(
+    "modality, expected",
+    [
+        ("In May officials said", "affirmation"),
+        ("United States confirms", "affirmation"),
+        ("United States denies", "denial"),
+        ("may have been involved", "speculation"),
+        ("The report states that", "affirmation"),
+        ("reportedly", "speculation"),
+        ("dément", "denial"),
+        ("据称", "speculation"),
+        ("", None),
+    ],
+)
+def test_classify_modality(modality, expected):
+    assert classify_modality(modality) == expected
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import pytest
+
+from agents.tokenization import stem, tokenize
+
+# Forms that must share one stem.
+SAME_STEM = [
+    ("build", "building", "buildings"),
+    ("fire", "fires", "fired", "firing"),
+    ("die", "dies", "died"),
+    ("deny", "denies", "denied"),
+    ("country", "countries"),
+    ("sanction", "sanctions", "sanctioned", "sanctioning"),
+    ("impose", "imposes", "imposed", "imposing"),
+    ("stop", "stops", "stopped", "stopping"),
+    ("report", "reports", "reported"),
+    ("strong", "strongly"),
+]
+
+# Words left as they are.
+UNCHANGED = ["analysis", "focus", "class", "bus", "2025", "covid19"]
+
+
+@pytest.mark.parametrize("forms", SAME_STEM, ids=lambda forms: forms[0])
+def test_related_forms_share_a_stem(forms):
+    assert len({stem(w) for w in forms}) == 1, {w: stem(w) for w in forms}
+
+
+@pytest.mark.parametrize("word", UNCHANGED)
+def test_unchanged(word):
+    assert stem(word) == word
+
+
+def test_tokenize_drops_stopwords_and_splits_cjk():
+    assert tokenize("The Buildings were FIRED on") == ["build", "fir"]
+    assert tokenize("金价下跌") == ["金价", "价下", "下跌"]